@@ -0,0 +1,371 @@
+# bench_pong.py
+"""
+Benchmarks for stepping the model and drawing the view.
+
+Each benchmark times one operation of the game many times over and keeps
+the fastest of several runs, which is the least disturbed by whatever else
+the machine is doing. Drawing is timed on the SDL dummy video driver, so no
+window is opened and the numbers measure the game's own work.
+
+Results can be saved as a JSON baseline, and later runs compared against
+it: any benchmark slower than its baseline by more than a threshold is a
+regression, and the comparison exits with status 1 so it can gate a build.
+
+Run `python bench_pong.py --save baseline.json` to record a baseline, and
+`python bench_pong.py --compare baseline.json` to check against it.
+
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# pylint: disable=wrong-import-position
+import pygame
+from pong_controller import TrackingController
+from pong_model import MAX_MATCH_STEPS, Model
+from pong_view import View
+
+SCREEN_WIDTH = 1200
+SCREEN_HEIGHT = 675
+
+# Seed of every benchmarked match, so runs play the same points
+BENCH_SEED = 2024
+
+# How long one timed run of a benchmark should last, in seconds
+MIN_RUN_TIME = 0.05
+
+# Number of timed runs of each benchmark
+DEFAULT_REPEAT = 5
+
+# How much slower than its baseline a benchmark may get, as a fraction
+DEFAULT_THRESHOLD = 0.25
+
+BENCHMARKS = {}
+
+
+def register(name):
+    """
+    Makes a decorator that adds a benchmark to the suite.
+
+    The decorated function sets up the benchmark and returns the function
+    to time, which takes no arguments.
+
+    Args:
+        name: A string representing the name to register the benchmark as.
+
+    Returns:
+        A decorator that registers the function and returns it unchanged.
+    """
+
+    def decorator(setup):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return decorator
+
+
+def new_view():
+    """
+    Opens the dummy display and makes a View drawing on it.
+
+    Returns:
+        A new View object.
+    """
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    return View(screen)
+
+
+def new_model():
+    """
+    Makes the Model every benchmark starts from.
+
+    Returns:
+        A new Model object seeded with BENCH_SEED.
+    """
+    return Model(SCREEN_WIDTH, SCREEN_HEIGHT, BENCH_SEED)
+
+
+@register("model.move_objects")
+def bench_move_objects():
+    """Times one physics step of the ball and rackets."""
+    model = new_model()
+    return model.move_objects
+
+
+@register("model.match")
+def bench_match():
+    """Times a whole match between the CPU and a ball-tracking player."""
+
+    def play_match():
+        model = new_model()
+        player = TrackingController(model)
+        steps = 0
+        while not model.game_over() and steps < MAX_MATCH_STEPS:
+            model.move_objects()
+            model.move_player(player.handle_events())
+            model.move_cpu()
+            steps += 1
+
+    return play_match
+
+
+@register("view.render")
+def bench_render():
+    """Times drawing and presenting a frame of a match."""
+    view = new_view()
+    model = new_model()
+    return lambda: view.render(model)
+
+
+@register("view.court")
+def bench_court():
+    """Times drawing the court."""
+    view = new_view()
+    return view.court
+
+
+@register("view.score")
+def bench_score():
+    """Times drawing the score."""
+    view = new_view()
+    model = new_model()
+    return lambda: view.score(model)
+
+
+@register("view.first_frame")
+def bench_first_frame():
+    """Times making a new View and showing the start screen with it."""
+    new_view()
+    screen = pygame.display.get_surface()
+    return lambda: View(screen).start_screen()
+
+
+@register("view.start_screen")
+def bench_start_screen():
+    """Times showing the start screen."""
+    view = new_view()
+    return view.start_screen
+
+
+@register("view.end_screen")
+def bench_end_screen():
+    """Times showing the end screen."""
+    view = new_view()
+    model = new_model()
+    model.player_score = 5
+    return lambda: view.end_screen(model)
+
+
+def time_function(function, repeat=DEFAULT_REPEAT, min_time=MIN_RUN_TIME):
+    """
+    Times a function over several runs of many calls each.
+
+    The number of calls per run is doubled from one until a run lasts at
+    least min_time, so quick and slow functions are timed equally well.
+
+    Args:
+        function: The function to time, which takes no arguments.
+        repeat: An int representing the number of timed runs.
+        min_time: A float representing the seconds a run should last.
+
+    Returns:
+        A dict with the calls per run and the fastest and median time per
+        call in microseconds.
+    """
+    number = 1
+    while True:
+        elapsed = run_calls(function, number)
+        if elapsed >= min_time:
+            break
+        number *= 2
+    times = [elapsed / number]
+    for _ in range(repeat - 1):
+        times.append(run_calls(function, number) / number)
+    return {
+        "calls": number,
+        "best_us": min(times) * 1e6,
+        "median_us": statistics.median(times) * 1e6,
+    }
+
+
+def run_calls(function, number):
+    """
+    Calls a function a number of times.
+
+    Args:
+        function: The function to call, which takes no arguments.
+        number: An int representing how many times to call it.
+
+    Returns:
+        A float representing the seconds the calls took.
+    """
+    start = time.perf_counter()
+    for _ in range(number):
+        function()
+    return time.perf_counter() - start
+
+
+def run_benchmarks(names=None, repeat=DEFAULT_REPEAT, min_time=MIN_RUN_TIME):
+    """
+    Runs benchmarks from the suite.
+
+    Args:
+        names: An optional list of the names of the benchmarks to run,
+            defaulting to all of them.
+        repeat: An int representing the number of timed runs of each.
+        min_time: A float representing the seconds a run should last.
+
+    Returns:
+        A dict mapping each benchmark's name to the dict returned by
+        time_function.
+
+    Raises:
+        ValueError: If a name is not the name of a benchmark.
+    """
+    if names is None:
+        names = list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            raise ValueError(f"unknown benchmark {name!r}")
+    return {
+        name: time_function(BENCHMARKS[name](), repeat, min_time)
+        for name in names
+    }
+
+
+def save_baseline(results, path):
+    """
+    Saves benchmark results as a JSON baseline.
+
+    Args:
+        results: A dict returned by run_benchmarks.
+        path: A string representing the file to write.
+    """
+    with open(path, "w", encoding="utf-8") as baseline_file:
+        json.dump(results, baseline_file, indent=2, sort_keys=True)
+
+
+def load_baseline(path):
+    """
+    Loads a JSON baseline saved by save_baseline.
+
+    Args:
+        path: A string representing the file to read.
+
+    Returns:
+        A dict in the form returned by run_benchmarks.
+    """
+    with open(path, encoding="utf-8") as baseline_file:
+        return json.load(baseline_file)
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compares benchmark results against a baseline.
+
+    Benchmarks missing from either side are left out.
+
+    Args:
+        results: A dict returned by run_benchmarks.
+        baseline: A dict in the same form, such as one from load_baseline.
+        threshold: A float representing how much slower than its baseline
+            a benchmark may get, as a fraction.
+
+    Returns:
+        A list of (name, baseline_us, current_us, ratio, regressed)
+        tuples, one per benchmark in both, where ratio is the current
+        fastest time over the baseline's and regressed is True if it is
+        above 1 + threshold.
+    """
+    rows = []
+    for name, current in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]["best_us"]
+        after = current["best_us"]
+        ratio = after / before if before else float("inf")
+        rows.append((name, before, after, ratio, ratio > 1 + threshold))
+    return rows
+
+
+def main(argv=None):
+    """
+    Parses the command line, runs the benchmarks and prints their results.
+
+    Args:
+        argv: An optional list of command line arguments, defaulting to
+            sys.argv.
+
+    Returns:
+        An int exit status: 1 if a benchmark regressed against the
+        baseline being compared with, otherwise 0.
+    """
+    parser = argparse.ArgumentParser(description="Tennis Pong benchmarks")
+    parser.add_argument(
+        "names",
+        nargs="*",
+        metavar="NAME",
+        help=f"benchmarks to run, all by default: {', '.join(BENCHMARKS)}",
+    )
+    parser.add_argument(
+        "--save",
+        metavar="PATH",
+        help="save the results to PATH as a JSON baseline",
+    )
+    parser.add_argument(
+        "--compare",
+        metavar="PATH",
+        help="compare the results with the JSON baseline at PATH",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="fraction slower than the baseline that counts as a regression",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help="number of timed runs of each benchmark",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        results = run_benchmarks(args.names or None, args.repeat)
+    except ValueError as error:
+        parser.error(str(error))
+    for name, stats in results.items():
+        print(
+            f"{name:<20} {stats['best_us']:12.2f} us best"
+            f" {stats['median_us']:12.2f} us median"
+        )
+    if args.save:
+        save_baseline(results, args.save)
+    if not args.compare:
+        return 0
+
+    regressions = 0
+    for name, before, after, ratio, regressed in compare(
+        results, load_baseline(args.compare), args.threshold
+    ):
+        regressions += regressed
+        print(
+            f"{'REGRESSED' if regressed else 'ok':<9} {name:<20}"
+            f" {before:12.2f} -> {after:12.2f} us ({ratio - 1:+.1%})"
+        )
+    print(
+        f"{regressions} of {len(results)} benchmarks regressed beyond"
+        f" {args.threshold:.0%}"
+    )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
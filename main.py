@@ -6,61 +6,638 @@ This module initializes the game, creates instances of the Model, View,
 and Controller classes,and contains the main game loop. It handles event
 processing, user input, and rendering of the game view.
 
+Run `python main.py` to play, or `python main.py --headless --matches N` to
+simulate N CPU-vs-CPU matches without a window as fast as possible. Run
+`python main.py --netplay host` on one machine and `python main.py --netplay
+join --peer HOST_ADDRESS` on another to play each other over the network.
+
+Startup is kept short: only the display and font subsystems of pygame are
+started, modules needed only for replays and netplay are imported when
+used, and the racket image is decoded while the start screen shows. The
+time from launch to the first frame is printed when the window appears.
+
 """
-import pygame
-from pong_model import Model
-from pong_view import View
-from pong_controller import Controller
+import argparse
+import os
+import sys
+import time
 
-# Initialize Pygame
-pygame.init()
+# When the game was launched, for measuring the time to the first frame
+STARTED = time.perf_counter()
+
+# pylint: disable=wrong-import-position
+import pygame
+from pong_assets import DEFAULT_CACHE_DIR, AssetManager
+from pong_model import MAX_MATCH_STEPS, Model
+from pong_view import (
+    IDLE_TIMEOUT_MS,
+    REDRAW_EVENTS,
+    View,
+    interpolate_positions,
+)
+from pong_controller import Controller, TrackingController
+from pong_policies import POLICIES, make_policy
+from pong_timing import FrameTimer
+from pong_profiling import PROFILE_ENV, PROFILE_KEY, Profiler
 
 # Set screen dimensions
 SCREEN_WIDTH = 1200
 SCREEN_HEIGHT = 675
 
-# Create the game screen
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Tennis Pong")
-
-# Create a Pygame clock object to control the frame rate
-clock = pygame.time.Clock()
-
-# Create instances of the Model, View, and Controller classes
-model = Model(SCREEN_WIDTH, SCREEN_HEIGHT)
-view = View(screen)
-controller = Controller()
-
-# Display the start screen and wait for the player to click the play button
-play_button = view.start_screen()
-GAME_RUNNING = False
-
-# Main game loop
-while True:
-    # Event handling loop
-    for event in pygame.event.get():
-        # Check if the user quits the game
-        if event.type == pygame.QUIT:
-            model.quit_game()
-        # Check if the user clicks the play button on the start screen
-        elif event.type == pygame.MOUSEBUTTONDOWN and not GAME_RUNNING:
-            if event.button == 1 and play_button.collidepoint(event.pos):
-                GAME_RUNNING = True  # Start the game
-
-    # If the game is running
-    if GAME_RUNNING:
-        # Handle user input and move game objects
-        KEYS_PRESSED = controller.handle_events()
-        model.move_objects()
-        model.move_player(KEYS_PRESSED)
-        model.move_cpu()
-
-        # Render the game view
-        view.render(model)
-        view.winner_end_game(model)
-    else:
-        # If the game is not running, display the start screen
-        play_button = view.start_screen()
-
-    # Control frame rate
-    clock.tick(60)
+# Loads the game's images, caching them on disk so later launches start
+# faster
+ASSETS = AssetManager(DEFAULT_CACHE_DIR)
+
+# Physics runs at a fixed rate, independent of how fast frames are drawn
+PHYSICS_HZ = 60
+PHYSICS_STEP = 1 / PHYSICS_HZ
+
+# Longest frame the physics will catch up on, so a stall doesn't snowball
+MAX_FRAME_TIME = 0.25
+
+# Default cap on rendered frames per second (0 for no cap)
+MAX_RENDER_FPS = 240
+
+# Screens the game can be on
+START = "start"
+PLAYING = "playing"
+END = "end"
+QUIT = "quit"
+
+# Key that shows or hides the frame timing overlay
+TIMING_KEY = pygame.K_F3
+
+# Frames between refreshes of the timing overlay, so its text stays readable
+TIMING_REFRESH_FRAMES = 15
+
+# Default UDP port and length, in physics steps, of a netplay match
+NETPLAY_PORT = 50_007
+NETPLAY_FRAMES = PHYSICS_HZ * 180
+
+
+def idle_transition(state, event, buttons, model):
+    """
+    Works out which screen to show next after an event on an idle screen.
+
+    Args:
+        state: A string representing the current screen, START or END.
+        event: The pygame.event.Event that was received.
+        buttons: A dict mapping button names to the pygame.Rect objects
+            returned when the current screen was drawn.
+        model: The Model object containing game state information.
+
+    Returns:
+        A string representing the screen to show next, or QUIT to exit.
+    """
+    if event.type == pygame.QUIT:
+        return QUIT
+    if event.type != pygame.MOUSEBUTTONDOWN or event.button != 1:
+        return state
+    if state == START and buttons["play"].collidepoint(event.pos):
+        return PLAYING
+    if state == END and buttons["play_again"].collidepoint(event.pos):
+        model.cpu_score = 0
+        model.player_score = 0
+        return PLAYING
+    if state == END and buttons["exit"].collidepoint(event.pos):
+        return QUIT
+    return state
+
+
+class Game:
+    """
+    Runs the interactive game, moving between the START, PLAYING and END
+    screens.
+
+    While playing, physics is advanced in fixed steps of PHYSICS_STEP seconds
+    from an accumulator of real elapsed time, while frames are drawn as often
+    as max_fps allows, with the ball and rackets interpolated between the
+    last two physics states. The start and end screens are drawn once and
+    then sleep in pygame.event.wait until something happens, redrawing only
+    when the window needs it.
+
+    The time each frame spends on input, physics, drawing and presenting is
+    recorded, and pressing F3 shows it over the game. Pressing F9 starts and
+    stops a capture of cProfile and tracemalloc data, which also starts
+    with the game when the PONG_PROFILE environment variable is set.
+
+    Attributes:
+        model: The Model object being played.
+        view: The View object drawing the game.
+        controller: The Controller object reading the player's input.
+        clock: The pygame.time.Clock limiting the render rate.
+        max_fps: An int representing the most frames to draw per second.
+        recorder: An optional Recorder saving the input of every step.
+        timer: The FrameTimer recording where each frame's time goes.
+        show_timings: A bool representing whether the timing overlay is on.
+        profiler: The Profiler capturing the game on request.
+        first_frame_ms: A float representing the ms from launch until the
+            first screen was shown, or None until then.
+        state: A string representing the current screen.
+    """
+
+    def __init__(
+        self,
+        screen,
+        max_fps=MAX_RENDER_FPS,
+        dirty_rects=False,
+        cpu_policy=None,
+    ):
+        """
+        Initializes the game on the start screen.
+
+        Args:
+            screen: An instance of the Pygame surface class to draw on.
+            max_fps: An int representing the most frames to draw per second,
+                or 0 to draw as fast as possible.
+            dirty_rects: A bool that, when True, redraws and updates only the
+                parts of the screen that move each frame.
+            cpu_policy: An optional Policy moving the CPU's racket in place
+                of the built-in rule.
+        """
+        self.model = Model(
+            screen.get_width(), screen.get_height(), cpu_policy=cpu_policy
+        )
+        self.view = View(screen, dirty_rects, assets=ASSETS)
+        self.timer = FrameTimer()
+        self.timer.instrument(self.view)
+        self.show_timings = False
+        self.profiler = Profiler(os.environ.get(PROFILE_ENV) or ".")
+        self.first_frame_ms = None
+        self.controller = Controller()
+        self.clock = pygame.time.Clock()
+        self.max_fps = max_fps
+        self.recorder = None
+        self.state = START
+        self.needs_redraw = True
+        self.buttons = {}
+        self.accumulator = 0.0
+        self.previous = self.model.positions()
+
+    def run(self, record_path=None, timings_path=None):
+        """
+        Runs the game until the player quits.
+
+        Args:
+            record_path: An optional string representing a file to save a
+                replay of the session to when the game exits.
+            timings_path: An optional string representing a file to save
+                the frame timings to when the game exits, as JSON if it
+                ends in .json and as CSV otherwise.
+        """
+        if record_path is not None:
+            # pylint: disable=import-outside-toplevel
+            from pong_replay import Recorder
+
+            self.recorder = Recorder(self.model)
+        if os.environ.get(PROFILE_ENV):
+            self.profiler.start()
+        try:
+            while self.state != QUIT:
+                if self.state == PLAYING:
+                    self.play_frame()
+                else:
+                    self.idle_frame()
+            self.model.quit_game()
+        finally:
+            print_capture(self.profiler.stop())
+            if self.recorder is not None:
+                self.recorder.save(record_path)
+            if timings_path is not None:
+                self.timer.dump(timings_path)
+            if self.model.cpu_policy is not None:
+                print_policy_stats(self.model.cpu_policy)
+
+    def step(self, speed_y):
+        """
+        Advances the physics by one fixed step.
+
+        Args:
+            speed_y: An int representing the amount by which to move the
+                player's racket vertically.
+        """
+        if self.recorder is not None:
+            self.recorder.record(speed_y)
+        self.model.move_objects()
+        self.model.move_player(speed_y)
+        self.model.move_cpu()
+
+    def play_frame(self):
+        """
+        Runs the physics steps that fit in the time since the last frame and
+        draws the game.
+        """
+        frame_time = min(self.clock.tick(self.max_fps) / 1000, MAX_FRAME_TIME)
+        timer = self.timer
+        timer.begin_frame()
+
+        # Handle user input once per frame and apply it to every physics
+        # step that fits in the elapsed time
+        with timer.measure("input"):
+            keys_pressed = self.controller.handle_events()
+        if TIMING_KEY in self.controller.pressed:
+            self.show_timings = not self.show_timings
+            self.view.hud_lines = None
+        if PROFILE_KEY in self.controller.pressed:
+            print_capture(self.profiler.toggle())
+        with timer.measure("physics"):
+            self.accumulator += frame_time
+            while (
+                self.accumulator >= PHYSICS_STEP
+                and not self.model.game_over()
+            ):
+                self.previous = self.model.positions()
+                self.step(keys_pressed)
+                self.accumulator -= PHYSICS_STEP
+
+        if self.show_timings and timer.frames % TIMING_REFRESH_FRAMES == 0:
+            self.view.hud_lines = timer.hud_lines()
+
+        # Render the game view between the last two physics states
+        with timer.measure("draw"):
+            self.view.render(
+                self.model,
+                interpolate_positions(
+                    self.previous,
+                    self.model.positions(),
+                    self.accumulator / PHYSICS_STEP,
+                ),
+            )
+        timer.end_frame()
+        if self.model.game_over():
+            self.state = END
+            self.needs_redraw = True
+
+    def idle_frame(self):
+        """
+        Shows the start or end screen and waits for the next event, moving
+        to the screen it leads to.
+        """
+        # Idle screens are drawn once, then only when the window asks
+        if self.needs_redraw:
+            if self.state == START:
+                self.buttons = {"play": self.view.start_screen()}
+            else:
+                play_again_button, exit_button = self.view.end_screen(
+                    self.model
+                )
+                self.buttons = {
+                    "play_again": play_again_button,
+                    "exit": exit_button,
+                }
+            self.needs_redraw = False
+            if self.state == START and self.first_frame_ms is None:
+                self.first_frame_ms = (time.perf_counter() - STARTED) * 1000
+                self.timer.first_frame_ms = self.first_frame_ms
+                print(f"First frame after {self.first_frame_ms:.0f} ms")
+                # Decode the rackets while the player reads the menu
+                self.view.preload_rackets()
+
+        event = pygame.event.wait(IDLE_TIMEOUT_MS)
+        if event.type in REDRAW_EVENTS:
+            self.needs_redraw = True
+            return
+        if event.type == pygame.KEYDOWN and event.key == PROFILE_KEY:
+            print_capture(self.profiler.toggle())
+            return
+        self.state = idle_transition(
+            self.state, event, self.buttons, self.model
+        )
+        if self.state == PLAYING:
+            # Don't count time spent on the menus as game time
+            self.accumulator = 0.0
+            self.previous = self.model.positions()
+            self.clock.tick()
+
+
+def print_policy_stats(policy):
+    """
+    Prints how long a policy took to decide and how often it overran its
+    budget.
+
+    Args:
+        policy: The Policy object to report on.
+    """
+    stats = policy.stats()
+    print(
+        f"CPU policy: {stats['decisions']} decisions,"
+        f" mean {stats['mean_ms']:.3f}ms, worst {stats['worst_ms']:.3f}ms,"
+        f" {stats['overruns']} over the {stats['budget_ms']:.1f}ms budget"
+    )
+
+
+def print_capture(paths):
+    """
+    Prints where a profiler capture was saved.
+
+    Args:
+        paths: The tuple of the .prof file and allocation report paths
+            returned by Profiler.stop, or None if nothing was saved.
+    """
+    if paths is not None:
+        profile_path, report_path = paths
+        print(f"Profile saved to {profile_path}, allocations to {report_path}")
+
+
+def run_game(
+    max_fps=MAX_RENDER_FPS,
+    dirty_rects=False,
+    record_path=None,
+    cpu_policy=None,
+    timings_path=None,
+):
+    """
+    Opens the game window and runs the interactive game.
+
+    Args:
+        max_fps: An int representing the most frames to draw per second, or
+            0 to draw as fast as possible.
+        dirty_rects: A bool that, when True, redraws and updates only the
+            parts of the screen that move each frame.
+        record_path: An optional string representing a file to save a
+            replay of the session to when the game exits.
+        cpu_policy: An optional string naming the registered policy that
+            moves the CPU's racket.
+        timings_path: An optional string representing a file to save the
+            frame timings to when the game exits.
+    """
+    # Start only the parts of pygame the game uses, leaving out audio and
+    # joysticks
+    pygame.display.init()
+    pygame.font.init()
+
+    # Create the game screen
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Tennis Pong")
+
+    if cpu_policy is not None:
+        cpu_policy = make_policy(cpu_policy)
+    Game(screen, max_fps, dirty_rects, cpu_policy).run(
+        record_path, timings_path
+    )
+
+
+def run_headless(
+    matches, max_steps=MAX_MATCH_STEPS, cpu_policy=None, seed=None
+):
+    """
+    Plays matches between the CPU and a ball-tracking player with no window
+    and no frame rate cap.
+
+    Args:
+        matches: An int representing the number of matches to play.
+        max_steps: An int representing the most steps a single match may
+            take before it is stopped.
+        cpu_policy: An optional string naming the registered policy that
+            moves the CPU's racket.
+        seed: An optional int seeding the first match, with each match
+            after it seeded one higher. Matches are seeded randomly if none
+            is given.
+
+    Returns:
+        A dict with the number of matches finished and abandoned at
+        max_steps, the steps and points played, the elapsed time in
+        seconds, the rates of finished matches/sec and steps/sec, and the
+        Policy that moved the CPU, if any.
+    """
+    if cpu_policy is not None:
+        cpu_policy = make_policy(cpu_policy)
+    total_steps = 0
+    total_points = 0
+    finished = 0
+    start = time.perf_counter()
+    for index in range(matches):
+        model = Model(
+            SCREEN_WIDTH,
+            SCREEN_HEIGHT,
+            None if seed is None else seed + index,
+            cpu_policy,
+        )
+        player = TrackingController(model)
+        steps = 0
+        while not model.game_over() and steps < max_steps:
+            model.move_objects()
+            model.move_player(player.handle_events())
+            model.move_cpu()
+            steps += 1
+        total_steps += steps
+        total_points += model.cpu_score + model.player_score
+        finished += model.game_over()
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    return {
+        "finished": finished,
+        "abandoned": matches - finished,
+        "steps": total_steps,
+        "points": total_points,
+        "seconds": elapsed,
+        "matches_per_sec": finished / elapsed,
+        "steps_per_sec": total_steps / elapsed,
+        "cpu_policy": cpu_policy,
+    }
+
+
+def run_netplay(side, port, peer, input_delay, frames=NETPLAY_FRAMES):
+    """
+    Opens the game window and plays a match against another peer over UDP.
+
+    A match that a side wins ends on the end screen, as a local one does.
+    Choosing to play again there starts a new match with the same peer.
+
+    Args:
+        side: A string, HOST or GUEST, representing this peer's role. The
+            host controls the player's racket and the guest the CPU's.
+        port: An int representing the UDP port the host listens on.
+        peer: A string representing the host's address, for the guest.
+        input_delay: An int representing how many frames local input is
+            delayed by.
+        frames: An int representing the most physics steps a match may
+            last.
+
+    Returns:
+        A list of the dicts of match statistics returned by
+        pong_netplay.run_peer, one per match played.
+
+    Raises:
+        ConnectionError: If the other peer doesn't join or stops answering.
+    """
+    # Netplay needs asyncio, which is slow to import, so it is loaded here
+    # pylint: disable=import-outside-toplevel
+    import asyncio
+    from pong_netplay import HOST, run_peer
+
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption(f"Tennis Pong ({side})")
+    game = Game(screen)
+    local_address = ("0.0.0.0", port if side == HOST else 0)
+    matches = []
+    while True:
+        stats = asyncio.run(
+            run_peer(
+                side,
+                local_address,
+                (peer, port),
+                lambda session: game.controller.handle_events(),
+                frames,
+                (SCREEN_WIDTH, SCREEN_HEIGHT),
+                input_delay,
+                PHYSICS_HZ,
+                on_tick=lambda session: game.view.render(session.model),
+            )
+        )
+        matches.append(stats)
+        game.model = stats["model"]
+        if not game.model.game_over():
+            return matches
+        # Wait on the end screen, as a local game does
+        game.state = END
+        game.needs_redraw = True
+        while game.state == END:
+            game.idle_frame()
+        if game.state == QUIT:
+            return matches
+
+
+def main(argv=None):
+    """
+    Parses the command line and starts the game or a headless simulation.
+
+    Args:
+        argv: An optional list of command line arguments, defaulting to
+            sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Tennis Pong")
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="simulate CPU-vs-CPU matches without opening a window",
+    )
+    parser.add_argument(
+        "--matches",
+        type=int,
+        default=10,
+        help="number of matches to simulate in headless mode",
+    )
+    parser.add_argument(
+        "--fps",
+        type=int,
+        default=MAX_RENDER_FPS,
+        help="most frames to draw per second, 0 for no limit",
+    )
+    parser.add_argument(
+        "--record",
+        metavar="PATH",
+        help="save a replay of the session to PATH on exit",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="PATH",
+        help="play back a recorded replay without a window",
+    )
+    parser.add_argument(
+        "--dirty-rects",
+        action="store_true",
+        help="redraw only the parts of the screen that move",
+    )
+    parser.add_argument(
+        "--netplay",
+        choices=["host", "join"],
+        help="host a network match, or join one hosted at --peer",
+    )
+    parser.add_argument(
+        "--peer",
+        default="127.0.0.1",
+        help="address of the host to join",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=NETPLAY_PORT,
+        help="UDP port the host listens on",
+    )
+    parser.add_argument(
+        "--input-delay",
+        type=int,
+        default=2,
+        help="frames of delay added to local input in netplay",
+    )
+    parser.add_argument(
+        "--cpu-policy",
+        choices=sorted(POLICIES),
+        help="policy that moves the CPU's racket instead of the built-in rule",
+    )
+    parser.add_argument(
+        "--timings",
+        metavar="PATH",
+        help="save frame timings to PATH on exit, as JSON or CSV",
+    )
+    args = parser.parse_args(argv)
+    if args.cpu_policy and args.record:
+        # Replays are played back with the built-in CPU rule
+        parser.error("--record can't be combined with --cpu-policy")
+
+    if args.netplay:
+        # pylint: disable=import-outside-toplevel
+        from pong_netplay import GUEST, HOST
+
+        side = HOST if args.netplay == "host" else GUEST
+        try:
+            matches = run_netplay(
+                side, args.port, args.peer, args.input_delay
+            )
+        except ConnectionError as error:
+            sys.exit(f"Netplay stopped: {error}")
+        for stats in matches:
+            model = stats["model"]
+            rtt = (
+                "n/a"
+                if stats["rtt_ms"] is None
+                else f"{stats['rtt_ms']:.1f}ms"
+            )
+            print(
+                f"CPU {model.cpu_score}, Player {model.player_score}:"
+                f" {stats['frames']} frames, RTT {rtt},"
+                f" {stats['rollbacks']} rollbacks,"
+                f" {stats['resimulated_frames']} frames resimulated"
+            )
+        return
+
+    if args.replay:
+        # pylint: disable=import-outside-toplevel
+        from pong_replay import play
+
+        with open(args.replay, "rb") as replay_file:
+            data = replay_file.read()
+        start = time.perf_counter()
+        model = play(data)
+        elapsed = time.perf_counter() - start
+        print(
+            f"Replayed {len(data)} bytes in {elapsed:.3f}s: CPU"
+            f" {model.cpu_score}, Player {model.player_score}"
+        )
+        return
+
+    if not args.headless:
+        run_game(
+            args.fps,
+            args.dirty_rects,
+            args.record,
+            args.cpu_policy,
+            args.timings,
+        )
+        return
+
+    stats = run_headless(args.matches, cpu_policy=args.cpu_policy)
+    print(
+        f"{stats['finished']} matches finished, {stats['abandoned']}"
+        f" abandoned, {stats['steps']} steps in {stats['seconds']:.2f}s"
+    )
+    print(f"{stats['matches_per_sec']:.1f} finished matches/sec")
+    print(f"{stats['steps_per_sec']:.0f} steps/sec")
+    if stats["cpu_policy"] is not None:
+        print_policy_stats(stats["cpu_policy"])
+
+
+if __name__ == "__main__":
+    main()
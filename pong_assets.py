@@ -0,0 +1,297 @@
+# pong_assets.py
+"""
+Module for loading the game's images once and sharing them.
+
+This module defines the AssetManager class, which decodes each image file
+once, scales it to the size it is drawn at and converts it to the display's
+pixel format, handing the same Surface to everything that draws it. Scaled
+images are also kept in an on-disk cache of raw RGBA pixels, keyed by a
+hash of the image file's contents and the size, so later launches skip
+decoding and scaling altogether, and a changed image is picked up on its
+own. Managers only use the disk cache when given a directory for it, such
+as DEFAULT_CACHE_DIR.
+
+It also defines the Atlas class, which packs many sprites into one Surface
+so they can share a single image in memory and be drawn from it by name.
+
+"""
+import hashlib
+import os
+import struct
+import threading
+import pygame
+
+# Where the game caches scaled images between launches
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "tennis_pong"
+)
+
+# Width and height at the start of every cached image
+CACHE_HEADER = struct.Struct("<II")
+
+# Widest an atlas is made before sprites start a new row
+ATLAS_WIDTH = 1024
+
+# Transparent pixels left between sprites in an atlas, so that scaling or
+# smoothing one sprite never picks up its neighbour's edge
+ATLAS_PADDING = 1
+
+
+class AssetManager:
+    """
+    Loads images once and shares them.
+
+    Attributes:
+        cache_dir: An optional string representing the directory scaled
+            images are cached in, or None to not cache them on disk.
+        decoded: An int counting the image files decoded.
+        cache_hits: An int counting the images read from the disk cache.
+    """
+
+    def __init__(self, cache_dir=None):
+        """
+        Initializes a manager with nothing loaded.
+
+        Args:
+            cache_dir: An optional string representing the directory to
+                cache scaled images in. Images are only kept in memory if
+                it is None.
+        """
+        self.cache_dir = cache_dir
+        self.decoded = 0
+        self.cache_hits = 0
+        self._images = {}
+        self._lock = threading.Lock()
+
+    def image(self, path, size=None, convert=True):
+        """
+        Gets an image, loading it on the first request for its path and
+        size and sharing the same Surface on every later one.
+
+        The Surface returned is shared, so it must only be drawn from,
+        never drawn on.
+
+        Args:
+            path: A string representing the path of the image file.
+            size: An optional (width, height) tuple to scale the image to.
+            convert: A bool that, when True, converts the image to the
+                display's pixel format if a display is open, which makes it
+                faster to draw. Images can be loaded without converting
+                them on a background thread.
+
+        Returns:
+            An instance of the pygame.Surface class.
+        """
+        convert = convert and pygame.display.get_surface() is not None
+        key = (path, size, convert)
+        with self._lock:
+            image = self._images.get(key)
+            if image is None:
+                if convert:
+                    image = self._scaled(path, size).convert_alpha()
+                else:
+                    image = self._scaled(path, size)
+                self._images[key] = image
+        return image
+
+    def _scaled(self, path, size):
+        """
+        Gets an image at a size without converting it, from memory, the
+        disk cache or by decoding the file. Must be called with the lock
+        held.
+
+        Args:
+            path: A string representing the path of the image file.
+            size: An optional (width, height) tuple to scale the image to.
+
+        Returns:
+            An instance of the pygame.Surface class.
+        """
+        key = (path, size, False)
+        image = self._images.get(key)
+        if image is not None:
+            return image
+        cache_path = None
+        if self.cache_dir is not None:
+            cache_path = self.cache_path(path, size)
+            image = read_cached(cache_path)
+        if image is None:
+            image = pygame.image.load(path)
+            self.decoded += 1
+            if size is not None:
+                image = pygame.transform.scale(image, size)
+            if cache_path is not None:
+                write_cached(cache_path, image)
+        else:
+            self.cache_hits += 1
+        self._images[key] = image
+        return image
+
+    def cache_path(self, path, size):
+        """
+        Gets where a scaled image is cached on disk.
+
+        Args:
+            path: A string representing the path of the image file.
+            size: An optional (width, height) tuple the image is scaled to.
+
+        Returns:
+            A string representing the path of the cache file, named after a
+            hash of the image file's contents and the size.
+        """
+        with open(path, "rb") as image_file:
+            digest = hashlib.sha256(image_file.read()).hexdigest()[:32]
+        label = "full" if size is None else f"{size[0]}x{size[1]}"
+        return os.path.join(self.cache_dir, f"{digest}-{label}.rgba")
+
+    def atlas(self, sprites, width=ATLAS_WIDTH):
+        """
+        Packs images into an atlas.
+
+        Args:
+            sprites: A dict mapping sprite names to (path, size) tuples, as
+                taken by image.
+            width: An int representing the widest the atlas may be.
+
+        Returns:
+            A new Atlas holding every sprite.
+        """
+        return Atlas(
+            {
+                name: self.image(path, size)
+                for name, (path, size) in sprites.items()
+            },
+            width,
+        )
+
+
+def read_cached(cache_path):
+    """
+    Reads an image from the disk cache.
+
+    Args:
+        cache_path: A string representing the path of the cache file.
+
+    Returns:
+        An instance of the pygame.Surface class, or None if the file is
+        missing or not a whole cached image.
+    """
+    try:
+        with open(cache_path, "rb") as cache_file:
+            data = cache_file.read()
+    except OSError:
+        return None
+    if len(data) < CACHE_HEADER.size:
+        return None
+    width, height = CACHE_HEADER.unpack_from(data)
+    pixels = data[CACHE_HEADER.size :]
+    if len(pixels) != width * height * 4:
+        return None
+    return pygame.image.frombytes(pixels, (width, height), "RGBA")
+
+
+def write_cached(cache_path, image):
+    """
+    Writes an image to the disk cache, as its size followed by its raw RGBA
+    pixels. The file is written under a temporary name and then renamed,
+    so another launch never reads half of it. Failing to write, such as on
+    a read-only disk, is ignored, since the cache only saves time.
+
+    Args:
+        cache_path: A string representing the path of the cache file.
+        image: The pygame.Surface to cache.
+    """
+    data = CACHE_HEADER.pack(*image.get_size()) + pygame.image.tobytes(
+        image, "RGBA"
+    )
+    temporary_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(temporary_path, "wb") as cache_file:
+            cache_file.write(data)
+        os.replace(temporary_path, cache_path)
+    except OSError:
+        pass
+
+
+class Atlas:
+    """
+    Holds many sprites packed into one Surface.
+
+    Sprites are placed tallest first in rows, left to right, starting a new
+    row when the next sprite would not fit in the width.
+
+    Attributes:
+        surface: The pygame.Surface holding every sprite.
+        rects: A dict mapping each sprite's name to the pygame.Rect it
+            occupies on surface.
+    """
+
+    def __init__(self, sprites, width=ATLAS_WIDTH, padding=ATLAS_PADDING):
+        """
+        Packs sprites into a new Surface.
+
+        Args:
+            sprites: A dict mapping sprite names to pygame.Surface objects.
+            width: An int representing the widest the atlas may be; it is
+                widened to fit the widest sprite.
+            padding: An int representing the transparent pixels left around
+                each sprite.
+
+        Raises:
+            ValueError: If there are no sprites.
+        """
+        if not sprites:
+            raise ValueError("an atlas needs at least one sprite")
+        width = max(
+            width,
+            max(sprite.get_width() for sprite in sprites.values())
+            + 2 * padding,
+        )
+        order = sorted(
+            sprites, key=lambda name: sprites[name].get_height(), reverse=True
+        )
+        self.rects = {}
+        x_coordinate = y_coordinate = row_height = 0
+        for name in order:
+            sprite_width, sprite_height = sprites[name].get_size()
+            if x_coordinate + sprite_width + 2 * padding > width:
+                x_coordinate = 0
+                y_coordinate += row_height
+                row_height = 0
+            self.rects[name] = pygame.Rect(
+                x_coordinate + padding,
+                y_coordinate + padding,
+                sprite_width,
+                sprite_height,
+            )
+            x_coordinate += sprite_width + 2 * padding
+            row_height = max(row_height, sprite_height + 2 * padding)
+        used_width = max(rect.right for rect in self.rects.values()) + padding
+        self.surface = pygame.Surface(
+            (used_width, y_coordinate + row_height), pygame.SRCALPHA
+        )
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert_alpha()
+        self.surface.fill((0, 0, 0, 0))
+        for name, rect in self.rects.items():
+            self.surface.blit(sprites[name], rect)
+
+    def blit(self, target, name, position):
+        """
+        Draws one sprite from the atlas.
+
+        Args:
+            target: The pygame.Surface to draw on.
+            name: A string naming the sprite.
+            position: The (x, y) tuple or pygame.Rect to draw it at.
+
+        Returns:
+            A pygame.Rect covering the area drawn.
+        """
+        return target.blit(self.surface, position, self.rects[name])
+
+
+# Shared by every View that isn't given a manager, so each image is loaded
+# once per process. It keeps images in memory only.
+ASSETS = AssetManager()
@@ -0,0 +1,241 @@
+# pong_batch.py
+"""
+Module for the BatchModel class, which simulates many matches at once.
+
+This module defines the BatchModel class, which keeps the state of N
+independent Tennis Pong matches in NumPy arrays and advances all of them
+with a handful of array operations per step. It follows the same rules as
+pong_model.Model (ball motion, wall bounces, racket hits, scoring, resets
+and the CPU tracking rule), so a match seeded the same way produces the same
+results in either class.
+
+"""
+import random
+import numpy as np
+from pong_model import MAX_BALL_SPEED, MAX_BOUNCES_PER_STEP, SPEED_Y_GAIN
+
+BALL_SIZE = 20
+RACKET_WIDTH = 20
+RACKET_HEIGHT = 100
+CPU_SPEED = 5.5
+
+
+class BatchModel:
+    """
+    Represents N independent Pong matches stepped together.
+
+    Positions are the top-left corners of the objects, stored in float
+    arrays, just like the Box objects in Model.
+
+    Attributes:
+        count: An int representing the number of matches.
+        screen_width: An int representing the width of the game screen.
+        screen_height: An int representing the height of the game screen.
+        ball_x: A float array of the ball x-coordinates.
+        ball_y: A float array of the ball y-coordinates.
+        speed_x: A float array of the horizontal ball speeds.
+        speed_y: A float array of the vertical ball speeds.
+        cpu_x: A float representing the x-coordinate of the CPU racket.
+        player_x: A float representing the x-coordinate of the player
+            racket.
+        cpu_y: A float array of the CPU racket y-coordinates.
+        player_y: A float array of the player racket y-coordinates.
+        cpu_score: An int array of the CPU scores.
+        player_score: An int array of the player scores.
+        rngs: A list of random.Random instances, one per match, used when
+            the ball is reset.
+    """
+
+    def __init__(self, count, screen_width, screen_height, seeds=None):
+        """
+        Initializes count matches with the given screen dimensions.
+
+        Args:
+            count: An int representing the number of matches to simulate.
+            screen_width: An int representing the width of the game screen.
+            screen_height: An int representing the height of the game screen.
+            seeds: An optional sequence of count seeds, one per match. A
+                match seeded with s plays out like Model(..., seed=s).
+        """
+        if seeds is None:
+            seeds = [None] * count
+        if len(seeds) != count:
+            raise ValueError("expected one seed per match")
+        self.count = count
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.rngs = [random.Random(seed) for seed in seeds]
+
+        self.ball_x = np.zeros(count)
+        self.ball_y = np.zeros(count)
+        self.speed_x = np.full(count, 6.0)
+        self.speed_y = np.full(count, 6.0)
+        self.cpu_x = 0.0
+        self.player_x = float(screen_width - 50)
+        self.cpu_y = np.full(count, screen_height / 2 - 50)
+        self.player_y = self.cpu_y.copy()
+        self.cpu_score = np.zeros(count, dtype=np.int64)
+        self.player_score = np.zeros(count, dtype=np.int64)
+        self.reset(np.ones(count, dtype=bool))
+
+    def reset(self, mask):
+        """
+        Resets the position and speed of the ball in the selected matches.
+
+        Args:
+            mask: A boolean array selecting the matches to reset.
+        """
+        self.ball_x[mask] = self.screen_width / 2 - 10
+        for index in np.flatnonzero(mask):
+            rng = self.rngs[index]
+            self.ball_y[index] = rng.randint(10, self.screen_height - 10)
+            self.speed_x[index] = rng.choice([-1, 1]) * abs(
+                self.speed_x[index]
+            )
+            self.speed_y[index] = rng.choice([-1, 1]) * abs(
+                self.speed_y[index]
+            )
+
+    def wall_time(self, y_position):
+        """
+        Finds when each ball will touch the wall it is moving toward.
+
+        Args:
+            y_position: A float array of the ball y-coordinates.
+
+        Returns:
+            A float array of impact times in steps, infinite where a ball
+            never reaches a wall.
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            top = np.maximum(0.0, (0 - y_position) / self.speed_y)
+            bottom = np.maximum(
+                0.0,
+                (self.screen_height - BALL_SIZE - y_position) / self.speed_y,
+            )
+        return np.where(
+            self.speed_y < 0,
+            top,
+            np.where(self.speed_y > 0, bottom, np.inf),
+        )
+
+    def racket_time(self, x_position, y_position):
+        """
+        Finds when each ball will hit the face of the racket it is moving
+        toward.
+
+        Args:
+            x_position: A float array of the ball x-coordinates.
+            y_position: A float array of the ball y-coordinates.
+
+        Returns:
+            A float array of impact times in steps, infinite where a ball
+            misses the racket or is already past its face.
+        """
+        toward_cpu = (self.speed_x < 0) & (
+            x_position >= self.cpu_x + RACKET_WIDTH
+        )
+        toward_player = (self.speed_x > 0) & (
+            x_position + BALL_SIZE <= self.player_x
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            impact = np.where(
+                toward_cpu,
+                (self.cpu_x + RACKET_WIDTH - x_position) / self.speed_x,
+                (self.player_x - (x_position + BALL_SIZE)) / self.speed_x,
+            )
+        racket_y = np.where(toward_cpu, self.cpu_y, self.player_y)
+        y_at_impact = y_position + self.speed_y * impact
+        hit = (
+            (toward_cpu | toward_player)
+            & (racket_y < y_at_impact + BALL_SIZE)
+            & (y_at_impact < racket_y + RACKET_HEIGHT)
+        )
+        return np.where(hit, impact, np.inf)
+
+    def move_objects(self):
+        """
+        Moves the balls in every match and handles collisions and scoring.
+
+        Like Model.move_objects, each ball is swept along its path and every
+        bounce is resolved at its exact time of impact.
+        """
+        x_position = self.ball_x.copy()
+        y_position = self.ball_y.copy()
+        remaining = np.ones(self.count)
+        active = np.ones(self.count, dtype=bool)
+        for _ in range(MAX_BOUNCES_PER_STEP):
+            wall_time = self.wall_time(y_position)
+            racket_time = self.racket_time(x_position, y_position)
+            step = np.minimum(np.minimum(wall_time, racket_time), remaining)
+            step[~active] = 0.0
+            x_position += self.speed_x * step
+            y_position += self.speed_y * step
+            remaining -= step
+            wall_hit = active & (wall_time == step)
+            racket_hit = active & (racket_time == step)
+            active = wall_hit | racket_hit
+            if not active.any():
+                break
+            self.speed_y[wall_hit] *= -1
+            # Like Ball.bounce_horizontal, speed up to MAX_BALL_SPEED
+            self.speed_x[racket_hit] = np.clip(
+                self.speed_x[racket_hit] * -1.002,
+                -MAX_BALL_SPEED,
+                MAX_BALL_SPEED,
+            )
+            self.speed_y[racket_hit] = np.clip(
+                self.speed_y[racket_hit]
+                + np.copysign(SPEED_Y_GAIN, self.speed_y[racket_hit]),
+                -MAX_BALL_SPEED,
+                MAX_BALL_SPEED,
+            )
+        self.ball_x = x_position
+        self.ball_y = y_position
+
+        cpu_point = self.ball_x + BALL_SIZE >= self.screen_width
+        self.cpu_score += cpu_point
+        self.reset(cpu_point)
+        player_point = self.ball_x <= 0
+        self.player_score += player_point
+        self.reset(player_point)
+
+    def move_player(self, speed_y):
+        """
+        Moves the player rackets vertically and keeps them on the screen.
+
+        Args:
+            speed_y: An int or an int array representing the amount by which
+                to move each player racket vertically.
+        """
+        player_y = np.maximum(self.player_y + speed_y, 0)
+        self.player_y = (
+            np.minimum(player_y + RACKET_HEIGHT, self.screen_height)
+            - RACKET_HEIGHT
+        )
+
+    def move_cpu(self):
+        """
+        Moves the CPU rackets vertically to track the ball in each match.
+        """
+        ball_center = self.ball_y + BALL_SIZE // 2
+        cpu_center = self.cpu_y + RACKET_HEIGHT // 2
+        step = np.where(
+            ball_center < cpu_center,
+            -CPU_SPEED,
+            np.where(ball_center > cpu_center, CPU_SPEED, 0.0),
+        )
+        self.cpu_y = self.cpu_y + step
+
+    def step(self, speed_y):
+        """
+        Advances every match by one frame, in the same order as the game
+        loop in main.py.
+
+        Args:
+            speed_y: An int or an int array representing the amount by which
+                to move each player racket vertically.
+        """
+        self.move_objects()
+        self.move_player(speed_y)
+        self.move_cpu()
@@ -16,12 +16,17 @@ import pygame
 class Controller:
     """
     Handles user input events for the game.
+
+    Attributes:
+        pressed: A list of the keys pressed since the last call to
+            handle_events, as pygame key constants.
     """
 
     def __init__(self):
         """
         Initializes the Controller object.
         """
+        self.pressed = []
 
     def handle_events(self):
         """
@@ -32,10 +37,13 @@ class Controller:
             An int representing the amount by which to move the player's racket
             vertically.
         """
+        self.pressed.clear()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
+            if event.type == pygame.KEYDOWN:
+                self.pressed.append(event.key)
 
         keys = pygame.key.get_pressed()
         speed_y = 0
@@ -44,3 +52,40 @@ class Controller:
         elif keys[pygame.K_DOWN]:
             speed_y = 6
         return speed_y
+
+
+class TrackingController:
+    """
+    Moves the player's racket toward the ball without any user input.
+
+    Used in place of Controller when nobody is at the keyboard, such as in
+    headless simulations.
+
+    Attributes:
+        model: The Model object whose player racket is being controlled.
+    """
+
+    def __init__(self, model):
+        """
+        Initializes the TrackingController with the model it plays in.
+
+        Args:
+            model: The Model object containing game state information.
+        """
+        self.model = model
+
+    def handle_events(self):
+        """
+        Picks a racket movement that follows the ball vertically.
+
+        Returns:
+            An int representing the amount by which to move the player's racket
+            vertically.
+        """
+        ball_center = self.model.ball.rect.centery
+        racket_center = self.model.player.rect.centery
+        if ball_center < racket_center:
+            return -6
+        if ball_center > racket_center:
+            return 6
+        return 0
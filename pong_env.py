@@ -0,0 +1,316 @@
+# pong_env.py
+"""
+Module for reinforcement learning environments around Tennis Pong.
+
+The agent plays the player's racket against the CPU. Each step it picks one
+of the ACTIONS, which stand in for the speed_y that Controller.handle_events
+returns, and the game advances one physics step. A point won is worth a
+reward of 1 and a point lost -1, and an episode ends when either side
+reaches WINNING_SCORE.
+
+This module defines the PongEnv class, which follows the Gym reset/step
+interface around a single Model, and the VectorPongEnv class, which steps
+many matches at once on a BatchModel with the same interface. Both write observations and rewards
+into NumPy arrays that are allocated once and reused on every step, so the
+arrays they return are overwritten by the next call and should be copied if
+they need to be kept.
+
+Observations hold the ball's position and speed and both rackets' heights,
+as listed in OBSERVATION_FIELDS, with positions as fractions of the screen
+and speeds divided by SPEED_SCALE.
+
+"""
+import random
+import numpy as np
+from pong_batch import BatchModel
+from pong_model import MAX_SEED, WINNING_SCORE, Model
+
+SCREEN_WIDTH = 1200
+SCREEN_HEIGHT = 675
+
+# The speed_y of each action: stay, up, down
+ACTIONS = (0, -6, 6)
+
+OBSERVATION_FIELDS = (
+    "ball_x",
+    "ball_y",
+    "ball_speed_x",
+    "ball_speed_y",
+    "player_y",
+    "cpu_y",
+)
+
+# Ball speeds are divided by this to keep observations near [-1, 1]
+SPEED_SCALE = 10
+
+# Episodes are cut short after this many steps, in case neither side scores
+MAX_EPISODE_STEPS = 20_000
+
+
+class PongEnv:
+    """
+    A Gym-style environment in which the agent plays the player's racket.
+
+    Attributes:
+        screen_width: An int representing the width of the game screen.
+        screen_height: An int representing the height of the game screen.
+        max_steps: An int representing the most steps an episode may take.
+        model: The Model object of the current episode.
+        observation: A float32 array of len(OBSERVATION_FIELDS) that every
+            reset and step writes into and returns.
+        steps: An int counting the steps of the current episode.
+    """
+
+    def __init__(
+        self,
+        seed=None,
+        screen_width=SCREEN_WIDTH,
+        screen_height=SCREEN_HEIGHT,
+        max_steps=MAX_EPISODE_STEPS,
+    ):
+        """
+        Initializes the environment. reset must be called before step.
+
+        Args:
+            seed: An optional int seeding the episodes, so a sequence of
+                episodes can be reproduced.
+            screen_width: An int representing the width of the game screen.
+            screen_height: An int representing the height of the game screen.
+            max_steps: An int representing the most steps an episode may
+                take.
+        """
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.max_steps = max_steps
+        self.model = None
+        self.observation = np.zeros(len(OBSERVATION_FIELDS), dtype=np.float32)
+        self.steps = 0
+        self._rng = random.Random(seed)
+        self._info = {}
+
+    def reset(self, seed=None):
+        """
+        Starts a new episode.
+
+        Args:
+            seed: An optional int seeding this episode's Model, instead of
+                one drawn from the environment's seed.
+
+        Returns:
+            A tuple (observation, info).
+        """
+        if seed is None:
+            seed = self._rng.randrange(MAX_SEED)
+        self.model = Model(self.screen_width, self.screen_height, seed)
+        self.steps = 0
+        self.observe()
+        return self.observation, self._info
+
+    def step(self, action):
+        """
+        Moves the player's racket by an action and advances the game one
+        physics step, in the same order as the game loop in main.py.
+
+        Args:
+            action: An int index into ACTIONS.
+
+        Returns:
+            A tuple (observation, reward, terminated, truncated, info),
+            where terminated is True once a side has won and truncated is
+            True once the episode reaches max_steps.
+        """
+        model = self.model
+        cpu_score = model.cpu_score
+        player_score = model.player_score
+        model.move_objects()
+        model.move_player(ACTIONS[action])
+        model.move_cpu()
+        self.steps += 1
+        self.observe()
+        reward = float(
+            (model.player_score - player_score) - (model.cpu_score - cpu_score)
+        )
+        terminated = model.game_over()
+        truncated = not terminated and self.steps >= self.max_steps
+        return self.observation, reward, terminated, truncated, self._info
+
+    def observe(self):
+        """
+        Writes the current state into the observation array.
+        """
+        model = self.model
+        observation = self.observation
+        observation[0] = model.ball.rect.x / self.screen_width
+        observation[1] = model.ball.rect.y / self.screen_height
+        observation[2] = model.ball.speed_x / SPEED_SCALE
+        observation[3] = model.ball.speed_y / SPEED_SCALE
+        observation[4] = model.player.rect.y / self.screen_height
+        observation[5] = model.cpu.rect.y / self.screen_height
+
+
+class VectorPongEnv:
+    """
+    Steps many Pong environments together on a BatchModel.
+
+    Episodes that end are reset straight away, so every call to step
+    advances every environment. The observations, rewards, terminated and
+    truncated arrays are allocated once and overwritten by every call.
+
+    Attributes:
+        count: An int representing the number of environments.
+        seed: The int from which every match's seed is drawn, until reset
+            is given a new one.
+        max_steps: An int representing the most steps an episode may take.
+        model: The BatchModel holding every match.
+        observations: A float32 array of shape
+            (count, len(OBSERVATION_FIELDS)).
+        rewards: A float32 array of the last step's reward of each match.
+        terminated: A bool array marking the matches a side won last step.
+        truncated: A bool array marking the matches cut short last step.
+        steps: An int array counting the steps of each current episode.
+    """
+
+    def __init__(
+        self,
+        count,
+        seed=0,
+        screen_width=SCREEN_WIDTH,
+        screen_height=SCREEN_HEIGHT,
+        max_steps=MAX_EPISODE_STEPS,
+    ):
+        """
+        Initializes count environments.
+
+        Args:
+            count: An int representing the number of environments.
+            seed: An int from which every match's seed is drawn.
+            screen_width: An int representing the width of the game screen.
+            screen_height: An int representing the height of the game screen.
+            max_steps: An int representing the most steps an episode may
+                take.
+        """
+        self.count = count
+        self.seed = seed
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.max_steps = max_steps
+        self.model = None
+        self._rng = random.Random(seed)
+        self.observations = np.zeros(
+            (count, len(OBSERVATION_FIELDS)), dtype=np.float32
+        )
+        self.rewards = np.zeros(count, dtype=np.float32)
+        self.terminated = np.zeros(count, dtype=bool)
+        self.truncated = np.zeros(count, dtype=bool)
+        self.steps = np.zeros(count, dtype=np.int64)
+        self._columns = [
+            self.observations[:, i] for i in range(len(OBSERVATION_FIELDS))
+        ]
+        self._speeds = np.zeros(count)
+        self._actions = np.asarray(ACTIONS, dtype=np.float64)
+        self._cpu_score = np.zeros(count, dtype=np.int64)
+        self._player_score = np.zeros(count, dtype=np.int64)
+        self._done = np.zeros(count, dtype=bool)
+        self._start_y = 0.0
+        self._infos = {}
+
+    def reset(self, seed=None):
+        """
+        Starts a new episode in every environment, with match seeds drawn
+        from where the last reset left off, so that every reset plays new
+        episodes.
+
+        Args:
+            seed: An optional int from which to draw the match seeds
+                afresh, instead of carrying on from the last reset.
+
+        Returns:
+            A tuple (observations, infos), like PongEnv.reset.
+        """
+        if seed is not None:
+            self.seed = seed
+            self._rng = random.Random(seed)
+        self.model = BatchModel(
+            self.count,
+            self.screen_width,
+            self.screen_height,
+            [self._rng.randrange(MAX_SEED) for _ in range(self.count)],
+        )
+        self._start_y = self.model.player_y[0] if self.count else 0.0
+        self.steps[:] = 0
+        self.observe()
+        return self.observations, self._infos
+
+    def step(self, actions):
+        """
+        Moves every player racket by its action and advances every match
+        one physics step, resetting the matches whose episode ended.
+
+        When an episode ends, the observation returned for it is already
+        the first of the next episode.
+
+        Args:
+            actions: An int array of count indexes into ACTIONS.
+
+        Returns:
+            A tuple (observations, rewards, terminated, truncated, infos)
+            of the environment's arrays, like PongEnv.step.
+        """
+        model = self.model
+        np.take(self._actions, actions, out=self._speeds)
+        np.copyto(self._cpu_score, model.cpu_score)
+        np.copyto(self._player_score, model.player_score)
+        model.step(self._speeds)
+        self.steps += 1
+
+        # Reward the points won this step minus the points lost
+        player_points = self._player_score
+        cpu_points = self._cpu_score
+        np.subtract(model.player_score, player_points, out=player_points)
+        np.subtract(model.cpu_score, cpu_points, out=cpu_points)
+        np.subtract(player_points, cpu_points, out=self.rewards)
+        np.maximum(model.cpu_score, model.player_score, out=self._cpu_score)
+        np.greater_equal(self._cpu_score, WINNING_SCORE, out=self.terminated)
+        np.greater_equal(self.steps, self.max_steps, out=self.truncated)
+        # A match that was won this step isn't also cut short
+        np.greater(self.truncated, self.terminated, out=self.truncated)
+        np.logical_or(self.terminated, self.truncated, out=self._done)
+        if self._done.any():
+            self.reset_done()
+        self.observe()
+        return (
+            self.observations,
+            self.rewards,
+            self.terminated,
+            self.truncated,
+            self._infos,
+        )
+
+    def reset_done(self):
+        """
+        Starts a new episode in the matches whose episode just ended,
+        carrying on with each match's own random generator.
+        """
+        model = self.model
+        done = self._done
+        model.cpu_score[done] = 0
+        model.player_score[done] = 0
+        model.cpu_y[done] = self._start_y
+        model.player_y[done] = self._start_y
+        model.speed_x[done] = 6.0
+        model.speed_y[done] = 6.0
+        model.reset(done)
+        self.steps[done] = 0
+
+    def observe(self):
+        """
+        Writes the current state of every match into the observations array.
+        """
+        model = self.model
+        ball_x, ball_y, speed_x, speed_y, player_y, cpu_y = self._columns
+        np.divide(model.ball_x, self.screen_width, out=ball_x)
+        np.divide(model.ball_y, self.screen_height, out=ball_y)
+        np.divide(model.speed_x, SPEED_SCALE, out=speed_x)
+        np.divide(model.speed_y, SPEED_SCALE, out=speed_y)
+        np.divide(model.player_y, self.screen_height, out=player_y)
+        np.divide(model.cpu_y, self.screen_height, out=cpu_y)
@@ -0,0 +1,514 @@
+# pong_events.py
+"""
+Module for the EventSimulator class, which plays matches by jumping from
+one event to the next instead of stepping frame by frame.
+
+Between contacts the ball moves in a straight line, so the only moments
+that need any work are wall bounces, racket contacts and points scored.
+This module defines the EventSimulator class, which works out the time of
+the next of those events directly and moves everything straight to it, and
+the TrackingMotion and ScriptedMotion classes, which describe how a racket
+moves in between.
+
+Time is measured in frames, the same unit as a call to Model.move_objects.
+The ball moves continuously, as Model sweeps it, and the rackets move once
+at the end of every frame, as they do after each call to
+Model.move_objects. The motions work out where a racket is after any
+number of frames without stepping through them, so a match plays out like
+a stepped Model seeded the same way.
+
+"""
+import bisect
+import math
+import random
+from pong_model import (
+    MAX_BALL_SPEED,
+    MAX_BOUNCES_PER_STEP,
+    SPEED_Y_GAIN,
+    WINNING_SCORE,
+)
+
+BALL_SIZE = 20
+RACKET_WIDTH = 20
+RACKET_HEIGHT = 100
+
+# Longest a match is played for unless told otherwise, in frames. Matches
+# between the default rackets take under 100,000.
+MAX_FRAMES = 1_000_000
+
+# Event times this close to the end of a frame are taken to be exactly on
+# it. Model works out each frame from its start, but times here add up over
+# the whole match, and the rounding would otherwise push a wall bounce that
+# lands on the end of a frame into the next one.
+EPSILON = 1e-6
+
+# Decimal places the ball's height is rounded to where it is compared with a
+# racket, and at each wall bounce, for the same reason: rackets and the ball
+# are often exactly level in Model.
+HEIGHT_DIGITS = 6
+
+
+def snap_time(time):
+    """
+    Rounds a time that is within EPSILON of a whole frame to it.
+
+    Args:
+        time: A float representing a time in frames.
+
+    Returns:
+        A float representing the rounded time.
+    """
+    nearest = round(time)
+    return float(nearest) if abs(time - nearest) < EPSILON else time
+
+
+class TrackingMotion:
+    """
+    Moves a racket a fixed step toward the ball's center once a frame, like
+    Model.move_cpu and TrackingController do.
+
+    Attributes:
+        speed: A float representing how far the racket moves down a frame.
+        up_speed: A float representing how far the racket moves up a frame.
+        clamp: A bool representing whether the racket is kept on the screen.
+    """
+
+    def __init__(self, speed, up_speed=None, clamp=False):
+        """
+        Initializes the motion with the given speed.
+
+        Args:
+            speed: A float representing the racket's step in pixels a frame.
+            up_speed: An optional float representing a different step when
+                moving up, defaulting to speed.
+            clamp: A bool representing whether the racket is kept on the
+                screen, like the player's racket.
+        """
+        self.speed = speed
+        self.up_speed = speed if up_speed is None else up_speed
+        self.clamp = clamp
+
+    def advance(self, racket_y, ball_y, ball_speed_y, frame, count, limit):
+        """
+        Moves the racket at the end of each of a number of frames while the
+        ball travels in a straight line.
+
+        The frames are taken in runs in which the racket keeps moving the
+        same way, and the length of each run is worked out directly. A
+        racket that moves faster than the ball overshoots it and turns back
+        every frame once it catches up; those frames are taken one by one.
+
+        Args:
+            racket_y: A float representing the top of the racket.
+            ball_y: A float representing the top of the ball at the end of
+                the first frame.
+            ball_speed_y: The vertical speed of the ball in pixels per frame.
+            frame: Unused; part of the shared motion interface.
+            count: An int representing how many frames to move for.
+            limit: A float representing the lowest the top of the racket
+                may go when it is kept on the screen.
+
+        Returns:
+            A float representing the top of the racket after count frames.
+        """
+        elapsed = 0
+        while elapsed < count:
+            ball_center = ball_y + ball_speed_y * elapsed + BALL_SIZE / 2
+            gap = ball_center - (racket_y + RACKET_HEIGHT / 2)
+            if gap > 0:
+                step = self.speed
+                room = limit - racket_y if self.clamp else math.inf
+            elif gap < 0:
+                step = -self.up_speed
+                room = racket_y if self.clamp else math.inf
+            else:
+                # Level with the ball, the racket stays put for a frame
+                elapsed += 1 if ball_speed_y else count
+                continue
+            if room <= 0:
+                # Pressed against the edge of the screen
+                step = 0
+            run = count - elapsed
+            # Stop where the ball draws level or passes the racket
+            closing = (ball_speed_y - step) * (-1 if gap > 0 else 1)
+            if closing > 0:
+                run = min(run, math.ceil(abs(gap) / closing))
+            # Stop where the racket reaches the edge of the screen
+            if step and room != math.inf:
+                run = min(run, math.ceil(room / abs(step)))
+            racket_y += step * run
+            if self.clamp:
+                racket_y = min(max(racket_y, 0), limit)
+            elapsed += run
+        return racket_y
+
+
+# Model.move_cpu moves the racket 5.5 pixels a frame, up or down
+CPU_RULE = (5.5,)
+
+
+class ScriptedMotion:
+    """
+    Moves a racket by a timeline of inputs, like the speed_y values that
+    Controller.handle_events returns each frame.
+
+    Attributes:
+        frames: A sorted list of the frames at which the input changes.
+        speeds: A list of the speeds, in pixels per frame, that take effect
+            at the matching frame.
+        clamp: A bool representing whether the racket is kept on the screen.
+    """
+
+    def __init__(self, timeline, clamp=True):
+        """
+        Initializes the motion from a timeline of inputs.
+
+        Args:
+            timeline: A list of (frame, speed_y) tuples, where frame is an
+                int. Each speed holds from its frame until the next entry;
+                before the first entry the racket stays still.
+            clamp: A bool representing whether the racket is kept on the
+                screen.
+        """
+        timeline = sorted(timeline)
+        self.frames = [frame for frame, _ in timeline]
+        self.speeds = [speed for _, speed in timeline]
+        self.clamp = clamp
+
+    def speed_at(self, frame):
+        """
+        Gets the input in effect in a frame.
+
+        Args:
+            frame: An int representing the frame.
+
+        Returns:
+            The racket speed in pixels per frame.
+        """
+        index = bisect.bisect_right(self.frames, frame) - 1
+        return self.speeds[index] if index >= 0 else 0
+
+    def advance(self, racket_y, ball_y, ball_speed_y, frame, count, limit):
+        """
+        Moves the racket by the inputs in effect over a number of frames.
+
+        The racket moves the same way for as long as the input stays the
+        same, so it is kept on the screen at the end of each of those runs,
+        which leaves it where clamping it every frame would.
+
+        Args:
+            racket_y: A float representing the top of the racket.
+            ball_y: Unused; part of the shared motion interface.
+            ball_speed_y: Unused; part of the shared motion interface.
+            frame: An int representing the first frame to move in.
+            count: An int representing how many frames to move for.
+            limit: A float representing the lowest the top of the racket
+                may go when it is kept on the screen.
+
+        Returns:
+            A float representing the top of the racket after count frames.
+        """
+        end = frame + count
+        index = bisect.bisect_right(self.frames, frame)
+        while frame < end:
+            next_change = (
+                self.frames[index] if index < len(self.frames) else end
+            )
+            run_end = min(next_change, end)
+            racket_y += self.speed_at(frame) * (run_end - frame)
+            if self.clamp:
+                racket_y = min(max(racket_y, 0), limit)
+            frame = run_end
+            index += 1
+        return racket_y
+
+
+class EventSimulator:
+    """
+    Plays a match by jumping straight from one event to the next.
+
+    Attributes:
+        screen_width: An int representing the width of the game screen.
+        screen_height: An int representing the height of the game screen.
+        rng: The random.Random instance used when the ball is reset.
+        cpu_motion: The motion followed by the CPU racket.
+        player_motion: The motion followed by the player racket.
+        time: A float representing the frames played so far.
+        frame: An int representing the frame the ball is moving in. The
+            rackets are where they were at its start.
+        frame_bounces: An int counting the bounces in the current frame.
+        ball_x: A float representing the left side of the ball.
+        ball_y: A float representing the top of the ball.
+        speed_x: The horizontal speed of the ball in pixels per frame.
+        speed_y: The vertical speed of the ball in pixels per frame.
+        cpu_x: An int representing the left side of the CPU racket.
+        player_x: An int representing the left side of the player racket.
+        cpu_y: A float representing the top of the CPU racket.
+        player_y: A float representing the top of the player racket.
+        cpu_score: The score of the CPU.
+        player_score: The score of the player.
+        wall_bounces: An int counting bounces off the top and bottom walls.
+        contacts: An int counting hits off either racket.
+    """
+
+    def __init__(
+        self,
+        screen_width,
+        screen_height,
+        seed=None,
+        cpu_motion=None,
+        player_motion=None,
+    ):
+        """
+        Initializes a new match with the given screen dimensions.
+
+        Args:
+            screen_width: An int representing the width of the game screen.
+            screen_height: An int representing the height of the game screen.
+            seed: An optional seed for the ball's random resets.
+            cpu_motion: An optional motion for the CPU racket, defaulting to
+                the CPU tracking rule of Model.move_cpu.
+            player_motion: An optional motion for the player racket,
+                defaulting to the ball-tracking TrackingController.
+        """
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.rng = random.Random(seed)
+        self.cpu_motion = cpu_motion or TrackingMotion(*CPU_RULE)
+        self.player_motion = player_motion or TrackingMotion(6, clamp=True)
+        self.time = 0.0
+        self.frame = 0
+        self.frame_bounces = 0
+        self.ball_x = 0.0
+        self.ball_y = 0.0
+        self.speed_x = 6
+        self.speed_y = 6
+        self.cpu_x = 0
+        self.player_x = screen_width - 50
+        self.cpu_y = screen_height / 2 - 50
+        self.player_y = screen_height / 2 - 50
+        self.cpu_score = 0
+        self.player_score = 0
+        self.wall_bounces = 0
+        self.contacts = 0
+        self.reset_ball()
+
+    def reset_ball(self):
+        """
+        Resets the position and speed of the ball, drawing from the random
+        generator in the same order as Ball.reset.
+        """
+        self.ball_x = self.screen_width / 2 - 10
+        self.ball_y = float(self.rng.randint(10, self.screen_height - 10))
+        self.speed_x = self.rng.choice([-1, 1]) * abs(self.speed_x)
+        self.speed_y = self.rng.choice([-1, 1]) * abs(self.speed_y)
+
+    def game_over(self):
+        """
+        Checks whether either side has reached the winning score.
+
+        Returns:
+            A bool that is True once the CPU or the player has won.
+        """
+        return (
+            self.cpu_score >= WINNING_SCORE
+            or self.player_score >= WINNING_SCORE
+        )
+
+    def frame_at(self, time):
+        """
+        Finds the frame in which something at a time happens.
+
+        Args:
+            time: A float representing a time no earlier than self.time.
+
+        Returns:
+            An int representing the frame. A time on the boundary between
+            two frames belongs to the end of the earlier one, as in
+            Model.move_objects, unless that frame is already over.
+        """
+        return max(self.frame, math.ceil(time) - 1)
+
+    def move_rackets(self, frame):
+        """
+        Moves both rackets at the end of each frame up to the given one,
+        toward where the ball is at the end of each frame.
+
+        Args:
+            frame: An int representing the frame to move the rackets to the
+                start of.
+        """
+        count = frame - self.frame
+        if count <= 0:
+            return
+        ball_y = round(
+            self.ball_y + self.speed_y * (self.frame + 1 - self.time),
+            HEIGHT_DIGITS,
+        )
+        limit = self.screen_height - RACKET_HEIGHT
+        self.player_y = self.player_motion.advance(
+            self.player_y, ball_y, self.speed_y, self.frame, count, limit
+        )
+        self.cpu_y = self.cpu_motion.advance(
+            self.cpu_y, ball_y, self.speed_y, self.frame, count, limit
+        )
+        self.frame = frame
+        self.frame_bounces = 0
+
+    def wall_time(self):
+        """
+        Finds when the ball will touch the top or bottom wall it is moving
+        toward, as Model.wall_time does.
+
+        Returns:
+            A float representing the time of impact, or infinity if the
+            ball never will.
+        """
+        if self.speed_y < 0:
+            return snap_time(
+                self.time + max(0.0, -self.ball_y / self.speed_y)
+            )
+        if self.speed_y > 0:
+            bottom = self.screen_height - BALL_SIZE
+            return snap_time(
+                self.time + max(0.0, (bottom - self.ball_y) / self.speed_y)
+            )
+        return math.inf
+
+    def racket_time(self, before):
+        """
+        Finds when the ball will hit the face of the racket it is moving
+        toward, as Model.racket_time does, moving the rackets up to the
+        frame of the impact to see whether the ball hits.
+
+        Args:
+            before: A float representing the time of the next wall bounce.
+                Impacts after it are not looked at, since the bounce changes
+                the ball's path.
+
+        Returns:
+            A float representing the time of impact, or infinity if there
+            is none before the wall bounce.
+        """
+        if self.speed_x < 0 and self.ball_x >= self.cpu_x + RACKET_WIDTH:
+            impact = (self.cpu_x + RACKET_WIDTH - self.ball_x) / self.speed_x
+        elif self.speed_x > 0 and self.ball_x + BALL_SIZE <= self.player_x:
+            impact = (self.player_x - BALL_SIZE - self.ball_x) / self.speed_x
+        else:
+            return math.inf
+        time = snap_time(self.time + impact)
+        if time > before:
+            return math.inf
+        self.move_rackets(self.frame_at(time))
+        racket_y = self.cpu_y if self.speed_x < 0 else self.player_y
+        ball_y = round(self.ball_y + self.speed_y * impact, HEIGHT_DIGITS)
+        if racket_y < ball_y + BALL_SIZE and ball_y < racket_y + RACKET_HEIGHT:
+            return time
+        return math.inf
+
+    def point_time(self):
+        """
+        Finds when the ball will be scored. Model.move_objects only checks
+        at the end of a frame, so this is the end of the frame in which the
+        ball reaches either edge of the screen.
+
+        Returns:
+            An int representing the time the point is scored.
+        """
+        if self.speed_x < 0:
+            reach = -self.ball_x / self.speed_x
+        else:
+            goal = self.screen_width - BALL_SIZE
+            reach = (goal - self.ball_x) / self.speed_x
+        return max(math.ceil(self.time + reach), self.frame + 1)
+
+    def move_ball(self, time):
+        """
+        Moves the ball forward in a straight line.
+
+        Args:
+            time: A float representing the time to move the ball to.
+        """
+        duration = time - self.time
+        self.ball_x += self.speed_x * duration
+        self.ball_y += self.speed_y * duration
+        self.time = time
+
+    def step(self):
+        """
+        Moves straight to the next event and handles it.
+
+        Returns:
+            A string representing the kind of event handled: "wall",
+            "racket", "both" when the ball hits a wall and a racket at once,
+            or "point".
+        """
+        wall_time = self.wall_time()
+        racket_time = self.racket_time(wall_time)
+        time = min(wall_time, racket_time)
+        # A ball heading for a racket it hits can't be scored before then
+        point_time = self.point_time() if racket_time == math.inf else time
+        if point_time < time:
+            self.move_rackets(point_time - 1)
+            if self.speed_x > 0:
+                self.cpu_score += 1
+            else:
+                self.player_score += 1
+            self.reset_ball()
+            self.time = float(point_time)
+            self.move_rackets(point_time)
+            return "point"
+
+        self.move_rackets(self.frame_at(time))
+        self.move_ball(time)
+        if wall_time == time:
+            self.ball_y = round(self.ball_y, HEIGHT_DIGITS)
+            self.speed_y *= -1
+            self.wall_bounces += 1
+        if racket_time == time:
+            # Like Ball.bounce_horizontal, stop at MAX_BALL_SPEED
+            self.speed_x = max(
+                -MAX_BALL_SPEED, min(self.speed_x * -1.002, MAX_BALL_SPEED)
+            )
+            self.speed_y = max(
+                -MAX_BALL_SPEED,
+                min(
+                    self.speed_y + math.copysign(SPEED_Y_GAIN, self.speed_y),
+                    MAX_BALL_SPEED,
+                ),
+            )
+            self.contacts += 1
+        self.frame_bounces += 1
+        if self.frame_bounces == MAX_BOUNCES_PER_STEP:
+            # Like move_objects, the ball stays put for the rest of a frame
+            # in which it has bounced as many times as a step allows
+            self.time = float(self.frame + 1)
+            self.move_rackets(self.frame + 1)
+        if wall_time != time:
+            return "racket"
+        return "wall" if racket_time != time else "both"
+
+    def run(self, max_frames=MAX_FRAMES):
+        """
+        Plays the match until a side wins or max_frames have passed.
+
+        Args:
+            max_frames: A number representing the longest the match may
+                last, in frames.
+
+        Returns:
+            A dict with the final scores, the frames played, and the number
+            of wall bounces, racket contacts and events handled.
+        """
+        events = 0
+        while not self.game_over() and self.time < max_frames:
+            self.step()
+            events += 1
+        return {
+            "cpu_score": self.cpu_score,
+            "player_score": self.player_score,
+            "frames": self.time,
+            "wall_bounces": self.wall_bounces,
+            "contacts": self.contacts,
+            "events": events,
+        }
@@ -9,10 +9,182 @@ and the player and CPU rackets, respectively.
 The Model class manages the game state, including the positions of game
 objects, scoring, and collision detection.
 
+The model doesn't use pygame. Positions are kept in Box objects as floats,
+so fractional speeds such as the CPU's 5.5 pixels a step aren't rounded
+away, and the same steps give the same results in every process; the View
+rounds them to pixels only when drawing.
+
 """
+import math
 import random
+import struct
 import sys
-import pygame
+
+# The score a side needs to reach to win the match.
+WINNING_SCORE = 5
+
+# Most bounces resolved within a single step of move_objects.
+MAX_BOUNCES_PER_STEP = 4
+
+# Fastest the ball moves along either axis, in pixels per step: twice its
+# serve speed, which is faster than a racket can follow.
+MAX_BALL_SPEED = 12
+
+# Vertical speed the ball gains from each racket hit, in pixels per step.
+# Once the ball outpaces a racket, the racket can miss it, so rallies end in
+# a point. A power of two keeps the ball's height exact in floating point.
+SPEED_Y_GAIN = 1 / 32
+
+# Most steps a match between computer players is played for before it is
+# abandoned. Matches between the built-in rackets take about 2,500 to 18,000
+# steps, but two rackets that predict the ball perfectly never miss.
+MAX_MATCH_STEPS = 50_000
+
+# Seeds picked for unseeded models are below this, so they fit in 64 bits.
+MAX_SEED = 2**64
+
+# Layout of Model.snapshot: ball x, y, speed_x and speed_y, player and CPU
+# racket y, CPU and player scores, then the Mersenne Twister state (624
+# words and an index), whether a Gaussian value is cached, and that value.
+SNAPSHOT = struct.Struct("<6d2q625I?d")
+SNAPSHOT_SIZE = SNAPSHOT.size
+
+
+class Box:
+    """
+    Represents the position and size of an object, with the same attribute
+    names as pygame.Rect but holding floats.
+
+    Attributes:
+        x: A float representing the x-coordinate of the left side.
+        y: A float representing the y-coordinate of the top.
+        width: A number representing the width.
+        height: A number representing the height.
+    """
+
+    __slots__ = ("x", "y", "width", "height")
+
+    def __init__(self, x, y, width, height):
+        """
+        Initializes a box with the given position and size.
+
+        Args:
+            x: A number representing the x-coordinate of the left side.
+            y: A number representing the y-coordinate of the top.
+            width: A number representing the width.
+            height: A number representing the height.
+        """
+        self.x = float(x)
+        self.y = float(y)
+        self.width = width
+        self.height = height
+
+    def __iter__(self):
+        """
+        Iterates over the box's x, y, width and height, like pygame.Rect.
+
+        Returns:
+            An iterator over the four values.
+        """
+        return iter((self.x, self.y, self.width, self.height))
+
+    def __eq__(self, other):
+        """
+        Checks whether another box, or a tuple of x, y, width and height,
+        has the same position and size.
+
+        Args:
+            other: The Box or tuple to compare with.
+
+        Returns:
+            A bool that is True if all four values are equal.
+        """
+        if not isinstance(other, (Box, tuple)):
+            return NotImplemented
+        return tuple(self) == tuple(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        """
+        Describes the box.
+
+        Returns:
+            A string such as "Box(10.0, 20.5, 20, 100)".
+        """
+        return f"Box({self.x!r}, {self.y!r}, {self.width!r}, {self.height!r})"
+
+    @property
+    def left(self):
+        """A float representing the x-coordinate of the left side."""
+        return self.x
+
+    @left.setter
+    def left(self, value):
+        self.x = value
+
+    @property
+    def right(self):
+        """A float representing the x-coordinate of the right side."""
+        return self.x + self.width
+
+    @right.setter
+    def right(self, value):
+        self.x = value - self.width
+
+    @property
+    def top(self):
+        """A float representing the y-coordinate of the top."""
+        return self.y
+
+    @top.setter
+    def top(self, value):
+        self.y = value
+
+    @property
+    def bottom(self):
+        """A float representing the y-coordinate of the bottom."""
+        return self.y + self.height
+
+    @bottom.setter
+    def bottom(self, value):
+        self.y = value - self.height
+
+    @property
+    def centerx(self):
+        """A float representing the x-coordinate of the center."""
+        return self.x + self.width / 2
+
+    @centerx.setter
+    def centerx(self, value):
+        self.x = value - self.width / 2
+
+    @property
+    def centery(self):
+        """A float representing the y-coordinate of the center."""
+        return self.y + self.height / 2
+
+    @centery.setter
+    def centery(self, value):
+        self.y = value - self.height / 2
+
+    @property
+    def topleft(self):
+        """A tuple of the x- and y-coordinates of the top-left corner."""
+        return self.x, self.y
+
+    @topleft.setter
+    def topleft(self, value):
+        self.x, self.y = value
+
+    @property
+    def center(self):
+        """A tuple of the x- and y-coordinates of the center."""
+        return self.centerx, self.centery
+
+    @center.setter
+    def center(self, value):
+        self.centerx, self.centery = value
 
 
 class Ball:
@@ -22,27 +194,37 @@ class Ball:
     Attributes:
         screen_width: An int representing the width of the game screen.
         screen_height: An int representing the height of the game screen.
-        speed_x: An int representing the horizontal speed of the ball.
-        speed_y: An int representing the vertical speed of the ball.
-        rect: An instance of the pygame.Rect class, which represents a
-            rectangle representing the position and size of the racket.
+        speed_x: A number representing the horizontal speed of the ball.
+        speed_y: A number representing the vertical speed of the ball.
+        rect: A Box representing the position and size of the ball.
+        rng: The random.Random instance used when the ball is reset.
     """
 
-    def __init__(self, screen_width, screen_height):
+    __slots__ = (
+        "screen_width",
+        "screen_height",
+        "rng",
+        "speed_x",
+        "speed_y",
+        "rect",
+    )
+
+    def __init__(self, screen_width, screen_height, rng=None):
         """
         Initializes a new ball object with given screen width and height.
 
         Args:
             screen_width: An int representing The width of the game screen.
             screen_height: An int representing the height of the game screen.
+            rng: An optional random.Random instance to draw resets from,
+                defaulting to a new unseeded one.
         """
         self.screen_width = screen_width
         self.screen_height = screen_height
+        self.rng = random.Random() if rng is None else rng
         self.speed_x = 6
         self.speed_y = 6
-        self.rect = pygame.Rect(
-            self.screen_width / 2, self.screen_height / 2, 20, 20
-        )
+        self.rect = Box(self.screen_width / 2, self.screen_height / 2, 20, 20)
         self.reset()
 
     def reset(self):
@@ -50,9 +232,9 @@ class Ball:
         Resets the position and speed of the ball.
         """
         self.rect.x = self.screen_width / 2 - 10
-        self.rect.y = random.randint(10, self.screen_height - 10)
-        self.speed_x = random.choice([-1, 1]) * abs(self.speed_x)
-        self.speed_y = random.choice([-1, 1]) * abs(self.speed_y)
+        self.rect.y = float(self.rng.randint(10, self.screen_height - 10))
+        self.speed_x = self.rng.choice([-1, 1]) * abs(self.speed_x)
+        self.speed_y = self.rng.choice([-1, 1]) * abs(self.speed_y)
 
     def move(self):
         """
@@ -69,9 +251,73 @@ class Ball:
 
     def bounce_horizontal(self):
         """
-        Reverses and increases the horizontal direction of the ball.
+        Reverses the horizontal direction of the ball and speeds it up
+        along both axes, up to MAX_BALL_SPEED.
         """
-        self.speed_x *= -1.002
+        self.speed_x = max(
+            -MAX_BALL_SPEED, min(self.speed_x * -1.002, MAX_BALL_SPEED)
+        )
+        self.speed_y = max(
+            -MAX_BALL_SPEED,
+            min(
+                self.speed_y + math.copysign(SPEED_Y_GAIN, self.speed_y),
+                MAX_BALL_SPEED,
+            ),
+        )
+
+
+def predict_crossing(ball, x_coordinate):
+    """
+    Predicts where and when the ball will next reach an x-coordinate,
+    folding in any number of bounces off the top and bottom walls.
+
+    The answer is worked out directly from the ball's current position and
+    speed, so it costs the same however far away the crossing is. Rackets
+    are ignored.
+
+    Args:
+        ball: The Ball object to predict for.
+        x_coordinate: A number representing the x-coordinate that the left
+            side of the ball should reach.
+
+    Returns:
+        A tuple (time, y_coordinate, speed_y) giving the number of steps
+        until the crossing, the y-coordinate of the top of the ball and its
+        vertical speed at that moment, or None if the ball is not moving
+        toward x_coordinate.
+    """
+    if ball.speed_x == 0:
+        return None
+    time = (x_coordinate - ball.rect.x) / ball.speed_x
+    if time < 0:
+        return None
+    y_coordinate = ball.rect.y
+    speed_y = ball.speed_y
+    span = ball.screen_height - ball.rect.height
+    if span <= 0:
+        return time, y_coordinate, speed_y
+    if not 0 <= y_coordinate <= span:
+        # A serve can start past a wall. Like move_objects, bounce the ball
+        # straight back if it is heading further out, then follow it in a
+        # straight line until it is back inside the court.
+        edge = 0 if y_coordinate < 0 else span
+        if (y_coordinate - edge) * speed_y > 0:
+            speed_y = -speed_y
+        entry = (edge - y_coordinate) / speed_y if speed_y else math.inf
+        if time <= entry:
+            return time, y_coordinate + speed_y * time, speed_y
+        y_coordinate = edge
+        elapsed = time - entry
+    else:
+        elapsed = time
+    # Follow the ball as if the walls were mirrors tiling the plane, then
+    # fold the unbounded position back into the court
+    unfolded = y_coordinate + speed_y * elapsed
+    bounces = math.floor(unfolded / span)
+    offset = unfolded - bounces * span
+    if bounces % 2 == 0:
+        return time, offset, speed_y
+    return time, span - offset, -speed_y
 
 
 class Racket:
@@ -79,10 +325,11 @@ class Racket:
     Represents a racket object in the game.
 
     Attributes:
-        rect: An instance of the pygame.Rect class, which represents a
-            rectangle representing the position and size of the racket.
+        rect: A Box representing the position and size of the racket.
     """
 
+    __slots__ = ("rect",)
+
     def __init__(self, x_coordinate, y_coordinate):
         """
         Initializes a new racket object with the given position.
@@ -93,7 +340,7 @@ class Racket:
             y_coordinate: An int representing the y-coordinate of the
             top-left corner of the racket.
         """
-        self.rect = pygame.Rect(x_coordinate, y_coordinate, 20, 100)
+        self.rect = Box(x_coordinate, y_coordinate, 20, 100)
 
     def move(self, speed_y):
         """
@@ -118,38 +365,72 @@ class Model:
         player: The player-controlled racket object.
         cpu_score: The score of the CPU.
         player_score: The score of the player.
+        seed: The int that seeded this model's random generator.
+        rng: The model's own random.Random instance.
+        cpu_policy: An optional policy deciding how the CPU's racket moves,
+            in place of the built-in tracking rule.
     """
 
-    def __init__(self, screen_width, screen_height):
+    def __init__(
+        self, screen_width, screen_height, seed=None, cpu_policy=None
+    ):
         """
         Initializes a new game model with the given screen dimensions.
 
         Args:
             screen_width: An int representing the width of the game screen.
             screen_height: An int representing the height of the game screen.
+            seed: An optional int to seed the model's random generator with,
+                so the match can be reproduced. A random seed is picked if
+                none is given.
+            cpu_policy: An optional callable taking the model and the side
+                "cpu" and returning the amount by which to move the CPU's
+                racket, such as a pong_policies.Policy.
         """
         self.screen_width = screen_width
         self.screen_height = screen_height
-        self.ball = Ball(screen_width, screen_height)
+        self.seed = random.randrange(MAX_SEED) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.ball = Ball(screen_width, screen_height, self.rng)
         self.cpu = Racket(0, screen_height / 2 - 50)
         self.player = Racket(screen_width - 50, screen_height / 2 - 50)
         self.cpu_score = 0
         self.player_score = 0
+        self.cpu_policy = cpu_policy
 
     def move_objects(self):
         """
         Moves the objects in the game and handles collisions and scoring.
+
+        The ball is swept along its path for the whole step: each bounce off
+        a wall or a racket face is resolved at the exact time of impact and
+        the ball carries on in its new direction for the rest of the step, so
+        it cannot pass through a racket however fast it moves. Only rackets
+        the ball is moving toward are hit, so it never bounces twice off the
+        same racket.
         """
-        self.ball.move()
-        if self.ball.rect.colliderect(
-            self.cpu.rect
-        ) or self.ball.rect.colliderect(self.player.rect):
-            self.ball.bounce_horizontal()
-        if (
-            self.ball.rect.bottom >= self.screen_height
-            or self.ball.rect.top <= 0
-        ):
-            self.ball.bounce_vertical()
+        ball = self.ball
+        x_position = ball.rect.x
+        y_position = ball.rect.y
+        remaining = 1.0
+        for _ in range(MAX_BOUNCES_PER_STEP):
+            wall_time = self.wall_time(y_position, ball.speed_y)
+            racket_time = self.racket_time(
+                x_position, y_position, ball.speed_x, ball.speed_y
+            )
+            step = min(wall_time, racket_time, remaining)
+            x_position += ball.speed_x * step
+            y_position += ball.speed_y * step
+            remaining -= step
+            if wall_time != step and racket_time != step:
+                break
+            if wall_time == step:
+                ball.bounce_vertical()
+            if racket_time == step:
+                ball.bounce_horizontal()
+        ball.rect.x = x_position
+        ball.rect.y = y_position
+
         if self.ball.rect.right >= self.screen_width:
             self.cpu_score += 1
             self.ball.reset()
@@ -157,6 +438,59 @@ class Model:
             self.player_score += 1
             self.ball.reset()
 
+    def wall_time(self, y_position, speed_y):
+        """
+        Finds when the ball will touch the top or bottom wall it is moving
+        toward.
+
+        Args:
+            y_position: A float representing the y-coordinate of the top of
+                the ball.
+            speed_y: The vertical speed of the ball in pixels per step.
+
+        Returns:
+            A float representing the time of impact in steps, 0 if the ball
+            is already touching the wall, or infinity if it never will.
+        """
+        if speed_y < 0:
+            return max(0.0, (0 - y_position) / speed_y)
+        if speed_y > 0:
+            bottom = self.screen_height - self.ball.rect.height
+            return max(0.0, (bottom - y_position) / speed_y)
+        return math.inf
+
+    def racket_time(self, x_position, y_position, speed_x, speed_y):
+        """
+        Finds when the ball will hit the face of the racket it is moving
+        toward.
+
+        Args:
+            x_position: A float representing the x-coordinate of the left
+                side of the ball.
+            y_position: A float representing the y-coordinate of the top of
+                the ball.
+            speed_x: The horizontal speed of the ball in pixels per step.
+            speed_y: The vertical speed of the ball in pixels per step.
+
+        Returns:
+            A float representing the time of impact in steps, or infinity if
+            the ball misses the racket or is already past its face.
+        """
+        width = self.ball.rect.width
+        height = self.ball.rect.height
+        if speed_x < 0 and x_position >= self.cpu.rect.right:
+            racket = self.cpu.rect
+            impact = (racket.right - x_position) / speed_x
+        elif speed_x > 0 and x_position + width <= self.player.rect.left:
+            racket = self.player.rect
+            impact = (racket.left - (x_position + width)) / speed_x
+        else:
+            return math.inf
+        y_at_impact = y_position + speed_y * impact
+        if racket.top < y_at_impact + height and y_at_impact < racket.bottom:
+            return impact
+        return math.inf
+
     def move_player(self, speed_y):
         """
         Moves the player's racket vertically and ensures it stays within
@@ -172,18 +506,120 @@ class Model:
             self.player.rect.bottom, self.screen_height
         )
 
+    def move_opponent(self, speed_y):
+        """
+        Moves the CPU's racket by a given amount instead of tracking the
+        ball, for when another person controls it, and ensures it stays
+        within the screen bounds.
+
+        Args:
+            speed_y: An int representing the amount by which to move the
+            CPU's racket vertically.
+        """
+        self.cpu.move(speed_y)
+        self.cpu.rect.top = max(self.cpu.rect.top, 0)
+        self.cpu.rect.bottom = min(self.cpu.rect.bottom, self.screen_height)
+
     def move_cpu(self):
         """
-        Moves the CPU's racket vertically to track the ball's position.
+        Moves the CPU's racket vertically to track the ball's position, or as
+        cpu_policy decides if the model has one. A racket moved by a policy
+        is kept within the screen bounds, like the player's.
         """
-        if self.ball.rect.centery < self.cpu.rect.centery:
+        if self.cpu_policy is not None:
+            self.move_opponent(self.cpu_policy(self, "cpu"))
+        elif self.ball.rect.centery < self.cpu.rect.centery:
             self.cpu.rect.y -= 5.5
         elif self.ball.rect.centery > self.cpu.rect.centery:
             self.cpu.rect.y += 5.5
 
+    def positions(self):
+        """
+        Gets the top-left corners of the ball and both rackets.
+
+        Returns:
+            A dict mapping "ball", "player" and "cpu" to (x, y) tuples.
+        """
+        return {
+            "ball": (self.ball.rect.x, self.ball.rect.y),
+            "player": (self.player.rect.x, self.player.rect.y),
+            "cpu": (self.cpu.rect.x, self.cpu.rect.y),
+        }
+
+    def snapshot(self, buffer=None):
+        """
+        Packs the whole game state, including the random generator, into a
+        fixed-layout buffer of SNAPSHOT_SIZE bytes.
+
+        Args:
+            buffer: An optional writable buffer of at least SNAPSHOT_SIZE
+                bytes to pack into, so repeated snapshots can reuse memory.
+                A new bytearray is used if none is given.
+
+        Returns:
+            A memoryview of the packed state.
+        """
+        if buffer is None:
+            buffer = bytearray(SNAPSHOT_SIZE)
+        _, rng_state, gauss_next = self.rng.getstate()
+        SNAPSHOT.pack_into(
+            buffer,
+            0,
+            self.ball.rect.x,
+            self.ball.rect.y,
+            self.ball.speed_x,
+            self.ball.speed_y,
+            self.player.rect.y,
+            self.cpu.rect.y,
+            self.cpu_score,
+            self.player_score,
+            *rng_state,
+            gauss_next is not None,
+            gauss_next or 0.0,
+        )
+        return memoryview(buffer)[:SNAPSHOT_SIZE]
+
+    def restore(self, buffer):
+        """
+        Loads game state packed by snapshot back into this model, keeping
+        the same Ball, Racket and random generator objects.
+
+        Args:
+            buffer: A buffer holding a snapshot taken from a model with the
+                same screen dimensions.
+        """
+        values = SNAPSHOT.unpack_from(buffer)
+        (
+            self.ball.rect.x,
+            self.ball.rect.y,
+            self.ball.speed_x,
+            self.ball.speed_y,
+            self.player.rect.y,
+            self.cpu.rect.y,
+            self.cpu_score,
+            self.player_score,
+        ) = values[:8]
+        self.rng.setstate(
+            (3, values[8:-2], values[-1] if values[-2] else None)
+        )
+
+    def game_over(self):
+        """
+        Checks whether either side has reached the winning score.
+
+        Returns:
+            A bool that is True once the CPU or the player has won.
+        """
+        return (
+            self.cpu_score >= WINNING_SCORE
+            or self.player_score >= WINNING_SCORE
+        )
+
     def quit_game(self):
         """
-        Quit the game.
+        Quit the game, shutting pygame down if it was started.
         """
-        pygame.quit()
+        pygame = sys.modules.get("pygame")
+        if pygame is not None:
+            pygame.quit()
         sys.exit()
@@ -0,0 +1,489 @@
+# pong_netplay.py
+"""
+Module for playing Tennis Pong between two machines over UDP.
+
+Both peers run the same seeded Model. The host's input moves the player's
+racket and the guest's input moves the CPU's racket in place of
+Model.move_cpu. Each input is sent ahead of time and only applied after a
+configurable input delay, which hides most of the network latency. When an
+input still arrives after the frame it belongs to was simulated with a
+guessed value, the game rolls back to a snapshot taken before that frame
+and simulates forward again with the real input.
+
+A match ends as soon as a side reaches WINNING_SCORE, like a local one, or
+after a set number of frames. Both peers only stop once they have
+simulated the winning frame with each other's real inputs, so they always
+agree on the result.
+
+This module defines the RollbackSession class, which holds that logic and
+needs no network, the NetplayProtocol class, which exchanges inputs, pings
+and the match seed over asyncio UDP, and the run_peer coroutine, which
+drives one side of a match.
+
+"""
+import asyncio
+import socket
+import struct
+import time
+from pong_model import SNAPSHOT_SIZE, Model
+
+HOST = "host"
+GUEST = "guest"
+
+# Frames a session may run ahead of the last input it received from the
+# other side. Snapshots are kept for this many frames.
+ROLLBACK_WINDOW = 60
+
+# Ticks between round-trip time measurements
+PING_INTERVAL = 30
+
+# Seconds without a packet from the other side before giving up
+PEER_TIMEOUT = 5.0
+
+# Seconds to wait for the other side to join before giving up
+HANDSHAKE_TIMEOUT = 30.0
+
+# Seconds between hellos sent by the guest while waiting for the host
+HELLO_INTERVAL = 0.1
+
+HELLO = struct.Struct("<c")
+WELCOME = struct.Struct("<cQ")
+# Kind, newest frame received from the sender's peer, first frame, count
+INPUTS = struct.Struct("<ciIH")
+PING = struct.Struct("<cd")
+
+
+class RollbackSession:
+    """
+    Runs a shared match with delayed local input and rollback for late
+    remote input.
+
+    Attributes:
+        model: The Model object being played.
+        side: A string, HOST or GUEST, representing which racket is local.
+        input_delay: An int representing how many frames after it is read
+            a local input is applied.
+        frame: An int representing the next frame to simulate.
+        remote_confirmed: An int representing the newest frame up to which
+            every remote input has arrived.
+        remote_ack: An int representing the newest frame up to which the
+            other side has every local input.
+        rollbacks: An int counting how many times the session rolled back.
+        resimulated_frames: An int counting the frames simulated again.
+    """
+
+    def __init__(self, model, side, input_delay=2):
+        """
+        Initializes a session at frame 0.
+
+        Args:
+            model: The Model object to play, created with the seed shared by
+                both peers.
+            side: A string, HOST or GUEST, representing which racket is
+                local. The host moves the player's racket.
+            input_delay: An int representing how many frames after it is
+                read a local input is applied.
+        """
+        self.model = model
+        self.side = side
+        self.input_delay = input_delay
+        self.frame = 0
+        self.rollbacks = 0
+        self.resimulated_frames = 0
+        # Neither side has input for the frames before the delay runs out
+        self.local_inputs = dict.fromkeys(range(input_delay), 0)
+        self.remote_inputs = dict.fromkeys(range(input_delay), 0)
+        self.remote_confirmed = input_delay - 1
+        self.remote_ack = input_delay - 1
+        self.used_remote = {}
+        self.rollback_frame = None
+        self._snapshots = [
+            bytearray(SNAPSHOT_SIZE) for _ in range(ROLLBACK_WINDOW + 1)
+        ]
+
+    def add_local_input(self, speed_y):
+        """
+        Schedules a local input for the frame input_delay frames from now.
+
+        Args:
+            speed_y: An int representing the amount by which to move the
+                local racket vertically.
+
+        Returns:
+            An int representing the frame the input was scheduled for.
+        """
+        target = self.frame + self.input_delay
+        self.local_inputs.setdefault(target, speed_y)
+        return target
+
+    def unacknowledged_inputs(self):
+        """
+        Gets the local inputs the other side hasn't confirmed receiving.
+
+        Every packet repeats all of them, so a lost packet only delays an
+        input until the next one.
+
+        Returns:
+            A tuple of the first frame and a list of inputs from that frame
+            up to the newest scheduled one.
+        """
+        first = self.remote_ack + 1
+        inputs = []
+        while first + len(inputs) in self.local_inputs:
+            inputs.append(self.local_inputs[first + len(inputs)])
+        return first, inputs
+
+    def acknowledge(self, frame):
+        """
+        Records that the other side has every local input up to a frame.
+
+        Args:
+            frame: An int representing the newest frame confirmed.
+        """
+        while self.remote_ack < frame:
+            self.remote_ack += 1
+            # Keep the input if it may still be simulated again locally
+            if self.remote_ack < self.frame - ROLLBACK_WINDOW:
+                self.local_inputs.pop(self.remote_ack, None)
+
+    def add_remote_input(self, frame, speed_y):
+        """
+        Records an input from the other side, scheduling a rollback if a
+        frame was already simulated with a different guess.
+
+        Args:
+            frame: An int representing the frame the input belongs to.
+            speed_y: An int representing the amount by which to move the
+                remote racket vertically.
+        """
+        if frame in self.remote_inputs or frame <= self.remote_confirmed:
+            return
+        self.remote_inputs[frame] = speed_y
+        while self.remote_confirmed + 1 in self.remote_inputs:
+            self.remote_confirmed += 1
+        if frame < self.frame and self.used_remote.get(frame) != speed_y:
+            if self.rollback_frame is None or frame < self.rollback_frame:
+                self.rollback_frame = frame
+
+    def match_over(self):
+        """
+        Checks whether a side has won in the latest simulated frame.
+
+        The answer may change while remote inputs are still being guessed,
+        if a late one leads to a rollback.
+
+        Returns:
+            A bool that is True if the model's match has a winner.
+        """
+        self.settle()
+        return self.model.game_over()
+
+    def can_advance(self):
+        """
+        Checks whether the session may simulate another frame without
+        running further ahead of the other side than it can roll back.
+
+        Returns:
+            A bool that is True if advance may be called.
+        """
+        return self.frame - self.remote_confirmed < ROLLBACK_WINDOW
+
+    def advance(self):
+        """
+        Applies any pending rollback and simulates the next frame, unless a
+        side has already won.
+        """
+        if self.match_over():
+            return
+        self.simulate(self.frame)
+        self.frame += 1
+        # Forget inputs too old to ever be rolled back to
+        stale = self.frame - ROLLBACK_WINDOW - 1
+        self.used_remote.pop(stale, None)
+        if stale < self.remote_confirmed:
+            self.remote_inputs.pop(stale, None)
+        if stale <= self.remote_ack:
+            self.local_inputs.pop(stale, None)
+
+    def settle(self):
+        """
+        Rolls back and simulates forward again if a late input changed a
+        frame that was already simulated.
+
+        If the real inputs end the match sooner than the guessed ones did,
+        the session goes back to the frame in which a side won.
+        """
+        if self.rollback_frame is None:
+            return
+        start = self.rollback_frame
+        end = self.frame
+        self.rollback_frame = None
+        self.model.restore(self._snapshots[start % len(self._snapshots)])
+        self.frame = start
+        while self.frame < end and not self.model.game_over():
+            self.simulate(self.frame)
+            self.frame += 1
+        self.rollbacks += 1
+        self.resimulated_frames += self.frame - start
+
+    def simulate(self, frame):
+        """
+        Saves a snapshot and steps the model through one frame, guessing
+        the remote input if it hasn't arrived yet.
+
+        Args:
+            frame: An int representing the frame to simulate.
+        """
+        self.model.snapshot(self._snapshots[frame % len(self._snapshots)])
+        local = self.local_inputs.get(frame, 0)
+        remote = self.remote_inputs.get(frame)
+        if remote is None:
+            # Guess that the other side kept doing what it last did
+            remote = self.remote_inputs.get(self.remote_confirmed, 0)
+        self.used_remote[frame] = remote
+        player, cpu = (local, remote) if self.side == HOST else (remote, local)
+        self.model.move_objects()
+        self.model.move_player(player)
+        self.model.move_opponent(cpu)
+
+
+class NetplayProtocol(asyncio.DatagramProtocol):
+    """
+    Exchanges the match seed, inputs and pings with the other peer.
+
+    Attributes:
+        side: A string, HOST or GUEST, representing this peer's role.
+        seed: The int seed of the shared match, once known.
+        session: The RollbackSession receiving remote inputs, once started.
+        rtt: A float representing the latest round-trip time in seconds.
+        peer_done: A bool that is True once the other side has finished.
+        last_heard: A float representing the time.perf_counter value when
+            the last packet arrived.
+        peer: The (host, port) address of the other peer, once known.
+            Packets from any other address are ignored.
+    """
+
+    def __init__(self, side, seed=None):
+        """
+        Initializes the protocol.
+
+        Args:
+            side: A string, HOST or GUEST, representing this peer's role.
+            seed: The int seed of the match, required for the host.
+        """
+        self.side = side
+        self.seed = seed
+        self.session = None
+        self.rtt = None
+        self.peer_done = False
+        self.last_heard = time.perf_counter()
+        self.transport = None
+        self.peer = None
+        self.ready = asyncio.Event()
+
+    def connection_made(self, transport):
+        """
+        Stores the transport once the socket is open.
+
+        Args:
+            transport: The asyncio.DatagramTransport of the socket.
+        """
+        self.transport = transport
+
+    def send(self, data):
+        """
+        Sends a packet to the other peer, if it is known yet.
+
+        Args:
+            data: The packet as bytes.
+        """
+        if self.peer is not None:
+            self.transport.sendto(data, self.peer)
+
+    def datagram_received(self, data, addr):
+        """
+        Handles a packet from the other peer.
+
+        The host takes the first address to say hello as its peer for the
+        rest of the match.
+
+        Args:
+            data: The packet as bytes.
+            addr: The address the packet came from.
+        """
+        kind = data[:1]
+        if self.peer is None and kind == b"H" and self.side == HOST:
+            self.peer = addr
+        if addr != self.peer:
+            return
+        self.last_heard = time.perf_counter()
+        if kind == b"H" and self.side == HOST:
+            self.send(WELCOME.pack(b"W", self.seed))
+            self.ready.set()
+        elif kind == b"W" and self.side == GUEST:
+            _, self.seed = WELCOME.unpack_from(data)
+            self.ready.set()
+        elif kind == b"I" and self.session is not None:
+            _, ack, first, count = INPUTS.unpack_from(data)
+            inputs = struct.unpack_from(f"<{count}b", data, INPUTS.size)
+            self.session.acknowledge(ack)
+            for offset, speed_y in enumerate(inputs):
+                self.session.add_remote_input(first + offset, speed_y)
+        elif kind == b"P":
+            self.send(PING.pack(b"O", PING.unpack_from(data)[1]))
+        elif kind == b"O":
+            self.rtt = time.perf_counter() - PING.unpack_from(data)[1]
+        elif kind == b"D":
+            self.peer_done = True
+
+    def send_inputs(self):
+        """
+        Sends every local input the other side hasn't confirmed, along with
+        the newest frame up to which every remote input has arrived.
+        """
+        first, inputs = self.session.unacknowledged_inputs()
+        self.send(
+            INPUTS.pack(
+                b"I", self.session.remote_confirmed, first, len(inputs)
+            )
+            + struct.pack(f"<{len(inputs)}b", *inputs)
+        )
+
+
+def finished(session, frames):
+    """
+    Checks whether a session has simulated every frame of the match with
+    the real input of both sides and the other side has every local input.
+
+    Args:
+        session: The RollbackSession being played.
+        frames: An int representing the most frames the match may last.
+
+    Returns:
+        A bool that is True once nothing more needs to be exchanged.
+    """
+    end = session.frame if session.match_over() else frames
+    return (
+        session.frame >= end
+        and session.remote_confirmed >= end - 1
+        and session.remote_ack >= end - 1
+    )
+
+
+async def run_peer(
+    side,
+    local_address,
+    remote_address,
+    input_source,
+    frames,
+    screen_size,
+    input_delay=2,
+    tick_rate=60,
+    seed=None,
+    on_tick=None,
+    handshake_timeout=HANDSHAKE_TIMEOUT,
+):
+    """
+    Plays one side of a netplay match until a side wins or a number of
+    frames have been played.
+
+    Args:
+        side: A string, HOST or GUEST, representing this peer's role.
+        local_address: A (host, port) tuple to listen on.
+        remote_address: A (host, port) tuple of the host, for the guest.
+            The host learns the guest's address from its first packet.
+        input_source: A callable taking the RollbackSession and returning
+            the local speed_y for the current frame.
+        frames: An int representing the most frames to play.
+        screen_size: A (width, height) tuple of the game screen.
+        input_delay: An int representing how many frames local input is
+            delayed by.
+        tick_rate: A number representing the frames simulated per second.
+        seed: An optional int seed for the match, chosen by the host.
+        on_tick: An optional callable taking the RollbackSession, called
+            after every frame, for example to draw the game.
+        handshake_timeout: A float representing the seconds to wait for
+            the other peer to join.
+
+    Returns:
+        A dict with the final Model, the frames played, the rollback and
+        resimulated frame counts, and the last round-trip time in ms.
+
+    Raises:
+        ConnectionError: If the other peer doesn't join within
+            handshake_timeout seconds, or nothing arrives from it for
+            PEER_TIMEOUT seconds before the match is complete.
+    """
+    loop = asyncio.get_running_loop()
+    protocol = NetplayProtocol(side, seed)
+    if side == HOST and protocol.seed is None:
+        protocol.seed = Model(*screen_size).seed
+    transport, _ = await loop.create_datagram_endpoint(
+        lambda: protocol, local_addr=local_address
+    )
+    try:
+        deadline = loop.time() + handshake_timeout
+        if side == GUEST:
+            # Replies come from the host's numeric address, not its name
+            addresses = await loop.getaddrinfo(
+                *remote_address, family=socket.AF_INET, type=socket.SOCK_DGRAM
+            )
+            protocol.peer = addresses[0][4]
+        while not protocol.ready.is_set():
+            if loop.time() >= deadline:
+                raise ConnectionError(
+                    f"the other peer didn't join within {handshake_timeout}s"
+                )
+            if side == GUEST:
+                protocol.send(HELLO.pack(b"H"))
+            try:
+                await asyncio.wait_for(
+                    protocol.ready.wait(),
+                    min(HELLO_INTERVAL, deadline - loop.time()),
+                )
+            except asyncio.TimeoutError:
+                pass
+
+        session = RollbackSession(
+            Model(*screen_size, protocol.seed), side, input_delay
+        )
+        protocol.session = session
+        tick = 1 / tick_rate
+        next_tick = loop.time()
+        ticks = 0
+        while not (finished(session, frames) and protocol.peer_done):
+            if (
+                session.frame < frames
+                and not session.match_over()
+                and session.can_advance()
+            ):
+                session.add_local_input(input_source(session))
+                session.advance()
+                if on_tick is not None:
+                    on_tick(session)
+            protocol.send_inputs()
+            if finished(session, frames):
+                protocol.send(b"D")
+            if ticks % PING_INTERVAL == 0:
+                protocol.send(PING.pack(b"P", time.perf_counter()))
+            if time.perf_counter() - protocol.last_heard > PEER_TIMEOUT:
+                if not finished(session, frames):
+                    raise ConnectionError("lost contact with the other peer")
+                # The other side may have left before our goodbye arrived
+                break
+            ticks += 1
+            next_tick += tick
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+        session.settle()
+        # Repeat the goodbye in case the last one was lost
+        protocol.send(b"D")
+    finally:
+        transport.close()
+
+    return {
+        "model": session.model,
+        "frames": session.frame,
+        "rollbacks": session.rollbacks,
+        "resimulated_frames": session.resimulated_frames,
+        "rtt_ms": None if protocol.rtt is None else protocol.rtt * 1000,
+    }
@@ -0,0 +1,117 @@
+# pong_pixels.py
+"""
+Module for rendering matches off screen into arrays of pixels, for agents
+that learn from what is on the screen.
+
+This module defines the PixelRenderer class, which draws each match with a
+View on an off-screen surface and copies the frame, optionally downscaled
+and in grayscale, into one NumPy array of frames that is allocated once
+and reused. Pixels are read through pygame.surfarray views of the surface,
+so the only copy made is the one into the frames array.
+
+"""
+import numpy as np
+import pygame
+from pong_view import View
+
+# Weights of red, green and blue in a gray level, out of 256
+GRAY_WEIGHTS = (77, 150, 29)
+
+
+class PixelRenderer:
+    """
+    Renders many matches into one preallocated array of frames.
+
+    Attributes:
+        surface: The off-screen pygame.Surface the matches are drawn on.
+        view: The View object drawing on surface without presenting.
+        scale: An int representing how many times smaller than the screen
+            each frame is.
+        grayscale: A bool representing whether frames hold gray levels
+            instead of red, green and blue values.
+        frames: A uint8 NumPy array of shape (count, height, width), or
+            (count, height, width, 3) in color, that render writes into.
+    """
+
+    def __init__(
+        self, screen_width, screen_height, count=1, scale=1, grayscale=True
+    ):
+        """
+        Initializes the renderer and allocates its frames.
+
+        Args:
+            screen_width: An int representing the width of the game screen.
+            screen_height: An int representing the height of the game screen.
+            count: An int representing the most matches rendered at once.
+            scale: An int representing how many times smaller than the
+                screen each frame is.
+            grayscale: A bool that, when True, stores gray levels instead of
+                red, green and blue values.
+        """
+        self.surface = pygame.Surface((screen_width, screen_height))
+        self.view = View(self.surface, present=False)
+        self.scale = scale
+        self.grayscale = grayscale
+        size = (screen_width // scale, screen_height // scale)
+        self._small = pygame.Surface(size) if scale > 1 else None
+        shape = (count, size[1], size[0])
+        if not grayscale:
+            shape += (3,)
+        self.frames = np.zeros(shape, dtype=np.uint8)
+        # Scratch space for the weighted sums, laid out like surfarray views
+        self._total = np.zeros(size, dtype=np.uint16)
+        self._term = np.zeros(size, dtype=np.uint16)
+
+    def render(self, models, positions=None):
+        """
+        Renders each match into its slot of the frames array.
+
+        Args:
+            models: A sequence of at most count Model objects.
+            positions: An optional sequence of dicts, one per model, of
+                positions to draw the ball and rackets at, as View.render
+                takes.
+
+        Returns:
+            The frames array.
+        """
+        for index, model in enumerate(models):
+            self.view.render(
+                model, None if positions is None else positions[index]
+            )
+            self.capture(index)
+        return self.frames
+
+    def capture(self, index):
+        """
+        Copies what is on the surface into one slot of the frames array.
+
+        Args:
+            index: An int representing the slot to copy into.
+        """
+        source = self.surface
+        if self._small is not None:
+            pygame.transform.scale(
+                self.surface, self._small.get_size(), self._small
+            )
+            source = self._small
+        # surfarray views are indexed (x, y), so write through a transposed
+        # view of the (y, x) frame
+        frame = self.frames[index].swapaxes(0, 1)
+        if not self.grayscale:
+            rgb = pygame.surfarray.pixels3d(source)
+            np.copyto(frame, rgb)
+            del rgb
+            return
+        channels = (
+            pygame.surfarray.pixels_red(source),
+            pygame.surfarray.pixels_green(source),
+            pygame.surfarray.pixels_blue(source),
+        )
+        self._total.fill(0)
+        for channel, weight in zip(channels, GRAY_WEIGHTS):
+            np.multiply(channel, weight, out=self._term, dtype=np.uint16)
+            np.add(self._total, self._term, out=self._total)
+        np.right_shift(self._total, 8, out=frame, casting="unsafe")
+        # Release the locks the views hold on the surface
+        del channels
@@ -0,0 +1,445 @@
+# pong_policies.py
+"""
+Module for the policies that can move a racket in place of a person.
+
+A policy looks at a Model and decides how far to move one of its rackets
+this step. Calling a policy times its decision against a per-tick budget
+and counts the decisions that go over, so a heavier policy can be checked
+for whether it fits in a frame before it is shipped.
+
+This module defines the Policy base class, the TrackingPolicy,
+PredictingPolicy, LookupPolicy, LinearPolicy and StillPolicy classes, and a
+registry that makes policies by name, for Model's cpu_policy, the
+tournament runner and the command line.
+
+"""
+import abc
+import json
+import math
+import time
+from pong_model import predict_crossing
+
+# Default time a policy may take to decide, in seconds. A frame at 60 Hz
+# lasts about 16.7 ms and the physics and drawing need most of it.
+POLICY_BUDGET = 0.001
+
+# Fastest a racket moves per step, the same as the keyboard
+RACKET_SPEED = 6
+
+
+class Policy(abc.ABC):
+    """
+    Decides how a racket moves, timing every decision against a budget.
+
+    Subclasses must implement decide. Calling the policy runs decide and records
+    how long it took.
+
+    Attributes:
+        budget: A float representing the seconds a decision may take.
+        decisions: An int counting the decisions made.
+        total_time: A float representing the seconds spent deciding.
+        worst_time: A float representing the longest decision in seconds.
+        overruns: An int counting the decisions that took over budget.
+    """
+
+    def __init__(self, budget=POLICY_BUDGET):
+        """
+        Initializes the policy with no decisions recorded.
+
+        Args:
+            budget: A float representing the seconds a decision may take.
+        """
+        self.budget = budget
+        self.decisions = 0
+        self.total_time = 0.0
+        self.worst_time = 0.0
+        self.overruns = 0
+
+    def __call__(self, model, side):
+        """
+        Makes a timed decision.
+
+        Args:
+            model: The Model object being played.
+            side: A string, "player" or "cpu", naming the racket to move.
+
+        Returns:
+            A number representing the amount by which to move the racket.
+        """
+        start = time.perf_counter()
+        speed_y = self.decide(model, side)
+        elapsed = time.perf_counter() - start
+        self.decisions += 1
+        self.total_time += elapsed
+        self.worst_time = max(self.worst_time, elapsed)
+        if elapsed > self.budget:
+            self.overruns += 1
+        return speed_y
+
+    @abc.abstractmethod
+    def decide(self, model, side):
+        """
+        Decides how far to move a racket this step.
+
+        Args:
+            model: The Model object being played.
+            side: A string, "player" or "cpu", naming the racket to move.
+
+        Returns:
+            A number representing the amount by which to move the racket.
+        """
+
+    def stats(self):
+        """
+        Summarizes the time spent deciding.
+
+        Returns:
+            A dict with the decisions made, the mean and worst decision in
+            ms, the budget in ms and the number of overruns.
+        """
+        mean = self.total_time / self.decisions if self.decisions else 0.0
+        return {
+            "decisions": self.decisions,
+            "mean_ms": mean * 1000,
+            "worst_ms": self.worst_time * 1000,
+            "budget_ms": self.budget * 1000,
+            "overruns": self.overruns,
+        }
+
+
+def chase(racket, target_y, speed):
+    """
+    Picks a movement that brings a racket's center toward a height.
+
+    Args:
+        racket: The Racket object to move.
+        target_y: A number representing the height to move toward.
+        speed: A number representing how far the racket moves per step.
+
+    Returns:
+        A number representing the amount by which to move the racket.
+    """
+    if target_y < racket.rect.centery:
+        return -speed
+    if target_y > racket.rect.centery:
+        return speed
+    return 0
+
+
+class StillPolicy(Policy):
+    """
+    Never moves the racket.
+    """
+
+    def decide(self, model, side):
+        """
+        Decides not to move.
+
+        Args:
+            model: The Model object being played.
+            side: A string, "player" or "cpu", naming the racket to move.
+
+        Returns:
+            The int 0.
+        """
+        return 0
+
+
+class TrackingPolicy(Policy):
+    """
+    Follows the ball's center at a fixed speed, like Model.move_cpu and
+    TrackingController.
+
+    Attributes:
+        speed: A number representing how far the racket moves per step.
+    """
+
+    def __init__(self, speed=RACKET_SPEED, budget=POLICY_BUDGET):
+        """
+        Initializes the policy with the given speed.
+
+        Args:
+            speed: A number representing how far the racket moves per step.
+            budget: A float representing the seconds a decision may take.
+        """
+        super().__init__(budget)
+        self.speed = speed
+
+    def decide(self, model, side):
+        """
+        Moves toward the ball's center.
+
+        Args:
+            model: The Model object being played.
+            side: A string, "player" or "cpu", naming the racket to move.
+
+        Returns:
+            A number representing the amount by which to move the racket.
+        """
+        return chase(getattr(model, side), model.ball.rect.centery, self.speed)
+
+
+class PredictingPolicy(Policy):
+    """
+    Moves to where the ball will reach the racket, and back to the middle
+    while the ball moves away.
+
+    Attributes:
+        speed: A number representing how far the racket moves per step.
+        deadband: A number representing how close to its target the racket
+            stops, so it doesn't jitter.
+    """
+
+    def __init__(self, speed=RACKET_SPEED, deadband=3, budget=POLICY_BUDGET):
+        """
+        Initializes the policy with the given speed.
+
+        Args:
+            speed: A number representing how far the racket moves per step.
+            deadband: A number representing how close to its target the
+                racket stops.
+            budget: A float representing the seconds a decision may take.
+        """
+        super().__init__(budget)
+        self.speed = speed
+        self.deadband = deadband
+
+    def decide(self, model, side):
+        """
+        Moves toward the predicted crossing of the racket's face.
+
+        Args:
+            model: The Model object being played.
+            side: A string, "player" or "cpu", naming the racket to move.
+
+        Returns:
+            A number representing the amount by which to move the racket.
+        """
+        racket = getattr(model, side)
+        ball = model.ball
+        if side == "player":
+            face = racket.rect.left - ball.rect.width
+        else:
+            face = racket.rect.right
+        crossing = predict_crossing(ball, face)
+        if crossing is None:
+            target_y = model.screen_height / 2
+        else:
+            target_y = crossing[1] + ball.rect.height / 2
+        if abs(target_y - racket.rect.centery) <= self.deadband:
+            return 0
+        return chase(racket, target_y, self.speed)
+
+
+class LookupPolicy(Policy):
+    """
+    Looks its movement up in a table keyed by whether the ball is coming
+    toward the racket and how far the ball's center is above or below the
+    racket's, in buckets.
+
+    Attributes:
+        table: A dict mapping (toward, bucket) tuples to movements. Missing
+            keys mean no movement.
+        bucket_size: An int representing the height of a bucket in pixels.
+        buckets: An int representing the furthest bucket either side of
+            the racket; anything further is put in the last one.
+    """
+
+    def __init__(
+        self, table=None, bucket_size=10, buckets=10, budget=POLICY_BUDGET
+    ):
+        """
+        Initializes the policy with a table, or a default one that chases
+        the ball at full speed when it approaches and at half speed when it
+        moves away.
+
+        Args:
+            table: An optional dict mapping (toward, bucket) to movements.
+            bucket_size: An int representing the height of a bucket.
+            buckets: An int representing the furthest bucket either side.
+            budget: A float representing the seconds a decision may take.
+        """
+        super().__init__(budget)
+        self.bucket_size = bucket_size
+        self.buckets = buckets
+        if table is None:
+            table = {}
+            for bucket in range(-buckets, buckets + 1):
+                direction = (bucket > 0) - (bucket < 0)
+                table[(True, bucket)] = direction * RACKET_SPEED
+                table[(False, bucket)] = direction * RACKET_SPEED / 2
+        self.table = table
+
+    def decide(self, model, side):
+        """
+        Looks up the movement for the current state.
+
+        Args:
+            model: The Model object being played.
+            side: A string, "player" or "cpu", naming the racket to move.
+
+        Returns:
+            A number representing the amount by which to move the racket.
+        """
+        racket = getattr(model, side)
+        toward = (model.ball.speed_x > 0) == (side == "player")
+        offset = model.ball.rect.centery - racket.rect.centery
+        bucket = int(offset / self.bucket_size)
+        bucket = max(-self.buckets, min(bucket, self.buckets))
+        return self.table.get((toward, bucket), 0)
+
+
+class LinearPolicy(Policy):
+    """
+    Moves by a learned linear function of the game state, squashed into
+    the racket's speed range.
+
+    The features are the ball's height above or below the racket and its
+    horizontal distance from it, both as fractions of the screen, and the
+    ball's speed in pixels per step.
+
+    Attributes:
+        weights: A list of four floats, one per feature.
+        bias: A float added before squashing.
+    """
+
+    def __init__(
+        self, weights=(20.0, 0.0, 0.0, 0.5), bias=0.0, budget=POLICY_BUDGET
+    ):
+        """
+        Initializes the policy with the given weights.
+
+        Args:
+            weights: A sequence of four floats weighting the vertical
+                offset, horizontal distance, horizontal speed and vertical
+                speed of the ball.
+            bias: A float added before squashing.
+            budget: A float representing the seconds a decision may take.
+        """
+        super().__init__(budget)
+        self.weights = list(weights)
+        self.bias = bias
+
+    @classmethod
+    def load(cls, path, budget=POLICY_BUDGET):
+        """
+        Makes a policy from weights saved as JSON, with "weights" and
+        "bias" keys.
+
+        Args:
+            path: A string representing the file to read.
+            budget: A float representing the seconds a decision may take.
+
+        Returns:
+            A new LinearPolicy.
+        """
+        with open(path, encoding="utf-8") as weights_file:
+            saved = json.load(weights_file)
+        return cls(saved["weights"], saved.get("bias", 0.0), budget)
+
+    def decide(self, model, side):
+        """
+        Evaluates the linear function for the current state.
+
+        Args:
+            model: The Model object being played.
+            side: A string, "player" or "cpu", naming the racket to move.
+
+        Returns:
+            A float representing the amount by which to move the racket.
+        """
+        racket = getattr(model, side)
+        ball = model.ball
+        features = (
+            (ball.rect.centery - racket.rect.centery) / model.screen_height,
+            abs(ball.rect.centerx - racket.rect.centerx) / model.screen_width,
+            ball.speed_x,
+            ball.speed_y,
+        )
+        total = self.bias + sum(
+            weight * feature
+            for weight, feature in zip(self.weights, features)
+        )
+        return RACKET_SPEED * math.tanh(total)
+
+
+POLICIES = {}
+
+
+def register(name):
+    """
+    Makes a decorator that adds a policy factory to the registry.
+
+    Args:
+        name: A string representing the name to register the factory as.
+
+    Returns:
+        A decorator that registers the function and returns it unchanged.
+    """
+
+    def decorator(factory):
+        POLICIES[name] = factory
+        return factory
+
+    return decorator
+
+
+@register("still")
+def make_still(budget=POLICY_BUDGET):
+    """Makes a policy that never moves."""
+    return StillPolicy(budget)
+
+
+@register("cpu")
+def make_cpu(budget=POLICY_BUDGET):
+    """
+    Makes a policy that follows the ball at Model.move_cpu's speed.
+
+    It moves the racket the same way as move_cpu except at the walls: the
+    built-in rule lets the CPU's racket leave the screen, while a racket
+    moved by a policy is kept within the screen bounds.
+    """
+    return TrackingPolicy(5.5, budget)
+
+
+@register("track")
+def make_track(budget=POLICY_BUDGET):
+    """Makes a policy that follows the ball at the keyboard speed."""
+    return TrackingPolicy(RACKET_SPEED, budget)
+
+
+@register("predict")
+def make_predict(budget=POLICY_BUDGET):
+    """Makes a policy that moves to where the ball will arrive."""
+    return PredictingPolicy(budget=budget)
+
+
+@register("lookup")
+def make_lookup(budget=POLICY_BUDGET):
+    """Makes a policy that looks its movement up in the default table."""
+    return LookupPolicy(budget=budget)
+
+
+@register("linear")
+def make_linear(budget=POLICY_BUDGET):
+    """Makes a learned linear policy with the default weights."""
+    return LinearPolicy(budget=budget)
+
+
+def make_policy(name, budget=POLICY_BUDGET):
+    """
+    Makes a registered policy by name.
+
+    Args:
+        name: A string naming a registered policy.
+        budget: A float representing the seconds a decision may take.
+
+    Returns:
+        A new Policy object.
+
+    Raises:
+        ValueError: If no policy is registered under name.
+    """
+    if name not in POLICIES:
+        raise ValueError(f"unknown policy {name!r}")
+    return POLICIES[name](budget)
@@ -0,0 +1,158 @@
+# pong_profiling.py
+"""
+Module for profiling the running game without restarting it.
+
+This module defines the Profiler class, which starts cProfile and
+tracemalloc together and, when stopped, saves what they captured: the
+profile as a timestamped .prof file that pstats and snakeviz can open, and
+a text report of the lines that had allocated the most memory, and that
+allocated the most during the capture.
+
+The game toggles the profiler with PROFILE_KEY, and starts it straight away
+if the PROFILE_ENV environment variable is set, to the directory the
+captures are saved in.
+
+"""
+import cProfile
+import os
+import time
+import tracemalloc
+import pygame
+
+# Key that starts and stops a capture while playing
+PROFILE_KEY = pygame.K_F9
+
+# Environment variable naming the directory to save captures in. When it is
+# set, the game starts capturing as soon as it starts.
+PROFILE_ENV = "PONG_PROFILE"
+
+# Number of lines listed in each part of the allocation report
+TOP_ALLOCATIONS = 25
+
+# Frames of the call stack tracemalloc keeps for each allocation
+TRACE_FRAMES = 1
+
+
+class Profiler:
+    """
+    Captures a CPU profile and memory allocations between start and stop.
+
+    Attributes:
+        directory: A string representing the directory captures are saved
+            in.
+        top: An int representing the number of lines listed in each part of
+            the allocation report.
+        active: A bool representing whether a capture is running.
+        captures: A list of (profile path, report path) tuples, one per
+            finished capture.
+    """
+
+    def __init__(self, directory=".", top=TOP_ALLOCATIONS):
+        """
+        Initializes a profiler that isn't capturing.
+
+        Args:
+            directory: A string representing the directory to save captures
+                in.
+            top: An int representing the number of lines listed in each part
+                of the allocation report.
+        """
+        self.directory = directory
+        self.top = top
+        self.active = False
+        self.captures = []
+        self._profile = None
+        self._start_snapshot = None
+        self._started_tracing = False
+
+    def start(self):
+        """
+        Starts a capture, unless one is already running.
+        """
+        if self.active:
+            return
+        # Leave tracing on afterwards if something else had started it
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start(TRACE_FRAMES)
+        self._start_snapshot = tracemalloc.take_snapshot()
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+        self.active = True
+
+    def stop(self):
+        """
+        Stops the running capture and saves it.
+
+        Returns:
+            A tuple of the paths of the saved .prof file and allocation
+            report, or None if no capture was running.
+        """
+        if not self.active:
+            return None
+        self._profile.disable()
+        snapshot = tracemalloc.take_snapshot()
+        if self._started_tracing:
+            tracemalloc.stop()
+
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        name = f"pong-{stamp}-{len(self.captures) + 1}"
+        profile_path = os.path.join(self.directory, f"{name}.prof")
+        report_path = os.path.join(self.directory, f"{name}-alloc.txt")
+        self._profile.dump_stats(profile_path)
+        with open(report_path, "w", encoding="utf-8") as report_file:
+            report_file.write(
+                allocation_report(snapshot, self._start_snapshot, self.top)
+            )
+        self._profile = None
+        self._start_snapshot = None
+        self.active = False
+        self.captures.append((profile_path, report_path))
+        return profile_path, report_path
+
+    def toggle(self):
+        """
+        Starts a capture if none is running, otherwise stops and saves it.
+
+        Returns:
+            The tuple returned by stop if a capture was saved, otherwise
+            None.
+        """
+        if self.active:
+            return self.stop()
+        self.start()
+        return None
+
+
+def allocation_report(snapshot, start_snapshot, top=TOP_ALLOCATIONS):
+    """
+    Describes where memory was allocated.
+
+    Allocations made by tracemalloc itself are left out.
+
+    Args:
+        snapshot: The tracemalloc.Snapshot taken at the end of a capture.
+        start_snapshot: The tracemalloc.Snapshot taken at its start.
+        top: An int representing the number of lines listed in each part.
+
+    Returns:
+        A string listing the lines holding the most memory at the end of
+        the capture, then the lines whose memory grew the most during it.
+    """
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    snapshot = snapshot.filter_traces(ignore)
+    start_snapshot = start_snapshot.filter_traces(ignore)
+    lines = [f"Top {top} lines by memory held at the end of the capture"]
+    for stat in snapshot.statistics("lineno")[:top]:
+        lines.append(
+            f"{stat.size / 1024:10.1f} KiB {stat.count:8} blocks  "
+            f"{stat.traceback[0]}"
+        )
+    lines += ["", f"Top {top} lines by memory allocated during the capture"]
+    for stat in snapshot.compare_to(start_snapshot, "lineno")[:top]:
+        lines.append(
+            f"{stat.size_diff / 1024:+10.1f} KiB"
+            f" {stat.count_diff:+8} blocks  {stat.traceback[0]}"
+        )
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,205 @@
+# pong_replay.py
+"""
+Module for recording matches and playing them back.
+
+A match is fully determined by the seed of its Model and by the racket
+movement Controller.handle_events returns on each physics step, so a replay
+stores only those. This module defines the Recorder class, which collects
+the inputs and packs them into a compact binary format, and the load and
+play functions, which read a replay back and rebuild the match from it.
+
+The format is a fixed header followed by the inputs as runs. Each run is
+the change from the previous input, zigzag-encoded so small negative
+changes stay small, followed by how many steps it lasted, both written as
+variable-length integers. A player holding a key for a second takes two
+bytes instead of sixty.
+
+"""
+import struct
+from pong_model import Model
+
+MAGIC = b"TPRP"
+# Version 2 replays are of matches played with float positions, and
+# version 3 ones with the ball's vertical speed-up
+VERSION = 3
+# Magic, version, seed, screen width, screen height and number of steps
+HEADER = struct.Struct("<4sBQHHI")
+
+
+def write_varint(buffer, value):
+    """
+    Appends a non-negative int to a buffer, seven bits per byte.
+
+    Args:
+        buffer: A bytearray to append to.
+        value: A non-negative int to write.
+    """
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def read_varint(data, offset):
+    """
+    Reads a non-negative int written by write_varint.
+
+    Args:
+        data: The bytes to read from.
+        offset: An int representing where the value starts.
+
+    Returns:
+        A tuple of the value and the offset just past it.
+    """
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+class Recorder:
+    """
+    Records the input of every physics step of a match.
+
+    Attributes:
+        seed: The int that seeded the recorded Model.
+        screen_width: An int representing the width of the game screen.
+        screen_height: An int representing the height of the game screen.
+        steps: An int counting the steps recorded.
+    """
+
+    def __init__(self, model):
+        """
+        Initializes a recorder for a freshly created model.
+
+        Args:
+            model: The Model object being recorded, before its first step.
+        """
+        self.seed = model.seed
+        self.screen_width = model.screen_width
+        self.screen_height = model.screen_height
+        self.steps = 0
+        self._runs = []
+        self._value = None
+        self._count = 0
+
+    def record(self, speed_y):
+        """
+        Records the input used for one physics step.
+
+        Args:
+            speed_y: An int representing the amount the player's racket was
+                moved vertically on this step.
+        """
+        self.steps += 1
+        if speed_y == self._value:
+            self._count += 1
+            return
+        if self._count:
+            self._runs.append((self._value, self._count))
+        self._value = speed_y
+        self._count = 1
+
+    def to_bytes(self):
+        """
+        Packs the recording into the binary replay format.
+
+        Returns:
+            The replay as bytes.
+        """
+        runs = list(self._runs)
+        if self._count:
+            runs.append((self._value, self._count))
+        buffer = bytearray(
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                self.seed,
+                self.screen_width,
+                self.screen_height,
+                self.steps,
+            )
+        )
+        previous = 0
+        for value, count in runs:
+            delta = value - previous
+            write_varint(buffer, delta * 2 if delta >= 0 else -delta * 2 - 1)
+            write_varint(buffer, count)
+            previous = value
+        return bytes(buffer)
+
+    def save(self, path):
+        """
+        Writes the recording to a file.
+
+        Args:
+            path: A string representing the file to write.
+        """
+        with open(path, "wb") as replay_file:
+            replay_file.write(self.to_bytes())
+
+
+def load(data):
+    """
+    Unpacks a replay.
+
+    Args:
+        data: The replay as bytes.
+
+    Returns:
+        A tuple (seed, screen_width, screen_height, inputs) where inputs is
+        a list of the speed_y of every step.
+
+    Raises:
+        ValueError: If data is not a replay this version can read.
+    """
+    if len(data) < HEADER.size:
+        raise ValueError("replay is too short")
+    magic, version, seed, width, height, steps = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a Tennis Pong replay")
+    inputs = []
+    offset = HEADER.size
+    value = 0
+    while offset < len(data):
+        try:
+            zigzag, offset = read_varint(data, offset)
+            count, offset = read_varint(data, offset)
+        except IndexError as error:
+            raise ValueError("replay is truncated") from error
+        value += zigzag // 2 if zigzag % 2 == 0 else -(zigzag + 1) // 2
+        inputs.extend([value] * count)
+    if len(inputs) != steps:
+        raise ValueError("replay is truncated")
+    return seed, width, height, inputs
+
+
+def play(data):
+    """
+    Rebuilds a recorded match by stepping a new Model through every
+    recorded input as fast as possible.
+
+    When a match ends and more steps follow, the scores are reset, just as
+    clicking "Play Again" does.
+
+    Args:
+        data: The replay as bytes.
+
+    Returns:
+        The Model object in its state after the last recorded step.
+    """
+    seed, width, height, inputs = load(data)
+    model = Model(width, height, seed)
+    for speed_y in inputs:
+        if model.game_over():
+            model.cpu_score = 0
+            model.player_score = 0
+        model.move_objects()
+        model.move_player(speed_y)
+        model.move_cpu()
+    return model
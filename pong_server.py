@@ -0,0 +1,494 @@
+# pong_server.py
+"""
+Module for hosting many Tennis Pong matches in a single process.
+
+Each match is a Model with no display attached. One asyncio scheduler keeps
+every match on its own fixed tick rate, so hundreds of matches share one
+event loop instead of needing a process and a window each. Clients connect
+over TCP, join a match, send racket inputs and receive the state after
+every tick.
+
+The protocol is line based. A client sends "JOIN new" or "JOIN <id>" and is
+answered with "JOINED <id> <side>", where the first client of a match plays
+the right racket ("player") and the second the left one ("cpu"). Until a
+second client joins, the left racket follows the ball like Model.move_cpu.
+The client then sends "INPUT <speed_y>" whenever its input changes and
+receives "STATE <frame> <ball x> <ball y> <player x> <player y> <cpu x>
+<cpu y> <cpu score> <player score>" every tick, and "OVER <cpu score>
+<player score>" once the match is won.
+
+Run `python pong_server.py` to serve matches, or `python pong_server.py
+--capacity` to measure how many matches one core can keep at 60 Hz.
+
+"""
+import argparse
+import asyncio
+import heapq
+import time
+from pong_model import Model
+from pong_policies import TrackingPolicy
+
+SCREEN_WIDTH = 1200
+SCREEN_HEIGHT = 675
+TICK_RATE = 60
+PORT = 50_008
+
+# Fastest a client may move its racket per tick, the same as the keyboard
+MAX_INPUT = 6
+
+# Furthest a match may fall behind before it skips ticks instead of
+# catching up, like MAX_FRAME_TIME in main.py
+MAX_LATENESS = 0.25
+
+# Unsent bytes a client may fall behind by before it stops being sent
+# states, so one slow client can't fill the server's memory
+MAX_CLIENT_BACKLOG = 64 * 1024
+
+
+class TickStats:
+    """
+    Tracks how much of its tick budget a match uses.
+
+    Attributes:
+        budget: A float representing the seconds between ticks.
+        ticks: An int counting the ticks run.
+        busy: A float representing the total seconds spent ticking.
+        worst: A float representing the longest tick in seconds.
+        overruns: An int counting ticks that ran a whole tick period late.
+        skipped: An int counting ticks dropped after falling too far behind.
+    """
+
+    def __init__(self, budget):
+        """
+        Initializes empty statistics.
+
+        Args:
+            budget: A float representing the seconds between ticks.
+        """
+        self.budget = budget
+        self.ticks = 0
+        self.busy = 0.0
+        self.worst = 0.0
+        self.overruns = 0
+        self.skipped = 0
+
+    def record(self, duration, lateness):
+        """
+        Records one tick.
+
+        Args:
+            duration: A float representing how long the tick took.
+            lateness: A float representing how long after its deadline the
+                tick started.
+        """
+        self.ticks += 1
+        self.busy += duration
+        self.worst = max(self.worst, duration)
+        if lateness > self.budget:
+            self.overruns += 1
+
+    def add(self, other):
+        """
+        Adds another match's statistics to these.
+
+        Args:
+            other: The TickStats object to add.
+        """
+        self.ticks += other.ticks
+        self.busy += other.busy
+        self.worst = max(self.worst, other.worst)
+        self.overruns += other.overruns
+        self.skipped += other.skipped
+
+
+class Match:
+    """
+    Represents one match hosted by the server.
+
+    Attributes:
+        match_id: An int identifying the match.
+        model: The Model object being played.
+        period: A float representing the seconds between ticks.
+        frame: An int counting the ticks run.
+        inputs: A dict mapping "player" and "cpu" to the latest speed_y
+            sent for that racket.
+        clients: A dict mapping a side to the asyncio.StreamWriter of the
+            client playing it.
+        stats: The TickStats of the match.
+        deadline: A float representing the event loop time the next tick
+            is due.
+        finished: A bool that is True once the match has been won.
+    """
+
+    def __init__(self, match_id, model, tick_rate):
+        """
+        Initializes a match that hasn't started ticking.
+
+        Args:
+            match_id: An int identifying the match.
+            model: The Model object to play.
+            tick_rate: A number representing the ticks per second.
+        """
+        self.match_id = match_id
+        self.model = model
+        self.period = 1 / tick_rate
+        self.frame = 0
+        self.inputs = {"player": 0, "cpu": 0}
+        self.clients = {}
+        self.stats = TickStats(self.period)
+        self.deadline = 0.0
+        self.finished = False
+
+    def open_side(self):
+        """
+        Finds the side the next client to join would play.
+
+        Returns:
+            A string, "player" or "cpu", or None if the match is full.
+        """
+        for side in ("player", "cpu"):
+            if side not in self.clients:
+                return side
+        return None
+
+    def tick(self):
+        """
+        Advances the match by one frame with the latest inputs.
+        """
+        self.model.move_objects()
+        self.model.move_player(self.inputs["player"])
+        if "cpu" in self.clients:
+            self.model.move_opponent(self.inputs["cpu"])
+        else:
+            self.model.move_cpu()
+        self.frame += 1
+
+    def state_line(self):
+        """
+        Encodes the current state for the clients, with positions rounded
+        to whole pixels.
+
+        Returns:
+            The STATE line as bytes.
+        """
+        model = self.model
+        ball = model.ball.rect
+        player = model.player.rect
+        cpu = model.cpu.rect
+        return (
+            f"STATE {self.frame} {round(ball.x)} {round(ball.y)}"
+            f" {round(player.x)} {round(player.y)}"
+            f" {round(cpu.x)} {round(cpu.y)}"
+            f" {model.cpu_score} {model.player_score}\n"
+        ).encode()
+
+    def broadcast(self, line):
+        """
+        Sends a line to every client that is keeping up.
+
+        Args:
+            line: The bytes to send.
+        """
+        for writer in self.clients.values():
+            if writer.transport.get_write_buffer_size() < MAX_CLIENT_BACKLOG:
+                writer.write(line)
+
+
+class GameServer:
+    """
+    Hosts many matches and ticks each at its own rate from one scheduler.
+
+    Attributes:
+        screen_width: An int representing the width of the game screen.
+        screen_height: An int representing the height of the game screen.
+        tick_rate: A number representing the default ticks per second.
+        matches: A dict mapping match ids to Match objects.
+        finished: An int counting the matches finished and removed.
+        finished_stats: A TickStats object totalling the statistics of the
+            finished matches, so the report still covers them.
+        started: A float representing the time.perf_counter value when the
+            scheduler started.
+    """
+
+    def __init__(
+        self,
+        screen_width=SCREEN_WIDTH,
+        screen_height=SCREEN_HEIGHT,
+        tick_rate=TICK_RATE,
+    ):
+        """
+        Initializes a server with no matches.
+
+        Args:
+            screen_width: An int representing the width of the game screen.
+            screen_height: An int representing the height of the game screen.
+            tick_rate: A number representing the default ticks per second.
+        """
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.tick_rate = tick_rate
+        self.matches = {}
+        self.finished = 0
+        self.finished_stats = TickStats(1 / tick_rate)
+        self.started = None
+        self._next_id = 1
+        self._schedule = []
+
+    def create_match(self, seed=None, tick_rate=None):
+        """
+        Adds a new match, due to tick straight away.
+
+        Args:
+            seed: An optional seed for the match's Model.
+            tick_rate: An optional number of ticks per second, defaulting
+                to the server's tick rate.
+
+        Returns:
+            The new Match object.
+        """
+        match = Match(
+            self._next_id,
+            Model(self.screen_width, self.screen_height, seed),
+            tick_rate or self.tick_rate,
+        )
+        self._next_id += 1
+        self.matches[match.match_id] = match
+        try:
+            match.deadline = asyncio.get_running_loop().time()
+        except RuntimeError:
+            match.deadline = 0.0
+        heapq.heappush(self._schedule, (match.deadline, match.match_id))
+        return match
+
+    def tick_match(self, match, lateness=0.0):
+        """
+        Ticks a match, sends its state and records the time it took.
+
+        Args:
+            match: The Match object to tick.
+            lateness: A float representing how long after its deadline the
+                tick started.
+        """
+        start = time.perf_counter()
+        match.tick()
+        if match.model.game_over():
+            match.finished = True
+            match.broadcast(
+                f"OVER {match.model.cpu_score}"
+                f" {match.model.player_score}\n".encode()
+            )
+        else:
+            match.broadcast(match.state_line())
+        match.stats.record(time.perf_counter() - start, lateness)
+
+    async def run(self):
+        """
+        Ticks every match when it is due until cancelled.
+
+        Matches that fall behind catch up by ticking back to back, unless
+        they are more than MAX_LATENESS behind, in which case the missed
+        ticks are skipped.
+        """
+        loop = asyncio.get_running_loop()
+        self.started = time.perf_counter()
+        while True:
+            now = loop.time()
+            while self._schedule and self._schedule[0][0] <= now:
+                deadline, match_id = heapq.heappop(self._schedule)
+                match = self.matches.get(match_id)
+                if match is None:
+                    continue
+                self.tick_match(match, now - deadline)
+                if match.finished:
+                    del self.matches[match_id]
+                    self.finished += 1
+                    self.finished_stats.add(match.stats)
+                    for writer in match.clients.values():
+                        writer.close()
+                    continue
+                match.deadline = deadline + match.period
+                if now - match.deadline > MAX_LATENESS:
+                    missed = int((now - match.deadline) / match.period)
+                    match.stats.skipped += missed
+                    match.deadline += missed * match.period
+                heapq.heappush(self._schedule, (match.deadline, match_id))
+            wait = 1 / self.tick_rate
+            if self._schedule:
+                wait = min(wait, self._schedule[0][0] - loop.time())
+            await asyncio.sleep(max(0.0, wait))
+
+    async def handle_client(self, reader, writer):
+        """
+        Serves one TCP client: joins it to a match and applies its inputs
+        until it disconnects.
+
+        Args:
+            reader: The asyncio.StreamReader of the connection.
+            writer: The asyncio.StreamWriter of the connection.
+        """
+        match = None
+        side = None
+        try:
+            parts = (await reader.readline()).split()
+            if len(parts) == 2 and parts[0] == b"JOIN":
+                if parts[1] == b"new":
+                    match = self.create_match()
+                elif parts[1].isdigit():
+                    match = self.matches.get(int(parts[1]))
+            if match is not None:
+                side = match.open_side()
+            if side is None:
+                writer.write(b"ERROR no such match or match is full\n")
+                return
+            match.clients[side] = writer
+            writer.write(f"JOINED {match.match_id} {side}\n".encode())
+            async for line in reader:
+                parts = line.split()
+                if len(parts) != 2 or parts[0] != b"INPUT":
+                    continue
+                try:
+                    speed_y = int(parts[1])
+                except ValueError:
+                    continue
+                match.inputs[side] = max(-MAX_INPUT, min(speed_y, MAX_INPUT))
+        except ConnectionError:
+            pass
+        finally:
+            if side is not None and match.clients.get(side) is writer:
+                del match.clients[side]
+                match.inputs[side] = 0
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=PORT):
+        """
+        Accepts clients and runs the scheduler until cancelled.
+
+        Args:
+            host: A string representing the address to listen on.
+            port: An int representing the TCP port to listen on.
+        """
+        server = await asyncio.start_server(self.handle_client, host, port)
+        async with server:
+            await self.run()
+
+    def report(self):
+        """
+        Summarizes how the server is keeping up with its matches.
+
+        Finished matches are counted along with the ones still being played.
+
+        Returns:
+            A dict with the number of matches being played and finished, the
+            ticks run, overrun and skipped, the mean and worst tick in ms,
+            the fraction of one core spent ticking, and the number of
+            matches one core could tick at the default tick rate.
+        """
+        stats = [self.finished_stats] + [
+            match.stats for match in self.matches.values()
+        ]
+        ticks = sum(stat.ticks for stat in stats)
+        busy = sum(stat.busy for stat in stats)
+        elapsed = (
+            time.perf_counter() - self.started if self.started else 0.0
+        )
+        mean = busy / ticks if ticks else 0.0
+        worst = max((stat.worst for stat in stats), default=0.0)
+        return {
+            "matches": len(self.matches),
+            "finished": self.finished,
+            "ticks": ticks,
+            "overruns": sum(stat.overruns for stat in stats),
+            "skipped": sum(stat.skipped for stat in stats),
+            "mean_tick_ms": mean * 1000,
+            "worst_tick_ms": worst * 1000,
+            "load": busy / elapsed if elapsed else 0.0,
+            "capacity": int(1 / (mean * self.tick_rate)) if mean else None,
+        }
+
+
+def measure_capacity(matches=200, ticks=300, tick_rate=TICK_RATE):
+    """
+    Ticks matches back to back on one core to find how many the server
+    could keep at a tick rate.
+
+    Every match has a ball-tracking player, and finished matches start
+    over, so the load is the same as matches being played.
+
+    Args:
+        matches: An int representing the number of matches to tick.
+        ticks: An int representing the ticks to run per match.
+        tick_rate: A number representing the target ticks per second.
+
+    Returns:
+        A dict with the mean tick in ms and the number of matches one core
+        can tick at tick_rate.
+    """
+    server = GameServer(tick_rate=tick_rate)
+    bot = TrackingPolicy()
+    played = [server.create_match(seed) for seed in range(matches)]
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for match in played:
+            match.inputs["player"] = bot(match.model, "player")
+            server.tick_match(match)
+            if match.finished:
+                match.model.cpu_score = 0
+                match.model.player_score = 0
+                match.finished = False
+    elapsed = time.perf_counter() - start
+    mean = elapsed / (matches * ticks)
+    return {
+        "matches": matches,
+        "ticks": ticks,
+        "mean_tick_ms": mean * 1000,
+        "capacity": int(1 / (mean * tick_rate)),
+    }
+
+
+def main(argv=None):
+    """
+    Parses the command line and serves matches or measures capacity.
+
+    Args:
+        argv: An optional list of command line arguments, defaulting to
+            sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Tennis Pong server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument(
+        "--tick-rate",
+        type=int,
+        default=TICK_RATE,
+        help="ticks per second of each match",
+    )
+    parser.add_argument(
+        "--capacity",
+        action="store_true",
+        help="measure how many matches one core can tick, then exit",
+    )
+    parser.add_argument(
+        "--matches",
+        type=int,
+        default=200,
+        help="number of matches to tick when measuring capacity",
+    )
+    args = parser.parse_args(argv)
+
+    if args.capacity:
+        stats = measure_capacity(args.matches, tick_rate=args.tick_rate)
+        print(f"{stats['mean_tick_ms']:.4f} ms per match tick")
+        print(
+            f"{stats['capacity']} matches per core at {args.tick_rate} Hz"
+        )
+        return
+
+    server = GameServer(tick_rate=args.tick_rate)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print(server.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# pong_text.py
+"""
+Module for caching fonts and rendered text, shared by every screen of the
+game.
+
+This module defines the FontRegistry class, which loads each font face and
+size only once, and the TextCache class, which keeps recently rendered text
+surfaces so that text that does not change from frame to frame, such as the
+score, is only rendered by the font once.
+
+"""
+from collections import OrderedDict
+import pygame
+
+
+class FontRegistry:
+    """
+    Loads each font face and size once and hands out the same Font object
+    on every later request.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty font registry.
+        """
+        self._fonts = {}
+
+    def __len__(self):
+        """
+        Returns the number of fonts loaded so far.
+        """
+        return len(self._fonts)
+
+    def get(self, face, size):
+        """
+        Gets the font for a face and size, loading it on first use.
+
+        Args:
+            face: A string representing the path of the font file, or None
+                for pygame's default font.
+            size: An int representing the font size.
+
+        Returns:
+            An instance of the pygame.font.Font class.
+        """
+        key = (face, size)
+        font = self._fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(face, size)
+            self._fonts[key] = font
+        return font
+
+
+class TextCache:
+    """
+    Keeps a bounded number of rendered text surfaces, evicting the least
+    recently used one when full.
+
+    Attributes:
+        max_size: An int representing the most surfaces kept at once.
+        hits: An int counting the renders served from the cache.
+        misses: An int counting the renders that had to use the font.
+    """
+
+    def __init__(self, max_size=128):
+        """
+        Initializes an empty text cache.
+
+        Args:
+            max_size: An int representing the most surfaces to keep.
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._surfaces = OrderedDict()
+
+    def __len__(self):
+        """
+        Returns the number of surfaces currently cached.
+        """
+        return len(self._surfaces)
+
+    def render(self, font, text, antialias, color):
+        """
+        Renders text like pygame.font.Font.render, reusing the surface from
+        an earlier call with the same arguments when possible.
+
+        The returned surface is shared, so callers must not draw on it.
+
+        Args:
+            font: An instance of the pygame.font.Font class to render with.
+            text: A string representing the text to render.
+            antialias: A bool representing whether to smooth the text.
+            color: The color of the text, in any form pygame accepts.
+
+        Returns:
+            An instance of the pygame.Surface class with the rendered text.
+        """
+        # Normalize the color so "white" and (255, 255, 255) share an entry
+        color = tuple(pygame.Color(color))
+        key = (font, text, color, antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_size:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """
+        Removes every cached surface and resets the hit and miss counters.
+        """
+        self._surfaces.clear()
+        self.hits = 0
+        self.misses = 0
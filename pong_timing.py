@@ -0,0 +1,282 @@
+# pong_timing.py
+"""
+Module for measuring where the time of each frame goes.
+
+This module defines the FrameTimer class, which records how long each phase
+of a frame takes: reading input, stepping the physics, drawing (with the
+score, court and racket drawing also counted on their own) and presenting
+the frame on the display. The last frames are kept in a ring buffer, from
+which summaries and histograms are worked out for the on-screen overlay,
+and which can be saved as JSON or CSV.
+
+"""
+import csv
+import json
+import time
+import numpy as np
+
+PHASES = (
+    "input",
+    "physics",
+    "draw",
+    "score",
+    "court",
+    "racket",
+    "present",
+    "frame",
+)
+
+# Frames kept in the ring buffer, ten seconds at 60 frames per second
+DEFAULT_CAPACITY = 600
+
+# Time a frame may take at 60 frames per second
+FRAME_BUDGET = 1 / 60
+
+# Edges of the histogram bins, in ms
+HISTOGRAM_EDGES_MS = (0, 0.5, 1, 2, 4, 8, 16.7, 33.3, 50, 100, float("inf"))
+
+
+class PhaseTimer:
+    """
+    Adds the time spent inside a with block to one phase of the current
+    frame. One is made per phase and reused, so timing allocates nothing.
+
+    Attributes:
+        totals: The list of the current frame's phase totals, in seconds.
+        index: An int representing the phase's position in PHASES.
+        start: A float representing the time.perf_counter value when the
+            current block started.
+    """
+
+    def __init__(self, totals, index):
+        """
+        Initializes the timer for one phase.
+
+        Args:
+            totals: The list of the current frame's phase totals.
+            index: An int representing the phase's position in PHASES.
+        """
+        self.totals = totals
+        self.index = index
+        self.start = 0.0
+
+    def __enter__(self):
+        """
+        Starts timing.
+
+        Returns:
+            The PhaseTimer itself.
+        """
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        """
+        Stops timing and adds the time to the phase.
+
+        Args:
+            exc_info: The exception details, if the block raised.
+        """
+        self.totals[self.index] += time.perf_counter() - self.start
+
+
+class FrameTimer:
+    """
+    Records the time each phase of the last frames took.
+
+    Attributes:
+        samples: A float array of shape (capacity, len(PHASES)) holding
+            the phase times of the last frames, in seconds, as a ring.
+        budget: A float representing the seconds a frame may take.
+        frames: An int counting the frames recorded.
+        over_budget: An int counting the frames that took over budget.
+        first_frame_ms: An optional float representing the ms from launch
+            to the first frame shown, included in the JSON report.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, budget=FRAME_BUDGET):
+        """
+        Initializes a timer with no frames recorded.
+
+        Args:
+            capacity: An int representing how many frames to keep.
+            budget: A float representing the seconds a frame may take.
+        """
+        self.samples = np.zeros((capacity, len(PHASES)))
+        self.budget = budget
+        self.frames = 0
+        self.over_budget = 0
+        self.first_frame_ms = None
+        self._totals = [0.0] * len(PHASES)
+        self._timers = {
+            phase: PhaseTimer(self._totals, index)
+            for index, phase in enumerate(PHASES)
+        }
+        self._frame_start = 0.0
+
+    def measure(self, phase):
+        """
+        Gets the context manager that times a phase.
+
+        Args:
+            phase: A string from PHASES.
+
+        Returns:
+            The PhaseTimer of the phase.
+        """
+        return self._timers[phase]
+
+    def wrap(self, phase, function):
+        """
+        Wraps a function so every call to it is timed as a phase.
+
+        Args:
+            phase: A string from PHASES.
+            function: The function to time.
+
+        Returns:
+            A function that calls function and returns its result.
+        """
+        timer = self._timers[phase]
+
+        def timed(*args, **kwargs):
+            with timer:
+                return function(*args, **kwargs)
+
+        return timed
+
+    def instrument(self, view):
+        """
+        Times a View's score, court and racket drawing and its display
+        updates, by replacing those methods on the instance.
+
+        Args:
+            view: The View object to instrument.
+        """
+        view.score = self.wrap("score", view.score)
+        view.court = self.wrap("court", view.court)
+        view.racket = self.wrap("racket", view.racket)
+        view.update = self.wrap("present", view.update)
+
+    def begin_frame(self):
+        """
+        Starts recording a new frame.
+        """
+        for index in range(len(self._totals)):
+            self._totals[index] = 0.0
+        self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """
+        Finishes the current frame and stores it in the ring buffer.
+
+        The draw phase is stored without the time spent presenting, which
+        happens inside View.render.
+        """
+        totals = self._totals
+        totals[PHASES.index("frame")] = time.perf_counter() - self._frame_start
+        totals[PHASES.index("draw")] -= totals[PHASES.index("present")]
+        self.samples[self.frames % len(self.samples)] = totals
+        self.frames += 1
+        if totals[PHASES.index("frame")] > self.budget:
+            self.over_budget += 1
+
+    def recent(self):
+        """
+        Gets the frames in the ring buffer, oldest first.
+
+        Returns:
+            A float array of shape (frames kept, len(PHASES)) in seconds.
+        """
+        capacity = len(self.samples)
+        if self.frames <= capacity:
+            return self.samples[: self.frames]
+        return np.roll(self.samples, -(self.frames % capacity), axis=0)
+
+    def histogram(self, phase):
+        """
+        Counts the recent frames by how long a phase took.
+
+        Args:
+            phase: A string from PHASES.
+
+        Returns:
+            A list of the number of frames in each bin of HISTOGRAM_EDGES_MS.
+        """
+        times = self.recent()[:, PHASES.index(phase)] * 1000
+        counts, _ = np.histogram(times, bins=HISTOGRAM_EDGES_MS)
+        return counts.tolist()
+
+    def summary(self):
+        """
+        Summarizes the recent frames.
+
+        Returns:
+            A dict mapping each phase to a dict of its mean, median, 95th
+            percentile and worst time in ms.
+        """
+        recent = self.recent() * 1000
+        summary = {}
+        for index, phase in enumerate(PHASES):
+            times = recent[:, index]
+            if not len(times):
+                times = np.zeros(1)
+            summary[phase] = {
+                "mean_ms": float(times.mean()),
+                "p50_ms": float(np.percentile(times, 50)),
+                "p95_ms": float(np.percentile(times, 95)),
+                "max_ms": float(times.max()),
+            }
+        return summary
+
+    def hud_lines(self):
+        """
+        Describes the recent frames for the on-screen overlay.
+
+        Returns:
+            A list of strings: a heading, one line per phase and a line
+            counting the frames over budget.
+        """
+        lines = ["phase      mean    p95    max"]
+        lines += [
+            f"{phase:<8} {stats['mean_ms']:6.2f} {stats['p95_ms']:6.2f}"
+            f" {stats['max_ms']:6.2f} ms"
+            for phase, stats in self.summary().items()
+        ]
+        lines.append(
+            f"{self.over_budget}/{self.frames} frames over"
+            f" {self.budget * 1000:.1f} ms"
+        )
+        return lines
+
+    def dump(self, path):
+        """
+        Saves the recent frames: the summary and histograms as JSON if path
+        ends in .json, otherwise every frame's phase times as CSV.
+
+        Args:
+            path: A string representing the file to write.
+        """
+        if path.endswith(".json"):
+            report = {
+                "budget_ms": self.budget * 1000,
+                "frames": self.frames,
+                "over_budget": self.over_budget,
+                "first_frame_ms": self.first_frame_ms,
+                "summary": self.summary(),
+                "histogram_bin_starts_ms": list(HISTOGRAM_EDGES_MS[:-1]),
+                "histograms": {
+                    phase: self.histogram(phase) for phase in PHASES
+                },
+            }
+            with open(path, "w", encoding="utf-8") as report_file:
+                json.dump(report, report_file, indent=2)
+            return
+        first = max(0, self.frames - len(self.samples))
+        with open(path, "w", newline="", encoding="utf-8") as report_file:
+            writer = csv.writer(report_file)
+            writer.writerow(["frame"] + [f"{phase}_ms" for phase in PHASES])
+            for offset, row in enumerate(self.recent()):
+                writer.writerow(
+                    [first + offset] + [f"{value * 1000:.4f}" for value in row]
+                )
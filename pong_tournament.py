@@ -0,0 +1,226 @@
+# pong_tournament.py
+"""
+Module for running tournaments of computer-controlled matches across
+several processes.
+
+Each match is played to WINNING_SCORE points, as in the game, with a
+policy moving each racket. The matches are spread over a
+ProcessPoolExecutor, and their results stream back as each one finishes
+and are added up into win rates, the average rally length and the points
+played per second.
+
+Every match gets its own seed, drawn in order from the tournament seed, so
+running the same tournament twice gives the same results however the
+matches are spread over the processes.
+
+Run `python pong_tournament.py --matches 1000 --left cpu --right predict`
+to play a tournament from the command line.
+
+"""
+import argparse
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pong_model import MAX_MATCH_STEPS, MAX_SEED, Model
+from pong_policies import POLICIES, make_policy
+
+SCREEN_WIDTH = 1200
+SCREEN_HEIGHT = 675
+
+
+def play_match(seed, left, right, max_steps=MAX_MATCH_STEPS):
+    """
+    Plays one match between two policies.
+
+    Args:
+        seed: An int used to seed the match's Model.
+        left: A string naming the registered policy of the left (CPU)
+            racket.
+        right: A string naming the registered policy of the right (player)
+            racket.
+        max_steps: An int representing the most steps the match may take.
+
+    Returns:
+        A dict with the seed, the winning side ("left", "right" or None if
+        the match was abandoned), both scores, the steps played, the racket
+        contacts made, and the decisions of each policy that went over
+        budget.
+    """
+    left_policy = make_policy(left)
+    right_policy = make_policy(right)
+    model = Model(SCREEN_WIDTH, SCREEN_HEIGHT, seed, left_policy)
+    steps = 0
+    contacts = 0
+    while not model.game_over() and steps < max_steps:
+        points = model.cpu_score + model.player_score
+        speed_x = model.ball.speed_x
+        model.move_objects()
+        model.move_player(right_policy(model, "player"))
+        model.move_cpu()
+        steps += 1
+        # A racket hit reverses the ball without anyone scoring
+        if (
+            model.cpu_score + model.player_score == points
+            and (model.ball.speed_x > 0) != (speed_x > 0)
+        ):
+            contacts += 1
+    winner = None
+    if model.game_over():
+        winner = "left" if model.cpu_score > model.player_score else "right"
+    return {
+        "seed": seed,
+        "winner": winner,
+        "left_score": model.cpu_score,
+        "right_score": model.player_score,
+        "steps": steps,
+        "contacts": contacts,
+        "left_overruns": left_policy.overruns,
+        "right_overruns": right_policy.overruns,
+    }
+
+
+def match_seeds(seed, matches):
+    """
+    Draws the seed of every match of a tournament.
+
+    Args:
+        seed: An int used to seed the tournament.
+        matches: An int representing the number of matches.
+
+    Returns:
+        A list of one int seed per match.
+    """
+    rng = random.Random(seed)
+    return [rng.randrange(MAX_SEED) for _ in range(matches)]
+
+
+def run_tournament(
+    matches, left, right, seed=0, workers=None, max_steps=MAX_MATCH_STEPS
+):
+    """
+    Plays matches across a pool of processes, yielding each result as soon
+    as its match finishes.
+
+    Args:
+        matches: An int representing the number of matches to play.
+        left: A string naming the policy of the left racket.
+        right: A string naming the policy of the right racket.
+        seed: An int used to seed the tournament.
+        workers: An optional int representing the number of processes,
+            defaulting to one per CPU.
+        max_steps: An int representing the most steps a match may take
+            before it is abandoned.
+
+    Yields:
+        The dict returned by play_match for every match, in the order they
+        finish.
+
+    Raises:
+        ValueError: If left or right is not the name of a policy.
+    """
+    for name in (left, right):
+        if name not in POLICIES:
+            raise ValueError(f"unknown policy {name!r}")
+    with ProcessPoolExecutor(workers) as executor:
+        futures = [
+            executor.submit(play_match, match_seed, left, right, max_steps)
+            for match_seed in match_seeds(seed, matches)
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def summarize(results, seconds):
+    """
+    Adds up the results of a tournament.
+
+    Args:
+        results: A list of the dicts returned by play_match.
+        seconds: A float representing how long the tournament took.
+
+    Returns:
+        A dict with the number of matches, the left and right win rates,
+        the number of abandoned matches, the average rally length in racket
+        contacts per point, the points and matches played per second, and
+        the policy decisions on each side that went over budget.
+    """
+    matches = len(results)
+    points = sum(
+        result["left_score"] + result["right_score"] for result in results
+    )
+    contacts = sum(result["contacts"] for result in results)
+    winners = [result["winner"] for result in results]
+    seconds = max(seconds, 1e-9)
+    return {
+        "matches": matches,
+        "left_win_rate": winners.count("left") / max(matches, 1),
+        "right_win_rate": winners.count("right") / max(matches, 1),
+        "abandoned": winners.count(None),
+        "rally_length": contacts / points if points else 0.0,
+        "points_per_sec": points / seconds,
+        "matches_per_sec": matches / seconds,
+        "left_overruns": sum(r.get("left_overruns", 0) for r in results),
+        "right_overruns": sum(r.get("right_overruns", 0) for r in results),
+    }
+
+
+def main(argv=None):
+    """
+    Parses the command line and plays a tournament, printing progress as
+    matches finish and a summary at the end.
+
+    Args:
+        argv: An optional list of command line arguments, defaulting to
+            sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Tennis Pong tournament")
+    parser.add_argument("--matches", type=int, default=1000)
+    parser.add_argument("--left", choices=sorted(POLICIES), default="cpu")
+    parser.add_argument("--right", choices=sorted(POLICIES), default="track")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--max-steps",
+        type=int,
+        default=MAX_MATCH_STEPS,
+        help="steps after which a match is abandoned",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="number of processes, one per CPU by default",
+    )
+    args = parser.parse_args(argv)
+
+    results = []
+    start = time.perf_counter()
+    for result in run_tournament(
+        args.matches,
+        args.left,
+        args.right,
+        args.seed,
+        args.workers,
+        args.max_steps,
+    ):
+        results.append(result)
+        if len(results) % 100 == 0:
+            print(f"{len(results)}/{args.matches} matches played")
+    stats = summarize(results, time.perf_counter() - start)
+    print(
+        f"{args.left} (left) won {stats['left_win_rate']:.1%},"
+        f" {args.right} (right) won {stats['right_win_rate']:.1%}"
+        f" of {stats['matches']} matches"
+        f" ({stats['abandoned']} abandoned)"
+    )
+    print(f"{stats['rally_length']:.2f} racket contacts per point")
+    print(
+        f"{stats['points_per_sec']:.0f} points/sec,"
+        f" {stats['matches_per_sec']:.1f} matches/sec"
+    )
+    print(
+        f"Policy decisions over budget: {stats['left_overruns']} left,"
+        f" {stats['right_overruns']} right"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -8,8 +8,56 @@ to render various elements such as the ball, rackets, net, score, and
 start/end screens.
 
 """
-import sys
+import threading
 import pygame
+from pong_assets import ASSETS
+from pong_model import WINNING_SCORE
+from pong_text import FontRegistry, TextCache
+
+# How long the start and end screens sleep waiting for an event, in ms
+IDLE_TIMEOUT_MS = 500
+
+# Window events after which the start and end screens must be redrawn
+REDRAW_EVENTS = (
+    pygame.VIDEOEXPOSE,
+    pygame.WINDOWEXPOSED,
+    pygame.WINDOWRESTORED,
+    pygame.WINDOWSIZECHANGED,
+)
+
+# Image drawn for both rackets, and the size it is drawn at
+RACKET_IMAGE = "tennis_racket.png"
+RACKET_SIZE = (40, 100)
+
+# Objects that move farther than this between two physics states, such as the
+# ball after a point, are drawn at their new position instead of sliding there.
+SNAP_DISTANCE = 100
+
+
+def interpolate_positions(previous, current, alpha):
+    """
+    Blends two sets of object positions from consecutive physics states.
+
+    Args:
+        previous: A dict from Model.positions() for the earlier state.
+        current: A dict from Model.positions() for the later state.
+        alpha: A float from 0 to 1 representing how far between the two
+            states to draw.
+
+    Returns:
+        A dict mapping each object name to its interpolated (x, y) tuple.
+    """
+    positions = {}
+    for name, (new_x, new_y) in current.items():
+        old_x, old_y = previous.get(name, (new_x, new_y))
+        if abs(new_x - old_x) + abs(new_y - old_y) > SNAP_DISTANCE:
+            positions[name] = (new_x, new_y)
+        else:
+            positions[name] = (
+                old_x + (new_x - old_x) * alpha,
+                old_y + (new_y - old_y) * alpha,
+            )
+    return positions
 
 
 class View:
@@ -18,113 +66,325 @@ class View:
     interfaces.
     """
 
-    def __init__(self, screen):
+    def __init__(self, screen, dirty_rects=False, present=True, assets=None):
         """
         Initializes the View object with the given screen.
 
         Args:
             screen: An instance of the Pygame surface class used to render
             graphics on.
+            dirty_rects: A bool that, when True, makes render redraw and
+            update only the parts of the screen that changed.
+            present: A bool that, when False, makes render draw on screen
+            without updating the display, so screen can be an off-screen
+            surface whose pixels are read back instead.
+            assets: An optional AssetManager to load images with, defaulting
+            to ASSETS, which every View shares.
         """
         self.screen = screen
-        self.score_font = pygame.font.Font(None, 100)
+        self.assets = assets or ASSETS
+        self.dirty_rects = dirty_rects
+        self.present = present
+        # Dirty-rect state: the screen without the moving sprites, the
+        # scores it was drawn with, and the sprite areas drawn last frame
+        self.static_layer = None
+        self.static_scores = None
+        self.sprite_rects = []
+        # Fill, court lines and net, drawn once per screen size
+        self.background = None
+        self.fonts = FontRegistry()
+        self.score_font = self.fonts.get(None, 100)
+        self.hud_font = self.fonts.get(None, 24)
+        # Lines of text drawn over the game, such as frame timings
+        self.hud_lines = None
+        self.text_cache = TextCache()
+        # Pre-rendered menus, with the screen size (and scores) they show
+        self.start_layout = None
+        self.end_layout = None
         self.net = pygame.Rect(
             self.screen.get_width() / 2 - 5, 0, 10, self.screen.get_height()
         )
-        self.player_image = pygame.image.load(
-            "tennis_racket.png"
-        ).convert_alpha()
-        self.cpu_image = pygame.image.load("tennis_racket.png").convert_alpha()
+        # The racket image is decoded on first use, or in the background by
+        # preload_rackets, so it doesn't hold up the first frame
+        self.player_image = None
+        self.cpu_image = None
+        self.racket_loader = None
 
-        self.player_image = pygame.transform.scale(self.player_image, (40, 100))
-        self.cpu_image = pygame.transform.scale(self.cpu_image, (40, 100))
-
-    def render(self, model):
+    def render(self, model, positions=None):
         """
         Renders the game view, including the ball, rackets, net, and score.
 
         Args:
             model: The Model object containing game state information.
+            positions: An optional dict of (x, y) tuples, as returned by
+                interpolate_positions, to draw the ball and rackets at
+                instead of their positions in the model.
         """
-        self.screen.fill("dark green")
+        if self.dirty_rects:
+            self.render_dirty(model, positions)
+            return
+        self.screen.blit(self.background_layer(), (0, 0))
         self.score(model)
-        self.court()
-        self.racket(model.player.rect, self.player_image)
-        self.racket(model.cpu.rect, self.cpu_image)
-        pygame.draw.ellipse(self.screen, "green", model.ball.rect)
-        pygame.draw.rect(self.screen, "black", self.net)
-        pygame.display.update()
+        self.cover_net(self.sprites(model, positions))
+        self.hud()
+        self.update()
+
+    def background_layer(self):
+        """
+        Gets the court background, building it if the screen size changed.
+
+        The background holds everything that never moves (the fill, the
+        court lines and the net) in the display's pixel format, so each
+        frame can start with a single blit.
+
+        Returns:
+            An instance of the pygame.Surface class the size of the screen.
+        """
+        size = self.screen.get_size()
+        if self.background is not None and self.background.get_size() == size:
+            return self.background
+        self.net = pygame.Rect(size[0] / 2 - 5, 0, 10, size[1])
+        background = self.new_screen_surface()
+        background.fill("dark green")
+        self.court(background)
+        pygame.draw.rect(background, "black", self.net)
+        self.background = background
+        return background
+
+    def cover_net(self, rects):
+        """
+        Redraws the net over any of the given areas that touch it, since the
+        net is drawn above the ball and rackets.
+
+        Args:
+            rects: A list of pygame.Rect objects that were just drawn.
+        """
+        for rect in rects:
+            overlap = rect.clip(self.net)
+            if overlap:
+                pygame.draw.rect(self.screen, "black", overlap)
+
+    def render_dirty(self, model, positions=None):
+        """
+        Renders the game view by restoring and redrawing only the areas
+        covered by the ball and rackets in this frame and the last one.
+
+        The screen without the moving sprites is kept in a static layer,
+        the court background plus the score, which is rebuilt only when the
+        score or the screen size changes.
+
+        Args:
+            model: The Model object containing game state information.
+            positions: An optional dict of (x, y) tuples to draw the ball
+                and rackets at instead of their positions in the model.
+        """
+        scores = (model.cpu_score, model.player_score)
+        if (
+            self.static_layer is None
+            or self.static_layer.get_size() != self.screen.get_size()
+            or scores != self.static_scores
+        ):
+            self.static_layer = self.background_layer().copy()
+            self.score(model, self.static_layer)
+            self.static_scores = scores
+            self.screen.blit(self.static_layer, (0, 0))
+            self.sprite_rects = self.sprites(model, positions) + self.hud()
+            self.update()
+            return
+
+        old_rects = self.sprite_rects
+        for rect in old_rects:
+            self.screen.blit(self.static_layer, rect, rect)
+        self.sprite_rects = self.sprites(model, positions)
+        dirty = old_rects + self.sprite_rects
+        self.cover_net(dirty)
+        # The overlay goes above everything, including the net
+        hud_rects = self.hud()
+        self.sprite_rects += hud_rects
+        self.update(dirty + hud_rects)
+
+    def update(self, rects=None):
+        """
+        Presents what was drawn by updating the display, unless the view was
+        created with present=False.
+
+        Args:
+            rects: An optional list of pygame.Rect objects to update instead
+                of the whole display.
+        """
+        if not self.present:
+            return
+        if rects is None:
+            pygame.display.update()
+        else:
+            pygame.display.update(rects)
+
+    def hud(self):
+        """
+        Renders hud_lines, if any, in the top left corner of the screen.
+
+        Returns:
+            A list of pygame.Rect objects covering the areas drawn.
+        """
+        if not self.hud_lines:
+            return []
+        rects = []
+        y_coordinate = 5
+        for line in self.hud_lines:
+            text = self.text_cache.render(self.hud_font, line, True, "white")
+            rects.append(self.screen.blit(text, (5, y_coordinate)))
+            y_coordinate += text.get_height()
+        return rects
+
+    def pixels(self):
+        """
+        Gets the pixels of the screen without copying them.
+
+        The screen stays locked, so it can't be drawn on, until the array
+        returned is deleted.
+
+        Returns:
+            A uint8 NumPy array of shape (height, width, 3) that views the
+            screen's red, green and blue values.
+        """
+        return pygame.surfarray.pixels3d(self.screen).transpose(1, 0, 2)
+
+    def preload_rackets(self):
+        """
+        Starts decoding the racket image on a background thread, so it is
+        ready by the time the first match is drawn.
+        """
+        if self.player_image is None and self.racket_loader is None:
+            self.racket_loader = threading.Thread(
+                target=self.decode_rackets, daemon=True
+            )
+            self.racket_loader.start()
+
+    def decode_rackets(self):
+        """
+        Loads the racket image at the size it is drawn at, without
+        converting it, which is left to the thread that draws.
+        """
+        self.assets.image(RACKET_IMAGE, RACKET_SIZE, convert=False)
+
+    def racket_images(self):
+        """
+        Gets the racket images, loading the racket image if it isn't
+        loaded yet or waiting for preload_rackets to finish.
+
+        Both rackets share one surface from the asset manager, which is
+        only ever drawn from.
+
+        Returns:
+            A tuple of the player's and the CPU's racket images.
+        """
+        if self.player_image is None:
+            if self.racket_loader is not None:
+                self.racket_loader.join()
+                self.racket_loader = None
+            image = self.assets.image(RACKET_IMAGE, RACKET_SIZE)
+            self.player_image = image
+            self.cpu_image = image
+        return self.player_image, self.cpu_image
+
+    def sprites(self, model, positions=None):
+        """
+        Renders the rackets and the ball.
+
+        Args:
+            model: The Model object containing game state information.
+            positions: An optional dict of (x, y) tuples to draw the ball
+                and rackets at instead of their positions in the model.
+
+        Returns:
+            A list of pygame.Rect objects covering the areas drawn.
+        """
+        player_image, cpu_image = self.racket_images()
+        return [
+            self.racket(
+                self.placed(model.player.rect, positions, "player"),
+                player_image,
+            ),
+            self.racket(
+                self.placed(model.cpu.rect, positions, "cpu"), cpu_image
+            ),
+            pygame.draw.ellipse(
+                self.screen,
+                "green",
+                self.placed(model.ball.rect, positions, "ball"),
+            ),
+        ]
+
+    @staticmethod
+    def placed(rect, positions, name):
+        """
+        Gets the rectangle to draw an object at, rounding the model's float
+        position to whole pixels.
+
+        Args:
+            rect: The pong_model.Box holding the object's position and size
+                in the model.
+            positions: An optional dict of (x, y) tuples to draw objects at.
+            name: A string representing the object's key in positions.
+
+        Returns:
+            An instance of the pygame.Rect class at the position to draw.
+        """
+        if positions is None or name not in positions:
+            x_coordinate, y_coordinate = rect.x, rect.y
+        else:
+            x_coordinate, y_coordinate = positions[name]
+        return pygame.Rect(
+            round(x_coordinate), round(y_coordinate), rect.width, rect.height
+        )
 
-    def score(self, model):
+    def score(self, model, surface=None):
         """
         Renders the current score on the game screen.
 
         Args:
             model: The Model object containing game state information.
+            surface: An optional instance of the Pygame surface class to
+            draw on instead of the screen.
         """
-        cpu_score_surface = self.score_font.render(
-            str(model.cpu_score), True, "white"
+        surface = self.screen if surface is None else surface
+        cpu_score_surface = self.text_cache.render(
+            self.score_font, str(model.cpu_score), True, "white"
         )
-        player_score_surface = self.score_font.render(
-            str(model.player_score), True, "white"
+        player_score_surface = self.text_cache.render(
+            self.score_font, str(model.player_score), True, "white"
         )
-        self.screen.blit(cpu_score_surface, (self.screen.get_width() / 4, 20))
-        self.screen.blit(
+        surface.blit(cpu_score_surface, (self.screen.get_width() / 4, 20))
+        surface.blit(
             player_score_surface, (self.screen.get_width() * 0.75, 20)
         )
 
-    def court(self):
+    def court(self, surface=None):
         """
         Renders the tennis court lines on the game screen.
+
+        Args:
+            surface: An optional instance of the Pygame surface class to
+            draw on instead of the screen.
         """
-        pygame.draw.aaline(
-            self.screen,
-            "white",
-            (self.screen.get_width() / 4, self.screen.get_height() / 8),
-            (self.screen.get_width() / 4, self.screen.get_height() * 7 / 8),
-        )
-        pygame.draw.aaline(
-            self.screen,
-            "white",
-            (self.screen.get_width() * 3 / 4, self.screen.get_height() / 8),
-            (self.screen.get_width() * 3 / 4, self.screen.get_height() * 7 / 8),
-        )
-        pygame.draw.aaline(
-            self.screen,
-            "black",
-            (self.screen.get_width() / 2, 0),
-            (self.screen.get_width() / 2, self.screen.get_height()),
-        )
-        pygame.draw.aaline(
-            self.screen,
-            "white",
-            (0, self.screen.get_height() / 8),
-            (self.screen.get_width(), self.screen.get_height() / 8),
-        )
-        pygame.draw.aaline(
-            self.screen,
-            "white",
-            (0, self.screen.get_height() * 7 / 8),
-            (self.screen.get_width(), self.screen.get_height() * 7 / 8),
-        )
-        pygame.draw.aaline(
-            self.screen,
-            "white",
-            (0, self.screen.get_height() / 2),
-            (10, self.screen.get_height() / 2),
-        )
-        pygame.draw.aaline(
-            self.screen,
-            "white",
-            (self.screen.get_width(), self.screen.get_height() / 2),
-            (self.screen.get_width() - 10, self.screen.get_height() / 2),
-        )
-        pygame.draw.aaline(
-            self.screen,
-            "white",
-            (self.screen.get_width() / 4, self.screen.get_height() / 2),
-            (self.screen.get_width() * 3 / 4, self.screen.get_height() / 2),
-        )
+        surface = self.screen if surface is None else surface
+        width, height = surface.get_size()
+        lines = [
+            ("white", (width / 4, height / 8), (width / 4, height * 7 / 8)),
+            (
+                "white",
+                (width * 3 / 4, height / 8),
+                (width * 3 / 4, height * 7 / 8),
+            ),
+            ("black", (width / 2, 0), (width / 2, height)),
+            ("white", (0, height / 8), (width, height / 8)),
+            ("white", (0, height * 7 / 8), (width, height * 7 / 8)),
+            ("white", (0, height / 2), (10, height / 2)),
+            ("white", (width, height / 2), (width - 10, height / 2)),
+            ("white", (width / 4, height / 2), (width * 3 / 4, height / 2)),
+        ]
+        for color, start, end in lines:
+            pygame.draw.aaline(surface, color, start, end)
 
     def racket(self, rect, image):
         """
@@ -135,8 +395,11 @@ class View:
             rectangle representing the position and size of the racket.
             image: An instance of the pygame.Surface class representing
             the image of the racket.
+
+        Returns:
+            A pygame.Rect covering the area drawn.
         """
-        self.screen.blit(image, rect)
+        return self.screen.blit(image, rect)
 
     def start_screen(self):
         """
@@ -146,18 +409,41 @@ class View:
         Returns:
             The rectangle representing the play button in the form pygame.Rect
         """
-        self.screen.fill("dark green")
+        self.static_layer = None
+        size = self.screen.get_size()
+        if self.start_layout is None or self.start_layout[0] != size:
+            self.start_layout = (size, *self.build_start_screen())
+        _, surface, play_button = self.start_layout
+        self.screen.blit(surface, (0, 0))
+        pygame.display.flip()
+
+        # Return button rectangle for event handling
+        return play_button
+
+    def build_start_screen(self):
+        """
+        Draws the start screen onto a new surface the size of the screen.
+
+        Returns:
+            A tuple of the pygame.Surface holding the start screen and the
+            pygame.Rect of the play button on it.
+        """
+        surface = self.new_screen_surface()
+        width, height = surface.get_size()
+        surface.fill("dark green")
 
         # Display game title
-        title_font = pygame.font.Font(None, 100)
-        title_text = title_font.render("Tennis Pong", True, "white")
-        self.screen.blit(
+        title_font = self.fonts.get(None, 100)
+        title_text = self.text_cache.render(
+            title_font, "Tennis Pong", True, "white"
+        )
+        surface.blit(
             title_text,
-            (self.screen.get_width() // 2 - title_text.get_width() // 2, 100),
+            (width // 2 - title_text.get_width() // 2, 100),
         )
 
         # Display instructions
-        instruction_font = pygame.font.Font(None, 36)
+        instruction_font = self.fonts.get(None, 36)
         instructions = [
             "Instructions:",
             (
@@ -165,40 +451,30 @@ class View:
                 " baseline."
             ),
             "Try to hit the ball past your opponent.",
-            "First to score 5 points wins!",
+            f"First to score {WINNING_SCORE} points wins!",
         ]
         y_offset = 300
         for instruction in instructions:
-            instruction_text = instruction_font.render(
-                instruction, True, "white"
+            instruction_text = self.text_cache.render(
+                instruction_font, instruction, True, "white"
             )
-            self.screen.blit(
+            surface.blit(
                 instruction_text,
-                (
-                    self.screen.get_width() // 2
-                    - instruction_text.get_width() // 2,
-                    y_offset,
-                ),
+                (width // 2 - instruction_text.get_width() // 2, y_offset),
             )
             y_offset += 50
 
         # Draw play button
-        play_button = pygame.Rect(
-            self.screen.get_width() // 2 - 100,
-            self.screen.get_height() // 2 + 200,
-            200,
-            50,
-        )
-        pygame.draw.rect(self.screen, (255, 0, 0), play_button)
+        play_button = pygame.Rect(width // 2 - 100, height // 2 + 200, 200, 50)
+        pygame.draw.rect(surface, (255, 0, 0), play_button)
 
         # Text for play button
-        play_text = instruction_font.render("Play", True, "white")
-        self.screen.blit(play_text, (play_button.x + 70, play_button.y + 10))
+        play_text = self.text_cache.render(
+            instruction_font, "Play", True, "white"
+        )
+        surface.blit(play_text, (play_button.x + 70, play_button.y + 10))
 
-        pygame.display.flip()
-
-        # Return button rectangle for event handling
-        return play_button
+        return surface, play_button
 
     def end_screen(self, model):
         """
@@ -212,101 +488,88 @@ class View:
             The rectangles representing the play again and exit buttons
             in a tuple form [pygame.Rect, pygame.Rect]
         """
-        self.screen.fill("dark green")
+        self.static_layer = None
+        key = (self.screen.get_size(), model.cpu_score, model.player_score)
+        if self.end_layout is None or self.end_layout[0] != key:
+            self.end_layout = (
+                key,
+                *self.build_end_screen(model.cpu_score, model.player_score),
+            )
+        _, surface, play_again_button, exit_button = self.end_layout
+        self.screen.blit(surface, (0, 0))
+        pygame.display.flip()
+
+        return play_again_button, exit_button
+
+    def build_end_screen(self, cpu_score, player_score):
+        """
+        Draws the end screen for the given final scores onto a new surface
+        the size of the screen.
+
+        Args:
+            cpu_score: An int representing the CPU's final score.
+            player_score: An int representing the player's final score.
+
+        Returns:
+            A tuple of the pygame.Surface holding the end screen and the
+            pygame.Rect objects of the play again and exit buttons on it.
+        """
+        surface = self.new_screen_surface()
+        width, height = surface.get_size()
+        surface.fill("dark green")
 
         # Display final scores
-        font = pygame.font.Font(None, 64)
-        cpu_score_surface = font.render(
-            "CPU Score: " + str(model.cpu_score), True, "white"
+        font = self.fonts.get(None, 64)
+        cpu_score_surface = self.text_cache.render(
+            font, "CPU Score: " + str(cpu_score), True, "white"
         )
-        player_score_surface = font.render(
-            "Player Score: " + str(model.player_score), True, "white"
+        player_score_surface = self.text_cache.render(
+            font, "Player Score: " + str(player_score), True, "white"
         )
-        self.screen.blit(
-            cpu_score_surface,
-            (
-                self.screen.get_width() // 2 - 150,
-                self.screen.get_height() // 2 - 50,
-            ),
-        )
-        self.screen.blit(
-            player_score_surface,
-            (
-                self.screen.get_width() // 2 - 150,
-                self.screen.get_height() // 2 + 50,
-            ),
+        surface.blit(cpu_score_surface, (width // 2 - 150, height // 2 - 50))
+        surface.blit(
+            player_score_surface, (width // 2 - 150, height // 2 + 50)
         )
 
-        if model.cpu_score > model.player_score:
-            winner_surface = font.render("CPU wins!", True, "white")
-        elif model.player_score > model.cpu_score:
-            winner_surface = font.render("Player wins!", True, "white")
+        if cpu_score > player_score:
+            winner = "CPU wins!"
+        elif player_score > cpu_score:
+            winner = "Player wins!"
         else:
-            winner_surface = font.render("It's a tie!", True, "white")
-        self.screen.blit(
-            winner_surface,
-            (
-                self.screen.get_width() // 2 - 150,
-                self.screen.get_height() // 2 + 150,
-            ),
-        )
+            winner = "It's a tie!"
+        winner_surface = self.text_cache.render(font, winner, True, "white")
+        surface.blit(winner_surface, (width // 2 - 150, height // 2 + 150))
 
         # Draw buttons
         play_again_button = pygame.Rect(
-            self.screen.get_width() // 2 - 150,
-            self.screen.get_height() // 2 - 150,
-            300,
-            70,
+            width // 2 - 150, height // 2 - 150, 300, 70
         )
-        exit_button = pygame.Rect(
-            self.screen.get_width() // 2 - 150,
-            self.screen.get_height() // 2 - 250,
-            300,
-            70,
-        )
-        pygame.draw.rect(self.screen, (255, 0, 0), play_again_button)
-        pygame.draw.rect(self.screen, (255, 0, 0), exit_button)
+        exit_button = pygame.Rect(width // 2 - 150, height // 2 - 250, 300, 70)
+        pygame.draw.rect(surface, (255, 0, 0), play_again_button)
+        pygame.draw.rect(surface, (255, 0, 0), exit_button)
 
         # Text for buttons
-        play_again_text = font.render("Play Again", True, "white")
-        exit_text = font.render("Exit", True, "white")
-        self.screen.blit(
+        play_again_text = self.text_cache.render(
+            font, "Play Again", True, "white"
+        )
+        exit_text = self.text_cache.render(font, "Exit", True, "white")
+        surface.blit(
             play_again_text,
             (play_again_button.x + 40, play_again_button.y + 15),
         )
-        self.screen.blit(exit_text, (exit_button.x + 105, exit_button.y + 15))
+        surface.blit(exit_text, (exit_button.x + 105, exit_button.y + 15))
 
-        pygame.display.flip()
-
-        return play_again_button, exit_button
+        return surface, play_again_button, exit_button
 
-    def winner_end_game(self, model):
+    def new_screen_surface(self):
         """
-        Renders the end game screen if a winner is determined, allowing
-        the player to play again or exit.
+        Creates a surface the size of the screen, in the display's pixel
+        format when a display is open.
 
-        Args:
-            model: The Model object containing game state information.
+        Returns:
+            An instance of the pygame.Surface class.
         """
-        if model.cpu_score < 5 and model.player_score < 5:
-            return
-
-        play_again_button, exit_button = self.end_screen(model)
-
-        while True:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    if event.button != 1:
-                        continue
-
-                    mouse_pos = pygame.mouse.get_pos()
-                    if play_again_button.collidepoint(mouse_pos):
-                        model.cpu_score = 0
-                        model.player_score = 0
-                        return "play_again"
-                    if exit_button.collidepoint(mouse_pos):
-                        pygame.quit()
-                        sys.exit()
+        surface = pygame.Surface(self.screen.get_size())
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert(self.screen)
+        return surface
@@ -0,0 +1,62 @@
+"""
+This is where we test the benchmark suite to ensure benchmarks run, are
+saved as baselines and catch regressions.
+"""
+
+import pytest
+from bench_pong import (
+    BENCHMARKS,
+    compare,
+    load_baseline,
+    run_benchmarks,
+    save_baseline,
+)
+
+
+# Checks that every benchmark runs and can be saved and loaded again.
+def test_run_and_save(tmp_path):
+    """
+    Check that every benchmark reports a time and that the results come
+    back unchanged from a baseline file.
+
+    Args:
+        tmp_path: a temporary directory provided by pytest.
+    """
+    results = run_benchmarks(repeat=2, min_time=0.001)
+    assert list(results) == list(BENCHMARKS)
+    for stats in results.values():
+        assert stats["calls"] >= 1
+        assert 0 < stats["best_us"] <= stats["median_us"]
+    path = str(tmp_path / "baseline.json")
+    save_baseline(results, path)
+    assert load_baseline(path) == results
+
+
+# Checks that an unknown benchmark is refused.
+def test_unknown_benchmark():
+    """
+    Check that asking for a benchmark that doesn't exist raises ValueError.
+    """
+    with pytest.raises(ValueError):
+        run_benchmarks(["view.nothing"])
+
+
+# Checks that only benchmarks slower than the threshold are regressions.
+def test_compare():
+    """
+    Check that a benchmark is a regression only when it is slower than its
+    baseline by more than the threshold, and that benchmarks missing from
+    the baseline are left out.
+    """
+    baseline = {"fast": {"best_us": 10.0}, "slow": {"best_us": 10.0}}
+    results = {
+        "fast": {"best_us": 11.0},
+        "slow": {"best_us": 13.0},
+        "new": {"best_us": 1.0},
+    }
+    rows = compare(results, baseline, threshold=0.25)
+    assert [(row[0], row[4]) for row in rows] == [
+        ("fast", False),
+        ("slow", True),
+    ]
+    assert rows[1][3] == pytest.approx(1.3)
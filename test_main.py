@@ -0,0 +1,116 @@
+"""
+This is where we test the headless entry point of the game.
+"""
+
+import pygame
+import pytest
+from main import (
+    END,
+    PLAYING,
+    QUIT,
+    START,
+    Game,
+    idle_transition,
+    run_headless,
+)
+from pong_model import Model, WINNING_SCORE
+
+
+# Checks that headless matches are played to the end and reported.
+def test_run_headless():
+    """
+    Check that every headless match is played until a side reaches
+    WINNING_SCORE and the rates are reported.
+    """
+    stats = run_headless(2, seed=0)
+    assert (stats["finished"], stats["abandoned"]) == (2, 0)
+    assert stats["steps"] > 0
+    assert stats["points"] >= 2 * WINNING_SCORE
+    assert stats["matches_per_sec"] > 0
+    assert stats["steps_per_sec"] > 0
+
+
+# Checks that a match stops at the step limit.
+def test_run_headless_step_limit():
+    """
+    Check that a match is abandoned once it reaches max_steps, and isn't
+    counted as finished.
+    """
+    stats = run_headless(1, max_steps=10)
+    assert stats["steps"] == 10
+    assert (stats["finished"], stats["abandoned"]) == (0, 1)
+    assert stats["matches_per_sec"] == 0
+
+
+def click(pos, button=1):
+    """
+    Helper function for creating a mouse click event.
+
+    Args:
+        pos: a tuple of the x and y coordinates clicked.
+        button: an int representing the mouse button pressed.
+
+    Returns:
+        pygame.event.Event: A MOUSEBUTTONDOWN event.
+    """
+    return pygame.event.Event(
+        pygame.MOUSEBUTTONDOWN, {"button": button, "pos": pos}
+    )
+
+
+# Checks that clicking play on the start screen starts the game.
+def test_idle_transition_start():
+    """
+    Check that only a left click on the play button leaves the start screen.
+    """
+    model = Model(800, 600)
+    buttons = {"play": pygame.Rect(100, 100, 50, 50)}
+    assert idle_transition(START, click((110, 110)), buttons, model) == PLAYING
+    assert idle_transition(START, click((10, 10)), buttons, model) == START
+    right_click = click((110, 110), 3)
+    assert idle_transition(START, right_click, buttons, model) == START
+    quit_event = pygame.event.Event(pygame.QUIT)
+    assert idle_transition(START, quit_event, buttons, model) == QUIT
+
+
+# Checks that the end screen buttons restart or quit the game.
+def test_idle_transition_end():
+    """
+    Check that play again resets the scores and exit quits.
+    """
+    model = Model(800, 600)
+    model.cpu_score = 5
+    buttons = {
+        "play_again": pygame.Rect(100, 100, 50, 50),
+        "exit": pygame.Rect(100, 0, 50, 50),
+    }
+    assert idle_transition(END, click((110, 10)), buttons, model) == QUIT
+    assert idle_transition(END, click((110, 110)), buttons, model) == PLAYING
+    assert model.cpu_score == 0
+
+
+# Checks that the game's end screen can be left without exiting.
+@pytest.mark.parametrize(
+    "button, state", [("play_again", PLAYING), ("exit", QUIT)]
+)
+def test_idle_frame_end_screen(button, state):
+    """
+    Check that clicking an end screen button moves the game to the screen
+    it leads to, leaving it to the caller to exit, as netplay needs.
+
+    Args:
+        button: the name of the end screen button clicked.
+        state: the screen the click should lead to.
+    """
+    pygame.display.init()
+    pygame.font.init()
+    game = Game(pygame.display.set_mode((800, 600)))
+    game.model.cpu_score = WINNING_SCORE
+    play_again_button, exit_button = game.view.end_screen(game.model)
+    buttons = {"play_again": play_again_button, "exit": exit_button}
+    game.state = END
+    pygame.event.clear()
+    pygame.event.post(click(buttons[button].center))
+    game.idle_frame()
+    assert game.state == state
+    assert game.first_frame_ms is None
@@ -0,0 +1,137 @@
+"""
+This is where we test the asset manager to ensure images are loaded once,
+cached on disk between launches and packed into atlases without overlaps.
+"""
+
+import os
+import pygame
+import pytest
+from pong_assets import AssetManager, Atlas
+
+pygame.init()
+
+
+# Checks that an image is decoded once and its surface shared.
+def test_image_shared(tmp_path):
+    """
+    Test that asking for the same image and size twice decodes it once and
+    returns the same surface, scaled to the size asked for.
+
+    Args:
+        tmp_path: a temporary directory to cache images in.
+    """
+    assets = AssetManager(str(tmp_path))
+    image = assets.image("tennis_racket.png", (40, 100))
+    assert image.get_size() == (40, 100)
+    assert assets.image("tennis_racket.png", (40, 100)) is image
+    assert assets.decoded == 1
+    assert assets.image("tennis_racket.png", (20, 50)).get_size() == (20, 50)
+    assert assets.decoded == 2
+
+
+# Checks that a manager only caches on disk when given a directory.
+def test_memory_only_by_default(monkeypatch):
+    """
+    Test that a manager made without a cache directory decodes images
+    without reading or writing any cache file.
+
+    Args:
+        monkeypatch: pytest's fixture for replacing attributes.
+    """
+    monkeypatch.setattr(
+        "pong_assets.write_cached", lambda *args: pytest.fail("cached")
+    )
+    assets = AssetManager()
+    assert assets.cache_dir is None
+    assert assets.image("tennis_racket.png", (40, 100)).get_size() == (40, 100)
+    assert (assets.decoded, assets.cache_hits) == (1, 0)
+
+
+# Checks that a later launch reads scaled images from the disk cache.
+def test_disk_cache(tmp_path):
+    """
+    Test that a new manager reads an image cached by an earlier one instead
+    of decoding it, with the same pixels, and decodes it again if the cache
+    file is damaged.
+
+    Args:
+        tmp_path: a temporary directory to cache images in.
+    """
+    first = AssetManager(str(tmp_path))
+    image = first.image("tennis_racket.png", (40, 100), convert=False)
+    cache_path = first.cache_path("tennis_racket.png", (40, 100))
+    assert os.path.exists(cache_path)
+
+    second = AssetManager(str(tmp_path))
+    cached = second.image("tennis_racket.png", (40, 100), convert=False)
+    assert (second.decoded, second.cache_hits) == (0, 1)
+    assert pygame.image.tobytes(cached, "RGBA") == pygame.image.tobytes(
+        image, "RGBA"
+    )
+
+    with open(cache_path, "r+b") as cache_file:
+        cache_file.truncate(100)
+    third = AssetManager(str(tmp_path))
+    third.image("tennis_racket.png", (40, 100), convert=False)
+    assert (third.decoded, third.cache_hits) == (1, 0)
+
+
+# Checks that the cache is keyed by the image's contents.
+def test_cache_keyed_by_contents(tmp_path):
+    """
+    Test that two files with the same contents share a cache entry, and
+    that changing a file gives it a new one.
+
+    Args:
+        tmp_path: a temporary directory for images and the cache.
+    """
+    assets = AssetManager(str(tmp_path / "cache"))
+    first = tmp_path / "first.png"
+    second = tmp_path / "second.png"
+    with open("tennis_racket.png", "rb") as image_file:
+        first.write_bytes(image_file.read())
+    second.write_bytes(first.read_bytes())
+    assert assets.cache_path(str(first), (40, 100)) == assets.cache_path(
+        str(second), (40, 100)
+    )
+    pygame.image.save(pygame.Surface((4, 4)), str(second))
+    assert assets.cache_path(str(first), (40, 100)) != assets.cache_path(
+        str(second), (40, 100)
+    )
+
+
+# Checks that sprites are packed into an atlas without overlapping.
+def test_atlas():
+    """
+    Test that every sprite is placed inside the atlas, none overlap, a new
+    row is started when the width runs out, and each is drawn from it with
+    its own pixels.
+    """
+    colors = ["red", "green", "blue", "yellow"]
+    sprites = {}
+    for index, color in enumerate(colors):
+        sprite = pygame.Surface((30 + 10 * index, 20 + 5 * index))
+        sprite.fill(color)
+        sprites[color] = sprite
+    atlas = Atlas(sprites, width=100)
+    bounds = atlas.surface.get_rect()
+    rects = list(atlas.rects.values())
+    for index, rect in enumerate(rects):
+        assert bounds.contains(rect)
+        assert rect.collidelist(rects[index + 1 :]) == -1
+    assert len({rect.y for rect in rects}) > 1
+
+    target = pygame.Surface((100, 100))
+    for color in colors:
+        atlas.blit(target, color, (10, 10))
+        assert target.get_at((10, 10)) == pygame.Color(color)
+        assert target.get_at((9, 9)) != pygame.Color(color)
+
+
+# Checks that an atlas needs at least one sprite.
+def test_atlas_empty():
+    """
+    Test that packing no sprites raises a ValueError.
+    """
+    with pytest.raises(ValueError):
+        Atlas({})
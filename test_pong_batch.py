@@ -0,0 +1,127 @@
+"""
+This is where we test the batch simulation to ensure it plays out every
+match exactly like the single-match model.
+"""
+
+import random
+import numpy as np
+import pytest
+from pong_batch import BatchModel
+from pong_model import Model
+
+
+def make_models(seeds, width, height):
+    """
+    Helper function for creating one Model per seed.
+
+    Args:
+        seeds: a list of ints used to seed each model.
+        width: an int representing the width of the game screen.
+        height: an int representing the height of the game screen.
+
+    Returns:
+        list: Model instances, one per seed.
+    """
+    return [Model(width, height, seed) for seed in seeds]
+
+
+def assert_same_state(batch, models):
+    """
+    Check that every match in the batch matches its Model.
+
+    Args:
+        batch: an instance of the BatchModel class.
+        models: a list of Model instances, one per match.
+    """
+    for index, model in enumerate(models):
+        assert batch.ball_x[index] == model.ball.rect.x
+        assert batch.ball_y[index] == model.ball.rect.y
+        assert batch.speed_x[index] == model.ball.speed_x
+        assert batch.speed_y[index] == model.ball.speed_y
+        assert batch.cpu_y[index] == model.cpu.rect.y
+        assert batch.player_y[index] == model.player.rect.y
+        assert batch.cpu_score[index] == model.cpu_score
+        assert batch.player_score[index] == model.player_score
+
+
+# Checks that a new batch starts like new models.
+def test_batch_init():
+    """
+    Check that each match starts in the same state as a seeded Model.
+    """
+    seeds = [1, 2, 3, 4]
+    batch = BatchModel(len(seeds), 1200, 675, seeds)
+    assert_same_state(batch, make_models(seeds, 1200, 675))
+
+
+# Checks that the batch needs one seed per match.
+def test_batch_seed_count():
+    """
+    Check that a mismatched number of seeds is rejected.
+    """
+    with pytest.raises(ValueError):
+        BatchModel(3, 800, 600, [1, 2])
+
+
+# Checks that many frames of play match Model frame by frame.
+@pytest.mark.parametrize("width, height", [(1200, 675), (800, 600)])
+def test_batch_matches_model(width, height):
+    """
+    Check that stepping the batch gives the same results as stepping one
+    Model per match, including hits, scoring and resets.
+
+    Args:
+        width: an int representing the width of the game screen.
+        height: an int representing the height of the game screen.
+    """
+    seeds = list(range(16))
+    inputs = random.Random(99)
+    speeds = np.array(
+        [[inputs.choice([-6, 0, 6]) for _ in seeds] for _ in range(3000)]
+    )
+    batch = BatchModel(len(seeds), width, height, seeds)
+    models = make_models(seeds, width, height)
+    for frame_speeds in speeds:
+        batch.step(frame_speeds)
+        for model, speed in zip(models, frame_speeds):
+            model.move_objects()
+            model.move_player(int(speed))
+            model.move_cpu()
+    assert_same_state(batch, models)
+    # Make sure the run actually exercised scoring.
+    assert batch.cpu_score.sum() + batch.player_score.sum() > 0
+
+
+# Checks that the player rackets stay on the screen.
+def test_batch_move_player_bounds():
+    """
+    Check that player rackets are clamped to the screen like in Model.
+    """
+    batch = BatchModel(2, 800, 600, [0, 1])
+    batch.move_player(np.array([-1000, 1000]))
+    assert list(batch.player_y) == [0, 500]
+
+
+# Checks that fast balls are swept the same way as in Model.
+def test_batch_fast_balls_match_model():
+    """
+    Check that balls moving several racket widths per step bounce exactly
+    like they do in Model.
+    """
+    seeds = list(range(8))
+    batch = BatchModel(len(seeds), 800, 600, seeds)
+    batch.speed_x *= 9
+    batch.speed_y *= 3
+    for _ in range(500):
+        batch.step(0)
+        batch.player_y = batch.ball_y - 40
+    models = make_models(seeds, 800, 600)
+    for model in models:
+        model.ball.speed_x *= 9
+        model.ball.speed_y *= 3
+        for _ in range(500):
+            model.move_objects()
+            model.move_player(0)
+            model.move_cpu()
+            model.player.rect.y = model.ball.rect.y - 40
+    assert_same_state(batch, models)
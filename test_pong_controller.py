@@ -0,0 +1,75 @@
+"""
+This is where we test the controllers to ensure the player's racket is
+moved in the right direction.
+"""
+
+import pygame
+import pytest
+from pong_controller import Controller, TrackingController
+from pong_model import Model
+
+
+@pytest.fixture
+def model():
+    """
+    Helper function for creating an instance of a model.
+
+    Returns:
+        Model: An instance of the game model class.
+    """
+    return Model(800, 600)
+
+
+# Checks that the tracking controller moves toward a ball above the racket.
+def test_tracking_controller_up(model):
+    """
+    Check that the racket is moved up when the ball is above it.
+
+    Args:
+        model: an instance of the game model class.
+    """
+    model.player.rect.y = 300
+    model.ball.rect.y = 100
+    assert TrackingController(model).handle_events() == -6
+
+
+# Checks that the tracking controller moves toward a ball below the racket.
+def test_tracking_controller_down(model):
+    """
+    Check that the racket is moved down when the ball is below it.
+
+    Args:
+        model: an instance of the game model class.
+    """
+    model.player.rect.y = 100
+    model.ball.rect.y = 500
+    assert TrackingController(model).handle_events() == 6
+
+
+# Checks that the tracking controller holds still when level with the ball.
+def test_tracking_controller_level(model):
+    """
+    Check that the racket stays put when it is level with the ball.
+
+    Args:
+        model: an instance of the game model class.
+    """
+    model.player.rect.centery = model.ball.rect.centery
+    assert TrackingController(model).handle_events() == 0
+
+
+# Checks that the keyboard controller reports which keys were pressed.
+def test_controller_pressed_keys():
+    """
+    Check that keys pressed since the last call are listed, and the list is
+    emptied on the next call.
+    """
+    pygame.init()
+    pygame.display.set_mode((100, 100))
+    controller = Controller()
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_F3))
+    controller.handle_events()
+    assert controller.pressed == [pygame.K_F3]
+    controller.handle_events()
+    assert controller.pressed == []
+
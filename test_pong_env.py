@@ -0,0 +1,126 @@
+"""
+This is where we test the reinforcement learning environments to ensure
+they follow the game, reward points and reuse their arrays.
+"""
+
+import random
+import numpy as np
+from pong_env import PongEnv, VectorPongEnv
+from pong_model import MAX_SEED
+
+
+# Checks that reset and step reuse the same observation array.
+def test_env_reuses_observation():
+    """
+    Check that every reset and step returns the same observation array.
+    """
+    env = PongEnv(seed=1, screen_width=800, screen_height=600)
+    observation, _ = env.reset()
+    buffer = observation
+    for _ in range(10):
+        observation, *_ = env.step(0)
+        assert observation is buffer
+    assert env.reset()[0] is buffer
+
+
+# Checks that the action moves the player's racket.
+def test_env_step_moves_player():
+    """
+    Check that the down action moves the player's racket 6 pixels down and
+    the observation reports the new position.
+    """
+    env = PongEnv(seed=1, screen_width=800, screen_height=600)
+    env.reset()
+    player_y = env.model.player.rect.y
+    observation, *_ = env.step(2)
+    assert env.model.player.rect.y == player_y + 6
+    assert observation[4] == np.float32((player_y + 6) / 600)
+
+
+# Checks that an episode is rewarded and ends with the match.
+def test_env_episode_rewards():
+    """
+    Check that an agent that never moves loses every point for -1 each,
+    and the episode terminates when the CPU wins.
+    """
+    env = PongEnv(seed=2, screen_width=800, screen_height=600)
+    env.reset()
+    total = 0.0
+    terminated = truncated = False
+    while not (terminated or truncated):
+        _, reward, terminated, truncated, _ = env.step(0)
+        total += reward
+    assert terminated
+    assert total == -env.model.cpu_score + env.model.player_score
+
+
+# Checks that the vector environment matches single environments.
+def test_vector_env_matches_single():
+    """
+    Check that every match of the vector environment observes the same
+    states as a single environment seeded the same way, with the vector
+    environment's arrays reused on every step.
+    """
+    count = 3
+    vector = VectorPongEnv(count, seed=5, screen_width=800, screen_height=600)
+    rng = random.Random(5)
+    singles = []
+    for _ in range(count):
+        env = PongEnv(screen_width=800, screen_height=600)
+        env.reset(seed=rng.randrange(MAX_SEED))
+        singles.append(env)
+    observations, infos = vector.reset()
+    assert infos == {}
+    buffers = (vector.observations, vector.rewards, vector.terminated)
+    actions = np.array([0, 1, 2])
+    for _ in range(300):
+        observations, rewards, terminated, *_ = vector.step(actions)
+        for index, env in enumerate(singles):
+            observation, reward, *_ = env.step(actions[index])
+            np.testing.assert_array_equal(observations[index], observation)
+            assert rewards[index] == reward
+    assert observations is buffers[0]
+    assert rewards is buffers[1]
+    assert terminated is buffers[2]
+
+
+# Checks that each reset plays new episodes unless given a seed.
+def test_vector_env_reset_seeds():
+    """
+    Check that resetting the vector environment again starts different
+    matches, and that resetting it with its first seed starts the first
+    ones over.
+    """
+    vector = VectorPongEnv(4, seed=5, screen_width=800, screen_height=600)
+    actions = np.zeros(4, dtype=np.int64)
+
+    def play():
+        for _ in range(60):
+            vector.step(actions)
+        return vector.observations.copy()
+
+    vector.reset()
+    first = play()
+    vector.reset()
+    assert not np.array_equal(play(), first)
+    vector.reset(seed=5)
+    np.testing.assert_array_equal(play(), first)
+
+
+# Checks that finished episodes restart on their own.
+def test_vector_env_auto_reset():
+    """
+    Check that an episode cut short at max_steps is flagged as truncated
+    and starts over on the same call.
+    """
+    vector = VectorPongEnv(2, seed=1, max_steps=5)
+    vector.reset()
+    actions = np.zeros(2, dtype=np.int64)
+    for _ in range(4):
+        _, _, _, truncated, _ = vector.step(actions)
+        assert not truncated.any()
+    _, _, _, truncated, infos = vector.step(actions)
+    assert infos == {}
+    assert truncated.all()
+    assert (vector.steps == 0).all()
+    assert (vector.model.cpu_score == 0).all()
@@ -0,0 +1,183 @@
+"""
+This is where we test the event-driven simulator to ensure it jumps between
+events correctly and plays matches like the frame-by-frame model.
+"""
+
+import pytest
+from pong_controller import TrackingController
+from pong_events import EventSimulator, ScriptedMotion, TrackingMotion
+from pong_model import Model
+
+
+def step_tracking(racket_y, ball_y, ball_speed_y, count, speed, limit=None):
+    """
+    Helper function that moves a racket toward the ball one frame at a
+    time, as Model.move_cpu and TrackingController do.
+
+    Args:
+        racket_y: the top of the racket.
+        ball_y: the top of the ball at the end of the first frame.
+        ball_speed_y: the vertical speed of the ball.
+        count: the number of frames to move for.
+        speed: the racket's step per frame.
+        limit: the lowest top of a racket kept on the screen, or None.
+
+    Returns:
+        float: The top of the racket after count frames.
+    """
+    for frame in range(count):
+        ball_center = ball_y + ball_speed_y * frame + 10
+        if ball_center < racket_y + 50:
+            racket_y -= speed
+        elif ball_center > racket_y + 50:
+            racket_y += speed
+        if limit is not None:
+            racket_y = min(max(racket_y, 0), limit)
+    return racket_y
+
+
+# Checks that a tracking racket ends up where stepping it would leave it.
+@pytest.mark.parametrize(
+    "racket_y, ball_y, ball_speed_y, speed",
+    [
+        (287.5, 40, 6, 5.5),
+        (287.5, 600, -6, 5.5),
+        (0, 300, 6, 6),
+        (500, 10, -6, 6),
+        (200, 260, 2, 6),
+        (200, 240, -2, 6),
+    ],
+)
+@pytest.mark.parametrize("clamp", [False, True])
+def test_tracking_motion_matches_stepping(
+    racket_y, ball_y, ball_speed_y, speed, clamp
+):
+    """
+    Check that a racket that chases, falls behind, overshoots or pins
+    itself against the edge of the screen ends up where stepping it frame
+    by frame does.
+
+    Args:
+        racket_y: the top of the racket.
+        ball_y: the top of the ball at the end of the first frame.
+        ball_speed_y: the vertical speed of the ball.
+        speed: the racket's step per frame.
+        clamp: whether the racket is kept on the screen.
+    """
+    motion = TrackingMotion(speed, clamp=clamp)
+    limit = 575 if clamp else None
+    for count in (1, 7, 40, 120):
+        assert motion.advance(
+            racket_y, ball_y, ball_speed_y, 0, count, 575
+        ) == pytest.approx(
+            step_tracking(
+                racket_y, ball_y, ball_speed_y, count, speed, limit
+            )
+        )
+
+
+# Checks that a scripted racket follows its timeline of inputs.
+def test_scripted_motion():
+    """
+    Check that inputs take effect at their frames, including part way
+    through the frames being advanced.
+    """
+    motion = ScriptedMotion([(10, 6), (20, -6), (25, 0)])
+    assert motion.advance(100, 0, 0, 0, 10, 500) == 100
+    assert motion.advance(100, 0, 0, 5, 10, 500) == 130
+    assert motion.advance(100, 0, 0, 0, 40, 500) == 100 + 60 - 30
+
+
+# Checks that a scripted racket stops at the wall before turning back.
+def test_scripted_motion_clamped_mid_span():
+    """
+    Check that a scripted racket that runs into the top of the screen part
+    way through the frames being advanced and then turns back ends up where
+    Model.move_player leaves it.
+    """
+    motion = ScriptedMotion([(0, -6), (60, 6)])
+    model = Model(800, 600)
+    model.player.rect.y = 100
+    for frame in range(90):
+        model.move_player(motion.speed_at(frame))
+    assert model.player.rect.y == 180
+    assert motion.advance(100, 0, 0, 0, 90, 500) == 180
+
+
+# Checks that a ball nobody can reach scores at the predicted time.
+def test_point_without_rackets():
+    """
+    Check that a ball the rackets never reach scores after crossing half
+    the court, with wall bounces along the way.
+    """
+    away = ScriptedMotion([(0, -1000)])
+    sim = EventSimulator(800, 600, seed=1, cpu_motion=away, player_motion=away)
+    sim.ball_y = 300
+    sim.speed_x = 6
+    sim.speed_y = 6
+    kinds = []
+    while sim.cpu_score == 0:
+        kinds.append(sim.step())
+    assert kinds[-1] == "point"
+    assert "wall" in kinds
+    assert sim.contacts == 0
+    assert sim.time == pytest.approx((780 - 390) / 6)
+
+
+# Checks that full matches between the default rackets are played out.
+def test_run_match():
+    """
+    Check that a match between the default rackets reaches a winner and
+    costs far fewer events than frames.
+    """
+    result = EventSimulator(1200, 675, seed=3).run()
+    assert max(result["cpu_score"], result["player_score"]) == 5
+    # Late rallies speed up until the ball crosses in a few frames, so
+    # most of a match's events come at its end
+    assert result["events"] < result["frames"] / 10
+
+
+# Checks that a match stops once it has run for the frames allowed.
+def test_run_max_frames():
+    """
+    Check that run stops soon after max_frames even if nobody has won.
+    """
+    sim = EventSimulator(1200, 675, seed=3)
+    result = sim.run(max_frames=1000)
+    assert not sim.game_over()
+    assert 1000 <= result["frames"] < 1200
+
+
+# Checks that whole matches play out like the frame-by-frame model.
+@pytest.mark.parametrize("seed", [0, 1])
+def test_matches_stepping(seed):
+    """
+    Check that every point of a match between the default rackets goes to
+    the same side on the same frame as in a stepped Model seeded the same
+    way, with the CPU's built-in rule and a TrackingController.
+
+    Args:
+        seed: an int used to seed both simulations.
+    """
+    sim = EventSimulator(1200, 675, seed=seed)
+    sim_points = []
+    while not sim.game_over():
+        if sim.step() == "point":
+            sim_points.append((sim.time, sim.cpu_score, sim.player_score))
+
+    model = Model(1200, 675, seed)
+    player = TrackingController(model)
+    model_points = []
+    frames = 0
+    while not model.game_over():
+        scores = (model.cpu_score, model.player_score)
+        model.move_objects()
+        model.move_player(player.handle_events())
+        model.move_cpu()
+        frames += 1
+        if (model.cpu_score, model.player_score) != scores:
+            model_points.append(
+                (frames, model.cpu_score, model.player_score)
+            )
+
+    assert sim_points == model_points
@@ -3,9 +3,22 @@ This is where we test the model part of the game to
 ensure everything is functioning correctly.
 """
 
+import random
+import subprocess
+import sys
 import pygame
 import pytest
-from pong_model import Ball, Racket, Model
+from pong_model import (
+    MAX_BALL_SPEED,
+    SNAPSHOT_SIZE,
+    SPEED_Y_GAIN,
+    WINNING_SCORE,
+    Ball,
+    Box,
+    Model,
+    Racket,
+    predict_crossing,
+)
 
 pygame.init()
 
@@ -432,3 +445,352 @@ def test_cpu_racket_move_down(model):
     model.move_cpu()
     # Assert that the CPU racket moves downwards
     assert cpu.rect.y > 300
+
+
+# Checks that the game is over once a side reaches the winning score.
+def test_game_over(model):
+    """
+    Test that game_over reports a winner only at the winning score.
+
+    Args:
+        model: an instance of the game model class.
+    """
+    assert not model.game_over()
+    model.cpu_score = WINNING_SCORE - 1
+    assert not model.game_over()
+    model.player_score = WINNING_SCORE
+    assert model.game_over()
+
+
+# Checks that positions reports the top-left corner of every object.
+def test_model_positions(model):
+    """
+    Test that positions matches the rectangles of the ball and rackets.
+
+    Args:
+        model: an instance of the game model class.
+    """
+    positions = model.positions()
+    assert positions["ball"] == (model.ball.rect.x, model.ball.rect.y)
+    assert positions["player"] == (model.player.rect.x, model.player.rect.y)
+    assert positions["cpu"] == (model.cpu.rect.x, model.cpu.rect.y)
+
+
+# Checks that a very fast ball cannot pass through a racket.
+def test_fast_ball_hits_racket(model):
+    """
+    Test that a ball moving far more than a racket's width in one step
+    still bounces off the racket at the point of impact.
+
+    Args:
+        model: an instance of the game model class.
+    """
+    ball = model.ball
+    model.cpu.rect.y = 250
+    ball.rect.topleft = (100, 290)
+    ball.speed_x = -150
+    ball.speed_y = 0
+    model.move_objects()
+    # The ball hits the racket face at x=20 and travels back out, slowed
+    # to the speed limit
+    assert ball.speed_x == MAX_BALL_SPEED
+    assert ball.rect.x == pytest.approx(25.6)
+    assert model.player_score == 0
+
+
+# Checks that a ball leaving a racket is not bounced back into it.
+def test_no_double_bounce(model):
+    """
+    Test that a ball overlapping a racket while moving away from it keeps
+    its direction.
+
+    Args:
+        model: an instance of the game model class.
+    """
+    ball = model.ball
+    model.player.rect.y = 250
+    ball.rect.topleft = (model.player.rect.left - 10, 290)
+    ball.speed_x = -6
+    ball.speed_y = 0
+    model.move_objects()
+    assert ball.speed_x == -6
+
+
+# Checks that the ball reflects off a wall at the point of impact.
+def test_wall_bounce_reflects(model):
+    """
+    Test that the ball bounces off the top wall within the step instead of
+    moving past it.
+
+    Args:
+        model: an instance of the game model class.
+    """
+    ball = model.ball
+    ball.rect.topleft = (300, 4)
+    ball.speed_x = 6
+    ball.speed_y = -10
+    model.move_objects()
+    assert ball.speed_y == 10
+    assert ball.rect.y == 6
+    assert ball.rect.x == 306
+
+
+# Checks that a crossing with no wall bounces is a straight line.
+def test_predict_crossing_straight(model):
+    """
+    Test that the prediction for a nearby crossing follows the ball's path.
+
+    Args:
+        model: an instance of the game model class.
+    """
+    ball = model.ball
+    ball.rect.topleft = (400, 300)
+    ball.speed_x = 6
+    ball.speed_y = -6
+    assert predict_crossing(ball, 460) == (10, 240, -6)
+    # The ball is moving away from anything on its left
+    assert predict_crossing(ball, 100) is None
+
+
+# Checks the prediction against stepping the game through several bounces.
+def test_predict_crossing_matches_stepping(model):
+    """
+    Test that the predicted crossing matches where move_objects takes the
+    ball after bouncing off both walls several times.
+
+    Args:
+        model: an instance of the game model class.
+    """
+    ball = model.ball
+    # Keep the rackets out of the way
+    model.cpu.rect.y = -1000
+    model.player.rect.y = -1000
+    ball.rect.topleft = (30, 100)
+    ball.speed_x = 1
+    ball.speed_y = 6
+    time, y_coordinate, speed_y = predict_crossing(ball, 770)
+    for _ in range(int(time)):
+        model.move_objects()
+    assert ball.rect.x == 770
+    assert ball.rect.y == y_coordinate
+    assert ball.speed_y == speed_y
+
+
+# Checks the prediction for a serve that starts below the bottom wall.
+@pytest.mark.parametrize("start_speed_y", [6, -6])
+def test_predict_crossing_serve_near_bottom(model, start_speed_y):
+    """
+    Test that the predicted crossing matches stepping the game when the
+    ball starts lower than it can bounce, as a serve near the bottom can.
+
+    Args:
+        model: an instance of the game model class.
+        start_speed_y: the vertical speed the ball starts with.
+    """
+    ball = model.ball
+    model.cpu.rect.y = -1000
+    model.player.rect.y = -1000
+    # Serves reach 10 pixels from the bottom, past where a 20 pixel ball
+    # touches the wall
+    ball.speed_x = 1
+    for target in (31, 32, 200, 770):
+        ball.rect.topleft = (30, 590)
+        ball.speed_y = start_speed_y
+        time, y_coordinate, speed_y = predict_crossing(ball, target)
+        for _ in range(int(time)):
+            model.move_objects()
+        assert ball.rect.x == target
+        assert ball.rect.y == pytest.approx(y_coordinate)
+        assert ball.speed_y == speed_y
+
+
+# Checks that models with the same seed play out the same way.
+def test_model_seed():
+    """
+    Test that two models with the same seed reset the ball identically,
+    without being affected by each other or by the random module.
+    """
+    first = Model(800, 600, seed=42)
+    second = Model(800, 600, seed=42)
+    assert first.seed == 42
+    for _ in range(5):
+        first.ball.reset()
+        random.random()
+        second.ball.reset()
+        assert first.ball.rect.y == second.ball.rect.y
+        assert first.ball.speed_x == second.ball.speed_x
+        assert first.ball.speed_y == second.ball.speed_y
+
+
+# Checks that an unseeded model still knows its seed.
+def test_model_random_seed():
+    """
+    Test that a model without a seed picks one that reproduces it.
+    """
+    model = Model(800, 600)
+    copy = Model(800, 600, seed=model.seed)
+    assert copy.ball.rect.y == model.ball.rect.y
+
+
+def play_steps(model, steps):
+    """
+    Helper function for stepping a model with a fixed pattern of input.
+
+    Args:
+        model: an instance of the game model class.
+        steps: an int representing the number of steps to play.
+
+    Returns:
+        tuple: The ball rect, ball speeds, racket rects and scores after
+        the last step.
+    """
+    for frame in range(steps):
+        model.move_objects()
+        model.move_player(6 if frame % 120 < 60 else -6)
+        model.move_cpu()
+    return (
+        tuple(model.ball.rect),
+        model.ball.speed_x,
+        model.ball.speed_y,
+        tuple(model.player.rect),
+        tuple(model.cpu.rect),
+        model.cpu_score,
+        model.player_score,
+    )
+
+
+# Checks that restoring a snapshot rewinds the whole game.
+def test_snapshot_restore():
+    """
+    Test that a game restored from a snapshot replays exactly as before,
+    including the random ball resets after each point.
+    """
+    model = Model(800, 600, seed=5)
+    play_steps(model, 100)
+    snapshot = model.snapshot()
+    first = play_steps(model, 3000)
+    assert first[5] + first[6] > 0
+    model.restore(snapshot)
+    assert play_steps(model, 3000) == first
+
+
+# Checks that a snapshot can be loaded into another model and reuse memory.
+def test_snapshot_into_buffer():
+    """
+    Test that snapshot packs into a given buffer and that another model
+    restored from it continues identically.
+    """
+    buffer = bytearray(SNAPSHOT_SIZE)
+    model = Model(800, 600, seed=9)
+    play_steps(model, 500)
+    view = model.snapshot(buffer)
+    assert view.obj is buffer
+    assert len(view) == SNAPSHOT_SIZE
+    other = Model(800, 600, seed=1)
+    other.restore(buffer)
+    assert play_steps(other, 2000) == play_steps(model, 2000)
+
+
+# Checks that a remotely controlled CPU racket stays on the screen.
+def test_model_move_opponent(model):
+    """
+    Test that move_opponent moves the CPU racket and clamps it to the screen.
+
+    Args:
+        model: an instance of the game model class.
+    """
+    cpu = model.cpu
+    cpu.rect.y = 100
+    model.move_opponent(6)
+    assert cpu.rect.y == 106
+    model.move_opponent(-1000)
+    assert cpu.rect.y == 0
+    model.move_opponent(1000)
+    assert cpu.rect.y == 500
+
+
+# Checks that the CPU racket moves by its exact speed, without rounding.
+def test_cpu_racket_fractional_steps(model):
+    """
+    Test that the CPU racket keeps the half pixels of its 5.5 pixel steps.
+
+    Args:
+        model: an instance of the game model class.
+    """
+    model.cpu.rect.y = 300
+    model.ball.rect.y = 100
+    model.move_cpu()
+    model.move_cpu()
+    assert model.cpu.rect.y == 289
+    model.ball.rect.y = 500
+    model.move_cpu()
+    assert model.cpu.rect.y == 294.5
+
+
+# Checks that the ball stops speeding up once it is very fast.
+def test_ball_speed_limit(model):
+    """
+    Test that bouncing off a racket speeds the ball up along both axes, but
+    never past MAX_BALL_SPEED.
+
+    Args:
+        model: an instance of the game model class.
+    """
+    ball = model.ball
+    ball.speed_x = -6
+    ball.speed_y = -6
+    ball.bounce_horizontal()
+    assert ball.speed_x == pytest.approx(6.012)
+    assert ball.speed_y == -6 - SPEED_Y_GAIN
+    ball.speed_x = -11.99
+    ball.speed_y = MAX_BALL_SPEED - SPEED_Y_GAIN / 2
+    ball.bounce_horizontal()
+    assert (ball.speed_x, ball.speed_y) == (MAX_BALL_SPEED, MAX_BALL_SPEED)
+    ball.bounce_horizontal()
+    assert (ball.speed_x, ball.speed_y) == (-MAX_BALL_SPEED, MAX_BALL_SPEED)
+
+
+# Checks that boxes work like pygame.Rect but keep floats.
+def test_box():
+    """
+    Test that a Box has pygame.Rect's edges and centers, keeps fractional
+    positions and has no per-instance dict.
+    """
+    box = Box(10, 20.5, 20, 100)
+    assert (box.left, box.right, box.top, box.bottom) == (10, 30, 20.5, 120.5)
+    assert box.center == (20, 70.5)
+    box.bottom = 100.5
+    box.centerx = 50
+    assert tuple(box) == (40, 0.5, 20, 100)
+    assert box == (40, 0.5, 20, 100)
+    assert box != Box(40, 1, 20, 100)
+    for item in (box, Ball(800, 600), Racket(0, 0)):
+        assert not hasattr(item, "__dict__")
+
+
+# Checks that the model runs the same in a new process, without pygame.
+def test_model_in_new_process():
+    """
+    Test that importing the model doesn't load pygame and that a match
+    played in a new process ends in exactly the same state.
+    """
+    script = (
+        "import sys\n"
+        "from pong_model import Model\n"
+        "model = Model(800, 600, seed=11)\n"
+        "for frame in range(5000):\n"
+        "    model.move_objects()\n"
+        "    model.move_player(6 if frame % 120 < 60 else -6)\n"
+        "    model.move_cpu()\n"
+        "assert 'pygame' not in sys.modules\n"
+        "print(model.snapshot().hex())\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    model = Model(800, 600, seed=11)
+    play_steps(model, 5000)
+    assert output.strip() == model.snapshot().hex()
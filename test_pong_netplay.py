@@ -0,0 +1,299 @@
+"""
+This is where we test netplay to ensure both peers end up in the same state
+however late the other side's inputs arrive.
+"""
+
+import asyncio
+import random
+import socket
+import pytest
+from pong_model import Model
+from pong_netplay import (
+    GUEST,
+    HOST,
+    ROLLBACK_WINDOW,
+    NetplayProtocol,
+    RollbackSession,
+    run_peer,
+)
+
+
+def free_port():
+    """
+    Helper function for finding a UDP port nothing is listening on.
+
+    Returns:
+        int: A free port on the loopback address.
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def scripted_inputs(seed, frames):
+    """
+    Helper function for making a list of inputs that change now and then.
+
+    Args:
+        seed: an int used to seed the random inputs.
+        frames: an int representing the number of inputs to make.
+
+    Returns:
+        list: The speed_y input of every frame.
+    """
+    rng = random.Random(seed)
+    inputs = []
+    while len(inputs) < frames:
+        inputs += [rng.choice([-6, 0, 6])] * rng.randint(1, 20)
+    return inputs[:frames]
+
+
+def reference_model(seed, player_inputs, cpu_inputs, input_delay):
+    """
+    Helper function for playing the inputs of both sides directly, the way
+    netplay should, with every input applied input_delay frames late.
+
+    Args:
+        seed: an int used to seed the model.
+        player_inputs: a list of the host's inputs.
+        cpu_inputs: a list of the guest's inputs.
+        input_delay: an int representing the input delay in frames.
+
+    Returns:
+        Model: The model after every frame.
+    """
+    model = Model(800, 600, seed)
+    player_inputs = [0] * input_delay + player_inputs
+    cpu_inputs = [0] * input_delay + cpu_inputs
+    for frame in range(len(player_inputs) - input_delay):
+        model.move_objects()
+        model.move_player(player_inputs[frame])
+        model.move_opponent(cpu_inputs[frame])
+    return model
+
+
+# Checks that late inputs roll back and resimulate to the right state.
+def test_session_rollback():
+    """
+    Check that when one side's inputs arrive several frames late, that side
+    rolls back, and both sides still finish in the state of the match played
+    directly.
+    """
+    frames = 300
+    delay = 2
+    lag = 6
+    player_inputs = scripted_inputs(1, frames)
+    cpu_inputs = scripted_inputs(2, frames)
+    host = RollbackSession(Model(800, 600, 5), HOST, delay)
+    guest = RollbackSession(Model(800, 600, 5), GUEST, delay)
+    sent = []
+    for frame in range(frames):
+        target = guest.add_local_input(cpu_inputs[frame])
+        sent.append((target, cpu_inputs[frame]))
+        if frame >= lag:
+            host.add_remote_input(*sent[frame - lag])
+        target = host.add_local_input(player_inputs[frame])
+        guest.add_remote_input(target, player_inputs[frame])
+        host.advance()
+        guest.advance()
+    for target, speed_y in sent[frames - lag :]:
+        host.add_remote_input(target, speed_y)
+    host.settle()
+
+    expected = reference_model(5, player_inputs, cpu_inputs, delay)
+    assert host.rollbacks > 0
+    assert host.resimulated_frames >= host.rollbacks
+    assert guest.rollbacks == 0
+    assert bytes(host.model.snapshot()) == bytes(guest.model.snapshot())
+    assert host.model.positions() == expected.positions()
+    assert host.model.ball.speed_x == expected.ball.speed_x
+
+
+# Checks that a correct guess needs no rollback.
+def test_session_correct_guess():
+    """
+    Check that a late input equal to the guessed one causes no rollback.
+    """
+    host = RollbackSession(Model(800, 600, 5), HOST, 2)
+    for _ in range(10):
+        host.add_local_input(0)
+        host.advance()
+    host.add_remote_input(2, 0)
+    host.settle()
+    assert host.rollbacks == 0
+
+
+# Checks that a session stops running ahead of missing inputs.
+def test_session_stalls():
+    """
+    Check that a session refuses to advance once it is a full rollback
+    window past the last input it received.
+    """
+    session = RollbackSession(Model(800, 600, 5), HOST, 2)
+    while session.can_advance():
+        session.add_local_input(6)
+        session.advance()
+    assert session.frame == ROLLBACK_WINDOW + 1
+    session.add_remote_input(2, 0)
+    assert session.can_advance()
+
+
+# Checks that two peers play the same match over loopback UDP.
+def test_loopback_match():
+    """
+    Check that a host and a guest connected over loopback finish a match
+    in exactly the same state.
+    """
+    port = free_port()
+    frames = 120
+    player_inputs = scripted_inputs(3, frames)
+    cpu_inputs = scripted_inputs(4, frames)
+
+    async def play():
+        return await asyncio.gather(
+            run_peer(
+                HOST,
+                ("127.0.0.1", port),
+                None,
+                lambda session: player_inputs[session.frame],
+                frames,
+                (800, 600),
+                tick_rate=500,
+                seed=9,
+            ),
+            run_peer(
+                GUEST,
+                ("127.0.0.1", 0),
+                ("127.0.0.1", port),
+                lambda session: cpu_inputs[session.frame],
+                frames,
+                (800, 600),
+                tick_rate=500,
+            ),
+        )
+
+    host, guest = asyncio.run(play())
+    assert host["frames"] == guest["frames"] == frames
+    assert host["rtt_ms"] is not None
+    assert bytes(host["model"].snapshot()) == bytes(
+        guest["model"].snapshot()
+    )
+    expected = reference_model(9, player_inputs, cpu_inputs, 2)
+    assert host["model"].positions() == expected.positions()
+
+
+# Checks that a networked match ends when a side wins, like a local one.
+def test_loopback_match_ends_at_winner():
+    """
+    Check that both peers stop on the frame in which a side wins, in the
+    same state as the match played directly, well before the frame limit.
+    """
+    port = free_port()
+    frames = 5000
+
+    async def play():
+        return await asyncio.gather(
+            run_peer(
+                HOST,
+                ("127.0.0.1", port),
+                None,
+                lambda session: 0,
+                frames,
+                (800, 600),
+                tick_rate=2000,
+                seed=9,
+            ),
+            run_peer(
+                GUEST,
+                ("127.0.0.1", 0),
+                ("localhost", port),
+                lambda session: 0,
+                frames,
+                (800, 600),
+                tick_rate=2000,
+            ),
+        )
+
+    host, guest = asyncio.run(play())
+    expected = Model(800, 600, 9)
+    played = 0
+    while not expected.game_over():
+        expected.move_objects()
+        expected.move_player(0)
+        expected.move_opponent(0)
+        played += 1
+    assert host["frames"] == guest["frames"] == played < frames
+    assert host["model"].game_over()
+    assert bytes(host["model"].snapshot()) == bytes(expected.snapshot())
+    assert bytes(guest["model"].snapshot()) == bytes(expected.snapshot())
+
+
+# Checks that a peer gives up when nobody joins.
+@pytest.mark.parametrize("side", [HOST, GUEST])
+def test_handshake_timeout(side):
+    """
+    Check that a host nobody joins, and a guest whose host never answers,
+    raise a ConnectionError once the handshake timeout runs out.
+
+    Args:
+        side: the role of the peer left waiting.
+    """
+    port = free_port()
+    local_address = ("127.0.0.1", port if side == HOST else 0)
+    with pytest.raises(ConnectionError):
+        asyncio.run(
+            run_peer(
+                side,
+                local_address,
+                ("127.0.0.1", port),
+                lambda session: 0,
+                100,
+                (800, 600),
+                handshake_timeout=0.3,
+            )
+        )
+
+
+class FakeTransport:
+    """
+    Records the packets a protocol sends instead of sending them.
+
+    Attributes:
+        sent: A list of (data, address) tuples, one per packet.
+    """
+
+    def __init__(self):
+        """
+        Initializes the transport with nothing sent.
+        """
+        self.sent = []
+
+    def sendto(self, data, address):
+        """
+        Records a packet.
+
+        Args:
+            data: the packet as bytes.
+            address: the address it was sent to.
+        """
+        self.sent.append((data, address))
+
+
+# Checks that the host only listens to the first peer to say hello.
+def test_host_locks_peer():
+    """
+    Check that once a guest has said hello, the host ignores hellos and
+    every other packet from any other address.
+    """
+    protocol = NetplayProtocol(HOST, seed=3)
+    protocol.connection_made(FakeTransport())
+    guest = ("127.0.0.1", 4000)
+    intruder = ("127.0.0.1", 5000)
+    protocol.datagram_received(b"H", guest)
+    protocol.datagram_received(b"H", intruder)
+    protocol.datagram_received(b"D", intruder)
+    assert protocol.peer == guest
+    assert not protocol.peer_done
+    assert [address for _, address in protocol.transport.sent] == [guest]
+    protocol.datagram_received(b"D", guest)
+    assert protocol.peer_done
@@ -0,0 +1,80 @@
+"""
+This is where we test off-screen rendering to ensure frames of many matches
+land in one reused array with the right pixels.
+"""
+
+import numpy as np
+import pygame
+from pong_model import Model
+from pong_pixels import PixelRenderer
+from pong_view import View
+
+pygame.init()
+
+
+# Checks that an off-screen view never touches the display.
+def test_view_without_present(monkeypatch):
+    """
+    Check that a view created with present=False draws on its surface
+    without updating the display.
+
+    Args:
+        monkeypatch: pytest's fixture for replacing attributes.
+    """
+    updates = []
+    monkeypatch.setattr(pygame.display, "update", updates.append)
+    surface = pygame.Surface((800, 600))
+    View(surface, present=False).render(Model(800, 600, seed=1))
+    assert not updates
+    assert surface.get_at((0, 0)) == pygame.Color("dark green")
+
+
+# Checks that View.pixels is a view of the screen, not a copy.
+def test_view_pixels_zero_copy():
+    """
+    Check that the array from View.pixels is laid out (height, width, 3)
+    and shares memory with the screen.
+    """
+    surface = pygame.Surface((80, 60))
+    view = View(surface, present=False)
+    pixels = view.pixels()
+    assert pixels.shape == (60, 80, 3)
+    pixels[5, 10] = (1, 2, 3)
+    del pixels
+    assert tuple(surface.get_at((10, 5)))[:3] == (1, 2, 3)
+
+
+# Checks that matches render into their own slots of one array.
+def test_render_many_matches():
+    """
+    Check that each match is drawn into its own frame of the reused array,
+    with its ball where the model says it is.
+    """
+    models = [Model(400, 300, seed=seed) for seed in range(3)]
+    models[0].ball.rect.topleft = (100, 100)
+    models[1].ball.rect.topleft = (200, 200)
+    renderer = PixelRenderer(400, 300, count=3, grayscale=False)
+    frames = renderer.render(models)
+    assert frames is renderer.frames
+    assert frames.shape == (3, 300, 400, 3)
+    green = (0, 255, 0)
+    assert tuple(frames[0, 110, 110]) == green
+    assert tuple(frames[1, 210, 210]) == green
+    assert tuple(frames[1, 110, 110]) != green
+    assert renderer.render(models[:1]) is frames
+
+
+# Checks that downscaled grayscale frames follow the luminance weights.
+def test_render_grayscale_downscaled():
+    """
+    Check that grayscale frames are the weighted sum of the downscaled red,
+    green and blue values.
+    """
+    renderer = PixelRenderer(400, 300, count=2, scale=4)
+    frames = renderer.render([Model(400, 300, seed=1)])
+    assert frames.shape == (2, 75, 100)
+    small = pygame.transform.scale(renderer.surface, (100, 75))
+    rgb = pygame.surfarray.array3d(small).transpose(1, 0, 2)
+    rgb = rgb.astype(np.int64)
+    expected = (rgb[..., 0] * 77 + rgb[..., 1] * 150 + rgb[..., 2] * 29) >> 8
+    np.testing.assert_array_equal(frames[0], expected)
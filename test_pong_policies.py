@@ -0,0 +1,140 @@
+"""
+This is where we test the racket policies to ensure they move the right
+way, plug into the model, and count decisions that go over budget.
+"""
+
+import json
+import time
+import pytest
+from pong_model import Model
+from pong_policies import (
+    POLICIES,
+    LinearPolicy,
+    LookupPolicy,
+    Policy,
+    PredictingPolicy,
+    TrackingPolicy,
+    make_policy,
+)
+
+
+class SlowPolicy(Policy):
+    """
+    A policy that takes longer than any small budget to decide.
+    """
+
+    def decide(self, model, side):
+        """
+        Sleeps briefly, then decides not to move.
+
+        Args:
+            model: an instance of the game model class.
+            side: the racket to move.
+
+        Returns:
+            int: 0.
+        """
+        time.sleep(0.002)
+        return 0
+
+
+# Checks that the "cpu" policy reproduces the built-in CPU rule.
+def test_cpu_policy_matches_move_cpu():
+    """
+    Check that a model moved by the "cpu" policy keeps its racket in the
+    same place as the built-in rule while the racket stays on screen.
+    """
+    built_in = Model(800, 600, seed=4)
+    policy = Model(800, 600, seed=4, cpu_policy=make_policy("cpu"))
+    steps = 0
+    while 0 <= built_in.cpu.rect.top and built_in.cpu.rect.bottom <= 600:
+        assert built_in.positions() == policy.positions()
+        for model in (built_in, policy):
+            model.move_objects()
+            model.move_player(0)
+            model.move_cpu()
+        steps += 1
+    assert steps > 10
+
+
+# Checks that a policy has to implement decide.
+def test_policy_is_abstract():
+    """
+    Check that the Policy base class and a subclass without decide can't be
+    made.
+    """
+
+    class Undecided(Policy):
+        """
+        A policy that forgets to implement decide.
+        """
+
+    with pytest.raises(TypeError):
+        Policy()
+    with pytest.raises(TypeError):
+        Undecided()
+
+
+# Checks that the tracking and predicting policies head the right way.
+def test_policies_move_toward_ball():
+    """
+    Check that the tracking, lookup and linear policies move toward the
+    ball, and the predicting policy toward where it will arrive.
+    """
+    model = Model(800, 600, seed=1)
+    model.ball.rect.y = 50
+    model.cpu.rect.y = 300
+    for policy in (TrackingPolicy(), LookupPolicy(), LinearPolicy()):
+        assert policy(model, "cpu") < 0
+    model.ball.rect.x = 400
+    model.ball.speed_x = 6
+    model.ball.speed_y = 0
+    model.player.rect.y = 10
+    assert PredictingPolicy()(model, "player") == 0
+    model.player.rect.y = 400
+    assert PredictingPolicy()(model, "player") == -6
+
+
+# Checks that decisions over budget are counted.
+def test_policy_overruns():
+    """
+    Check that every decision is timed and slow ones count as overruns.
+    """
+    model = Model(800, 600, seed=1)
+    slow = SlowPolicy(budget=0.001)
+    fast = TrackingPolicy(budget=1.0)
+    for _ in range(3):
+        slow(model, "cpu")
+        fast(model, "cpu")
+    assert slow.overruns == 3
+    assert fast.overruns == 0
+    assert slow.stats()["decisions"] == 3
+    assert slow.stats()["worst_ms"] >= 2
+
+
+# Checks that the registry makes every policy and refuses unknown names.
+def test_registry():
+    """
+    Check that every registered name makes a fresh Policy and an unknown
+    name raises ValueError.
+    """
+    for name in POLICIES:
+        assert isinstance(make_policy(name), Policy)
+    assert make_policy("track") is not make_policy("track")
+    with pytest.raises(ValueError):
+        make_policy("telepathy")
+
+
+# Checks that learned weights load from JSON.
+def test_linear_policy_load(tmp_path):
+    """
+    Check that a linear policy reads its weights and bias from a file.
+
+    Args:
+        tmp_path: a temporary directory provided by pytest.
+    """
+    path = tmp_path / "weights.json"
+    path.write_text(json.dumps({"weights": [1, 2, 3, 4], "bias": 0.5}))
+    policy = LinearPolicy.load(str(path))
+    assert policy.weights == [1, 2, 3, 4]
+    assert policy.bias == 0.5
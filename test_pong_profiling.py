@@ -0,0 +1,78 @@
+"""
+This is where we test the profiler to ensure captures are started, stopped
+and saved.
+"""
+
+import pstats
+import tracemalloc
+from pong_model import Model
+from pong_profiling import Profiler
+
+
+def play_steps(steps):
+    """
+    Helper function for giving the profiler something to capture.
+
+    Args:
+        steps: an int representing the physics steps to play.
+
+    Returns:
+        A list of the positions after every step, so memory is allocated.
+    """
+    model = Model(800, 600, seed=3)
+    positions = []
+    for _ in range(steps):
+        model.move_objects()
+        model.move_cpu()
+        positions.append(model.positions())
+    return positions
+
+
+# Checks that a capture is saved as a profile and an allocation report.
+def test_capture(tmp_path):
+    """
+    Check that stopping a capture saves a profile of the calls made and a
+    report of the memory allocated, and turns tracing off again.
+
+    Args:
+        tmp_path: a temporary directory provided by pytest.
+    """
+    profiler = Profiler(str(tmp_path / "captures"), top=5)
+    profiler.start()
+    assert profiler.active
+    assert tracemalloc.is_tracing()
+    kept = play_steps(200)
+    profile_path, report_path = profiler.stop()
+    assert len(kept) == 200
+    assert not profiler.active
+    assert not tracemalloc.is_tracing()
+    assert profiler.captures == [(profile_path, report_path)]
+    assert profile_path.endswith(".prof")
+
+    functions = {name for _, _, name in pstats.Stats(profile_path).stats}
+    assert "move_objects" in functions
+    with open(report_path, encoding="utf-8") as report_file:
+        report = report_file.read()
+    assert "during the capture" in report
+    assert report.count(" KiB ") >= 2
+
+
+# Checks that toggling alternates between starting and saving captures.
+def test_toggle(tmp_path):
+    """
+    Check that toggle starts a capture, saves it on the next call, and that
+    stopping with no capture running saves nothing.
+
+    Args:
+        tmp_path: a temporary directory provided by pytest.
+    """
+    profiler = Profiler(str(tmp_path))
+    assert profiler.stop() is None
+    assert profiler.toggle() is None
+    assert profiler.active
+    play_steps(10)
+    first = profiler.toggle()
+    profiler.toggle()
+    second = profiler.toggle()
+    assert first != second
+    assert len(profiler.captures) == 2
@@ -0,0 +1,105 @@
+"""
+This is where we test match recording and playback to ensure replays are
+compact and rebuild the match exactly.
+"""
+
+import random
+import pytest
+from pong_controller import TrackingController
+from pong_model import Model
+from pong_replay import Recorder, load, play, read_varint, write_varint
+
+
+def record_match(seed, steps):
+    """
+    Helper function for playing and recording a match with a tracking
+    player.
+
+    Args:
+        seed: an int used to seed the model.
+        steps: an int representing the number of steps to play.
+
+    Returns:
+        tuple: The Model after the last step and the replay bytes.
+    """
+    model = Model(1200, 675, seed)
+    recorder = Recorder(model)
+    player = TrackingController(model)
+    for _ in range(steps):
+        if model.game_over():
+            model.cpu_score = 0
+            model.player_score = 0
+        speed_y = player.handle_events()
+        recorder.record(speed_y)
+        model.move_objects()
+        model.move_player(speed_y)
+        model.move_cpu()
+    return model, recorder.to_bytes()
+
+
+# Checks that varints round-trip for small and large values.
+@pytest.mark.parametrize("value", [0, 1, 127, 128, 300, 2**40])
+def test_varint_round_trip(value):
+    """
+    Check that a value written as a varint reads back unchanged.
+
+    Args:
+        value: an int to write and read back.
+    """
+    buffer = bytearray(b"x")
+    write_varint(buffer, value)
+    assert read_varint(buffer, 1) == (value, len(buffer))
+
+
+# Checks that recorded inputs load back unchanged.
+def test_load_round_trip():
+    """
+    Check that every recorded input, including repeats and negative
+    changes, is read back in order.
+    """
+    model = Model(800, 600, seed=7)
+    recorder = Recorder(model)
+    inputs = [random.Random(1).choice([-6, 0, 6]) for _ in range(50)]
+    inputs += [6] * 200 + [-6] * 3
+    for speed_y in inputs:
+        recorder.record(speed_y)
+    assert load(recorder.to_bytes()) == (7, 800, 600, inputs)
+
+
+# Checks that a replay rebuilds the recorded match exactly.
+def test_play_matches_recording():
+    """
+    Check that playing a replay ends in the same state as the recorded
+    match, across several finished matches.
+    """
+    model, data = record_match(3, 20000)
+    replayed = play(data)
+    assert replayed.ball.rect == model.ball.rect
+    assert replayed.ball.speed_x == model.ball.speed_x
+    assert replayed.player.rect == model.player.rect
+    assert replayed.cpu.rect == model.cpu.rect
+    assert (replayed.cpu_score, replayed.player_score) == (
+        model.cpu_score,
+        model.player_score,
+    )
+
+
+# Checks that replays stay small.
+def test_replay_is_compact():
+    """
+    Check that a few minutes of play take only a few KB.
+    """
+    _, data = record_match(3, 20000)
+    assert len(data) < 8000
+
+
+# Checks that other data is rejected.
+def test_load_rejects_bad_data():
+    """
+    Check that bytes that are not a replay raise ValueError.
+    """
+    with pytest.raises(ValueError):
+        load(b"not a replay at all")
+    _, data = record_match(3, 100)
+    with pytest.raises(ValueError):
+        load(data[:-1])
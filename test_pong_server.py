@@ -0,0 +1,162 @@
+"""
+This is where we test the match server to ensure matches tick at their own
+rates and clients can play them over TCP.
+"""
+
+import asyncio
+import subprocess
+import sys
+from pong_model import WINNING_SCORE
+from pong_server import GameServer, measure_capacity
+
+
+# Checks that a match without a second client uses the CPU rule.
+def test_match_tick_moves_cpu():
+    """
+    Check that the left racket tracks the ball until a client takes it over,
+    after which it follows that client's input.
+    """
+    server = GameServer(800, 600)
+    match = server.create_match(seed=1)
+    match.inputs["cpu"] = 6
+    expected = server.create_match(seed=1).model
+    match.tick()
+    expected.move_objects()
+    expected.move_player(0)
+    expected.move_cpu()
+    assert match.model.positions() == expected.positions()
+    match.clients["cpu"] = None
+    cpu_y = match.model.cpu.rect.y
+    match.tick()
+    assert match.model.cpu.rect.y == cpu_y + 6
+    assert match.frame == 2
+
+
+# Checks that each match keeps its own tick rate.
+def test_scheduler_tick_rates():
+    """
+    Check that matches at different tick rates run about the right number
+    of ticks in the same stretch of time.
+    """
+    server = GameServer(800, 600)
+
+    async def run_briefly():
+        fast = server.create_match(seed=1, tick_rate=200)
+        slow = server.create_match(seed=2, tick_rate=50)
+        try:
+            await asyncio.wait_for(server.run(), 0.5)
+        except asyncio.TimeoutError:
+            pass
+        return fast, slow
+
+    fast, slow = asyncio.run(run_briefly())
+    assert 70 <= fast.frame <= 110
+    assert 15 <= slow.frame <= 30
+    assert server.report()["ticks"] == fast.frame + slow.frame
+
+
+# Checks that the report still covers matches that have finished.
+def test_report_counts_finished_matches():
+    """
+    Check that a match removed by the scheduler when it finishes keeps its
+    ticks in the report, alongside a match still being played.
+    """
+    server = GameServer(800, 600)
+
+    async def run_briefly():
+        ending = server.create_match(seed=1, tick_rate=200)
+        ending.model.player_score = WINNING_SCORE
+        playing = server.create_match(seed=2, tick_rate=200)
+        try:
+            await asyncio.wait_for(server.run(), 0.2)
+        except asyncio.TimeoutError:
+            pass
+        return ending, playing
+
+    ending, playing = asyncio.run(run_briefly())
+    report = server.report()
+    assert ending.finished
+    assert (report["matches"], report["finished"]) == (1, 1)
+    assert report["ticks"] == ending.frame + playing.frame
+    assert ending.frame >= 1
+
+
+# Checks that a TCP client can join a match and move its racket.
+def test_client_plays_match():
+    """
+    Check that a client joining a new match plays the right racket and
+    receives states showing its input being applied.
+    """
+    server = GameServer(800, 600)
+
+    async def play():
+        listener = await asyncio.start_server(
+            server.handle_client, "127.0.0.1", 0
+        )
+        port = listener.sockets[0].getsockname()[1]
+        scheduler = asyncio.create_task(server.run())
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"JOIN new\n")
+        joined = (await reader.readline()).split()
+        writer.write(b"INPUT 100\n")
+        await writer.drain()
+        states = [(await reader.readline()).split() for _ in range(20)]
+        writer.close()
+        scheduler.cancel()
+        listener.close()
+        return joined, states
+
+    joined, states = asyncio.run(play())
+    assert joined == [b"JOINED", b"1", b"player"]
+    assert all(state[0] == b"STATE" for state in states)
+    # The input is clamped to the keyboard speed
+    player_y = [int(state[5]) for state in states]
+    assert player_y[-1] - player_y[-2] == 6
+
+
+# Checks that joining a missing match is refused.
+def test_client_join_unknown_match():
+    """
+    Check that a client asking for a match that doesn't exist gets an error.
+    """
+    server = GameServer(800, 600)
+
+    async def join():
+        listener = await asyncio.start_server(
+            server.handle_client, "127.0.0.1", 0
+        )
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"JOIN 42\n")
+        reply = await reader.readline()
+        writer.close()
+        listener.close()
+        return reply
+
+    assert asyncio.run(join()).startswith(b"ERROR")
+
+
+# Checks that the server runs without pygame.
+def test_server_without_pygame():
+    """
+    Check that importing the server and measuring its capacity never loads
+    pygame.
+    """
+    script = (
+        "import sys\n"
+        "from pong_server import measure_capacity\n"
+        "measure_capacity(matches=2, ticks=10)\n"
+        "assert 'pygame' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True)
+
+
+# Checks that the capacity probe reports a usable estimate.
+def test_measure_capacity():
+    """
+    Check that measuring capacity ticks every match and estimates more than
+    one match per core.
+    """
+    stats = measure_capacity(matches=5, ticks=20)
+    assert stats["mean_tick_ms"] > 0
+    assert stats["capacity"] >= 1
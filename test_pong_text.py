@@ -0,0 +1,104 @@
+"""
+This is where we test the text cache to ensure rendered text is reused and
+old entries are evicted.
+"""
+
+import pygame
+import pytest
+from pong_text import FontRegistry, TextCache
+
+pygame.init()
+
+
+@pytest.fixture
+def font():
+    """
+    Helper function for creating a font to render with.
+
+    Returns:
+        pygame.font.Font: The default font at size 36.
+    """
+    return pygame.font.Font(None, 36)
+
+
+# Checks that the same text is only rendered once.
+def test_text_cache_hit(font):
+    """
+    Check that repeated renders return the same surface and count hits.
+
+    Args:
+        font: a pygame font to render with.
+    """
+    cache = TextCache()
+    first = cache.render(font, "3", True, "white")
+    second = cache.render(font, "3", True, "white")
+    assert first is second
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+# Checks that every part of the key is taken into account.
+def test_text_cache_key(font):
+    """
+    Check that a different text, color or antialias setting is a miss.
+
+    Args:
+        font: a pygame font to render with.
+    """
+    cache = TextCache()
+    cache.render(font, "3", True, "white")
+    cache.render(font, "4", True, "white")
+    cache.render(font, "3", True, "black")
+    cache.render(font, "3", False, "white")
+    cache.render(font, "3", True, pygame.Color("white"))
+    assert cache.misses == 4
+    assert cache.hits == 1
+
+
+# Checks that the least recently used surface is evicted first.
+def test_text_cache_eviction(font):
+    """
+    Check that the cache never grows past max_size and keeps recent text.
+
+    Args:
+        font: a pygame font to render with.
+    """
+    cache = TextCache(max_size=2)
+    zero = cache.render(font, "0", True, "white")
+    cache.render(font, "1", True, "white")
+    # Touch "0" so that "1" is now the least recently used
+    cache.render(font, "0", True, "white")
+    cache.render(font, "2", True, "white")
+    assert len(cache) == 2
+    assert cache.render(font, "0", True, "white") is zero
+    cache.render(font, "1", True, "white")
+    assert cache.misses == 4
+
+
+# Checks that clearing empties the cache and resets the counters.
+def test_text_cache_clear(font):
+    """
+    Check that clear removes surfaces and resets hit and miss counts.
+
+    Args:
+        font: a pygame font to render with.
+    """
+    cache = TextCache()
+    cache.render(font, "0", True, "white")
+    cache.render(font, "0", True, "white")
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.hits == 0
+    assert cache.misses == 0
+
+
+# Checks that each face and size is only loaded once.
+def test_font_registry():
+    """
+    Check that the registry returns the same font for the same face and
+    size, and a new one for a new size.
+    """
+    fonts = FontRegistry()
+    assert fonts.get(None, 36) is fonts.get(None, 36)
+    assert fonts.get(None, 64) is not fonts.get(None, 36)
+    assert len(fonts) == 2
@@ -0,0 +1,116 @@
+"""
+This is where we test frame timing to ensure phases are recorded, kept in
+a ring buffer, and saved correctly.
+"""
+
+import csv
+import json
+import time
+import pygame
+from pong_model import Model
+from pong_timing import PHASES, FrameTimer
+from pong_view import View
+
+pygame.init()
+
+
+def record_frame(timer, phases):
+    """
+    Helper function for recording one frame with given phase times.
+
+    Args:
+        timer: a FrameTimer to record into.
+        phases: a dict mapping phase names to seconds to spend in them.
+    """
+    timer.begin_frame()
+    for phase, seconds in phases.items():
+        with timer.measure(phase):
+            time.sleep(seconds)
+    timer.end_frame()
+
+
+# Checks that phase times are added up per frame.
+def test_frame_phases():
+    """
+    Check that a frame records the time spent in each phase, with present
+    taken out of draw.
+    """
+    timer = FrameTimer()
+    timer.begin_frame()
+    with timer.measure("input"):
+        time.sleep(0.002)
+    with timer.measure("draw"):
+        with timer.measure("present"):
+            time.sleep(0.002)
+    timer.end_frame()
+    row = dict(zip(PHASES, timer.recent()[0]))
+    assert row["input"] >= 0.002
+    assert row["present"] >= 0.002
+    assert row["draw"] < 0.001
+    assert row["frame"] >= row["input"] + row["present"]
+    assert timer.frames == 1
+
+
+# Checks that the ring buffer keeps the latest frames in order.
+def test_ring_buffer():
+    """
+    Check that only the last capacity frames are kept, oldest first, and
+    that slow frames are counted as over budget.
+    """
+    timer = FrameTimer(capacity=3, budget=0.004)
+    for index in range(5):
+        record_frame(timer, {"physics": 0.001 * (index + 1)})
+    physics = timer.recent()[:, PHASES.index("physics")]
+    assert len(physics) == 3
+    assert list(physics) == sorted(physics)
+    assert physics[0] >= 0.003
+    assert timer.over_budget >= 2
+    assert sum(timer.histogram("physics")) == 3
+
+
+# Checks that an instrumented view reports its drawing steps.
+def test_instrument_view():
+    """
+    Check that rendering through an instrumented view records the score,
+    racket and present phases.
+    """
+    screen = pygame.display.set_mode((800, 600))
+    view = View(screen)
+    timer = FrameTimer()
+    timer.instrument(view)
+    timer.begin_frame()
+    view.render(Model(800, 600, seed=1))
+    timer.end_frame()
+    row = dict(zip(PHASES, timer.recent()[0]))
+    for phase in ("score", "court", "racket", "present"):
+        assert row[phase] > 0
+
+
+# Checks that timings are saved as JSON and CSV.
+def test_dump(tmp_path):
+    """
+    Check that the JSON report holds the summary and histograms and the CSV
+    file holds one row per frame.
+
+    Args:
+        tmp_path: a temporary directory provided by pytest.
+    """
+    timer = FrameTimer()
+    timer.first_frame_ms = 120.0
+    for _ in range(4):
+        record_frame(timer, {"input": 0.0})
+    json_path = str(tmp_path / "timings.json")
+    csv_path = str(tmp_path / "timings.csv")
+    timer.dump(json_path)
+    timer.dump(csv_path)
+    with open(json_path, encoding="utf-8") as report_file:
+        report = json.load(report_file)
+    assert report["frames"] == 4
+    assert report["first_frame_ms"] == 120.0
+    assert set(report["summary"]) == set(PHASES)
+    assert sum(report["histograms"]["frame"]) == 4
+    with open(csv_path, encoding="utf-8") as report_file:
+        rows = list(csv.reader(report_file))
+    assert rows[0][0] == "frame"
+    assert len(rows) == 5
+    assert len(timer.hud_lines()) == len(PHASES) + 2
@@ -0,0 +1,89 @@
+"""
+This is where we test the tournament runner to ensure matches are played
+to the end, reproducibly, and their results add up correctly.
+"""
+
+import pytest
+from pong_model import WINNING_SCORE
+from pong_tournament import (
+    match_seeds,
+    play_match,
+    run_tournament,
+    summarize,
+)
+
+
+# Checks that a match is played until one side wins.
+def test_play_match_finishes():
+    """
+    Check that a match between two policies ends with one side on the
+    winning score and some rallies played.
+    """
+    result = play_match(1, "cpu", "track")
+    assert result["winner"] in ("left", "right")
+    assert WINNING_SCORE in (result["left_score"], result["right_score"])
+    assert result["contacts"] > 0
+
+
+# Checks that a racket that never moves loses.
+def test_still_policy_loses():
+    """
+    Check that a racket that never moves loses to one that tracks the ball.
+    """
+    result = play_match(2, "still", "track")
+    assert result["winner"] == "right"
+    assert result["right_score"] == WINNING_SCORE
+
+
+# Checks that a match is abandoned after the step limit.
+def test_play_match_abandoned():
+    """
+    Check that a match stopped by the step limit has no winner.
+    """
+    result = play_match(1, "cpu", "track", max_steps=10)
+    assert result["winner"] is None
+    assert result["steps"] == 10
+
+
+# Checks that a tournament plays every seed once and reproducibly.
+def test_run_tournament():
+    """
+    Check that matches played across processes give the same results as
+    playing them one after another.
+    """
+    results = list(run_tournament(4, "cpu", "track", seed=3, workers=2))
+    seeds = match_seeds(3, 4)
+    assert sorted(result["seed"] for result in results) == sorted(seeds)
+    assert all(result["winner"] for result in results)
+    by_seed = {result["seed"]: result for result in results}
+    expected = play_match(seeds[0], "cpu", "track")
+    for key in ("winner", "left_score", "right_score", "steps", "contacts"):
+        assert by_seed[seeds[0]][key] == expected[key]
+
+
+# Checks that unknown policy names are refused.
+def test_run_tournament_unknown_policy():
+    """
+    Check that naming a policy that doesn't exist raises ValueError.
+    """
+    with pytest.raises(ValueError):
+        list(run_tournament(1, "cpu", "telepathy"))
+
+
+# Checks that results are added up into rates.
+def test_summarize():
+    """
+    Check that win rates, abandoned matches and rally length are computed
+    from the results.
+    """
+    results = [
+        {"winner": "left", "left_score": 5, "right_score": 3, "contacts": 16},
+        {"winner": "right", "left_score": 0, "right_score": 5, "contacts": 5},
+        {"winner": None, "left_score": 1, "right_score": 1, "contacts": 4},
+    ]
+    stats = summarize(results, 2.0)
+    assert stats["left_win_rate"] == pytest.approx(1 / 3)
+    assert stats["right_win_rate"] == pytest.approx(1 / 3)
+    assert stats["abandoned"] == 1
+    assert stats["rally_length"] == pytest.approx(25 / 15)
+    assert stats["points_per_sec"] == pytest.approx(7.5)
@@ -8,7 +8,8 @@ visuals.
 
 import pygame
 import pytest
-from pong_view import View
+from pong_assets import AssetManager
+from pong_view import View, interpolate_positions
 from pong_model import Model
 
 # Initialize pygame
@@ -157,3 +158,231 @@ def test_end_screen_exit():
     pygame.event.post(event)
     # Assert that no QUIT event is in the event queue
     assert pygame.event.get(pygame.QUIT) == []
+
+
+# ~~~~~~~~~~~~~ INTERPOLATION CODE~~~~~~~~~~~~~~~~~~~
+
+
+# Checks that positions are blended between two physics states.
+def test_interpolate_positions():
+    """
+    Test case to check that objects are drawn part way between states.
+    """
+    previous = {"ball": (100, 200), "cpu": (0, 300)}
+    current = {"ball": (106, 194), "cpu": (0, 306)}
+    positions = interpolate_positions(previous, current, 0.5)
+    assert positions["ball"] == (103, 197)
+    assert positions["cpu"] == (0, 303)
+
+
+# Checks that objects that jump, like the ball after a point, are not
+# interpolated across the screen.
+def test_interpolate_positions_snap():
+    """
+    Test case to check that large jumps snap to the new position.
+    """
+    previous = {"ball": (1150, 200)}
+    current = {"ball": (590, 400)}
+    positions = interpolate_positions(previous, current, 0.5)
+    assert positions["ball"] == (590, 400)
+
+
+# Checks that render draws the ball at the interpolated position.
+def test_render_interpolated_ball():
+    """
+    Test case to check that render uses the given positions.
+    """
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    view = View(screen)
+    model = Model(800, 600)
+    model.ball.rect.topleft = (200, 200)
+    view.render(model, {"ball": (500.4, 450.6)})
+    assert screen.get_at((510, 461)) == pygame.Color("green")
+    assert screen.get_at((210, 210)) != pygame.Color("green")
+
+
+# ~~~~~~~~~~~~~ DIRTY RECT CODE~~~~~~~~~~~~~~~~~~~
+
+
+# Checks that dirty-rect rendering draws the same picture as a full redraw.
+def test_render_dirty_matches_full():
+    """
+    Test case to check that the dirty-rect path leaves the screen looking
+    exactly like a full render, including when the ball crosses the net.
+    """
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    full_view = View(screen)
+    dirty_view = View(screen, dirty_rects=True)
+    model = Model(800, 600)
+    model.ball.rect.topleft = (380, 290)
+    dirty_view.render(model)
+    for _ in range(5):
+        model.move_objects()
+        model.move_player(6)
+        model.move_cpu()
+        dirty_view.render(model)
+        dirty_pixels = pygame.image.tobytes(screen, "RGB")
+        full_view.render(model)
+        assert pygame.image.tobytes(screen, "RGB") == dirty_pixels
+
+
+# Checks that only the moving sprites are redrawn between frames.
+def test_render_dirty_tracks_sprites():
+    """
+    Test case to check that the dirty-rect path remembers the areas it drew.
+    """
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    view = View(screen, dirty_rects=True)
+    model = Model(800, 600)
+    view.render(model)
+    assert view.static_layer is not None
+    assert len(view.sprite_rects) == 3
+    # A new score forces the static layer to be rebuilt
+    static_layer = view.static_layer
+    model.cpu_score += 1
+    view.render(model)
+    assert view.static_layer is not static_layer
+    # Drawing another screen invalidates it
+    view.start_screen()
+    assert view.static_layer is None
+
+
+# ~~~~~~~~~~~~~ BACKGROUND CODE~~~~~~~~~~~~~~~~~~~
+
+
+# Checks that the court background is drawn once and reused.
+def test_background_cached():
+    """
+    Test case to check that the background is only rebuilt when the screen
+    size changes.
+    """
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    view = View(screen)
+    model = Model(800, 600)
+    view.render(model)
+    background = view.background
+    assert background.get_size() == (800, 600)
+    view.render(model)
+    assert view.background is background
+    # A new screen size means a new background
+    view.screen = pygame.Surface((400, 300))
+    view.background_layer()
+    assert view.background is not background
+    assert view.background.get_size() == (400, 300)
+    assert view.net.centerx == 200
+
+
+# Checks that the ball is still drawn under the net.
+def test_render_ball_under_net():
+    """
+    Test case to check that the net is drawn over a ball crossing it.
+    """
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    view = View(screen)
+    model = Model(800, 600)
+    model.ball.rect.center = (400, 300)
+    view.render(model)
+    assert screen.get_at((400, 300)) == pygame.Color("black")
+    assert screen.get_at((392, 300)) == pygame.Color("green")
+
+
+# ~~~~~~~~~~~~~ MENU CACHE CODE~~~~~~~~~~~~~~~~~~~
+
+
+# Checks that the start screen is only drawn once.
+def test_start_screen_cached():
+    """
+    Test case to check that showing the start screen again reuses the
+    pre-rendered surface.
+    """
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    view = View(screen)
+    first_button = view.start_screen()
+    layout = view.start_layout
+    misses = view.text_cache.misses
+    assert view.start_screen() == first_button
+    assert view.start_layout is layout
+    assert view.text_cache.misses == misses
+
+
+# Checks that the end screen is rebuilt only when the scores change.
+def test_end_screen_cached():
+    """
+    Test case to check that the end screen is reused for the same scores
+    and redrawn for new ones.
+    """
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    view = View(screen)
+    model = Model(800, 600)
+    model.cpu_score = 5
+    view.end_screen(model)
+    layout = view.end_layout
+    view.end_screen(model)
+    assert view.end_layout is layout
+    model.player_score = 3
+    view.end_screen(model)
+    assert view.end_layout is not layout
+
+
+# Checks that the overlay is drawn over the game and cleaned up after.
+@pytest.mark.parametrize("dirty_rects", [False, True])
+def test_hud_overlay(dirty_rects):
+    """
+    Test that hud lines are drawn in the top left corner and erased once
+    they are turned off.
+
+    Args:
+        dirty_rects: whether the view redraws only what changed.
+    """
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    view = View(screen, dirty_rects)
+    model = Model(800, 600)
+    view.render(model)
+    background = screen.get_at((8, 12))
+    view.hud_lines = ["frame 16.0 ms", "input 0.1 ms"]
+    view.render(model)
+    drawn = [screen.get_at((x, y)) for x in range(5, 60) for y in range(5, 30)]
+    assert pygame.Color("white") in drawn
+    view.hud_lines = None
+    view.render(model)
+    assert screen.get_at((8, 12)) == background
+    assert all(
+        screen.get_at((x, y)) != pygame.Color("white")
+        for x in range(5, 60)
+        for y in range(5, 30)
+    )
+
+
+# Checks that the racket image is decoded once, and only when needed.
+@pytest.mark.parametrize("preload", [False, True])
+def test_racket_images_deferred(preload):
+    """
+    Test that a new view hasn't decoded the racket image, and that both
+    rackets share one image decoded on first use or in the background.
+
+    Args:
+        preload: whether the image is decoded in the background first.
+    """
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    assets = AssetManager()
+    view = View(screen, assets=assets)
+    assert view.player_image is None
+    assert assets.decoded == 0
+    if preload:
+        view.preload_rackets()
+    player_image, cpu_image = view.racket_images()
+    assert player_image is cpu_image
+    assert assets.decoded == 1
+    assert player_image.get_size() == (40, 100)
+    assert view.racket_loader is None
+    assert view.racket_images() == (player_image, cpu_image)
+